@@ -1,9 +1,10 @@
 # my_entrepreneur_platform/content/admin.py
 
 from django.contrib import admin
-from .models import Post, Comment, Like
+from .models import Post, Comment, Like, LinkPreview
 
 # Register your models here
 admin.site.register(Post)
 admin.site.register(Comment)
-admin.site.register(Like)
\ No newline at end of file
+admin.site.register(Like)
+admin.site.register(LinkPreview)
\ No newline at end of file
@@ -0,0 +1,41 @@
+# my_entrepreneur_platform/content/caching.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Every change that can alter a post's representation (edit, like, comment,
+# media variants, link preview) bumps the post's version. Cached representations
+# are keyed by version, so a bump invalidates them without a delete. Versions are
+# nanosecond timestamps, which doubles as the Last-Modified time.
+# Representations are shared by every host the site answers on, so their media
+# URLs are cached relative and made absolute per request.
+VERSION_KEY = 'content:post:{post_id}:version'
+REPRESENTATION_KEY = 'content:post:{post_id}:{version}'
+MEDIA_URL_FIELDS = ('image', 'video')
+
+
+def bump_post_version(post_id):
+    cache.set(VERSION_KEY.format(post_id=post_id), time.time_ns(), None)
+
+def bump_post_versions(post_ids):
+    now = time.time_ns()
+    cache.set_many({VERSION_KEY.format(post_id=post_id): now for post_id in post_ids}, None)
+
+def post_version(post_id):
+    key = VERSION_KEY.format(post_id=post_id)
+    cache.add(key, time.time_ns(), None) # First reader picks the version; concurrent readers agree
+    return cache.get(key)
+
+def get_representation(post_id, version):
+    return cache.get(REPRESENTATION_KEY.format(post_id=post_id, version=version))
+
+def set_representation(post_id, version, data):
+    cache.set(REPRESENTATION_KEY.format(post_id=post_id, version=version), data, settings.POST_DETAIL_CACHE_TTL)
+
+def with_absolute_urls(request, data):
+    """A cached representation with its media URLs made absolute for `request`'s scheme and host."""
+    absolute = {field: request.build_absolute_uri(data[field]) for field in MEDIA_URL_FIELDS if data[field]}
+    absolute['variants'] = {variant: request.build_absolute_uri(url) for variant, url in data['variants'].items()}
+    return {**data, **absolute}
@@ -0,0 +1,59 @@
+# my_entrepreneur_platform/content/counters.py
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from my_entrepreneur_platform.counters import adjust, count_subquery, reconcile
+from .caching import bump_post_version, bump_post_versions
+from .models import Post, Comment, Like
+
+# Models that can be liked (LikeSerializer only accepts these content types)
+LIKEABLE_MODELS = (Post, Comment)
+
+
+# --- Incremental updates ---
+# Counters are bumped with F() expressions so concurrent likes/comments never
+# overwrite each other; callers run them in the same transaction as the write.
+# The cached post representation is invalidated once that transaction commits,
+# so a concurrent reader cannot cache the old counts under the new version.
+
+def adjust_likes(content_type, object_id, delta):
+    """Adds `delta` to likes_count of the liked Post or Comment."""
+    model = content_type.model_class()
+    if model in LIKEABLE_MODELS:
+        adjust(model.objects.filter(pk=object_id), 'likes_count', delta)
+    if model is Post:
+        transaction.on_commit(lambda: bump_post_version(object_id))
+
+def adjust_comments(post_id, delta):
+    """Adds `delta` to comments_count of a Post (which counts replies at every depth)."""
+    adjust(Post.objects.filter(pk=post_id), 'comments_count', delta)
+    transaction.on_commit(lambda: bump_post_version(post_id))
+
+def adjust_replies(comment_id, delta):
+    """Adds `delta` to reply_count (direct replies) of a Comment."""
+    adjust(Comment.objects.filter(pk=comment_id), 'reply_count', delta)
+
+
+# --- Reconciliation ---
+def reconcile_counters(batch_size=None):
+    """
+    Repairs counters that drifted from the Like and Comment tables (e.g. rows
+    deleted by cascades or the admin, which bypass the API views).
+    Returns {model name: rows repaired}.
+    """
+    batch_size = batch_size or settings.CONTENT_COUNTER_RECONCILE_BATCH_SIZE
+    likes_of = lambda model: count_subquery(
+        Like.objects.filter(content_type=ContentType.objects.get_for_model(model)), 'object_id'
+    )
+    return {
+        'posts': reconcile(Post, {
+            'likes_count': likes_of(Post),
+            'comments_count': count_subquery(Comment.objects.all(), 'post'),
+        }, batch_size, on_repaired=lambda posts: bump_post_versions([post.pk for post in posts])),
+        'comments': reconcile(Comment, {
+            'likes_count': likes_of(Comment),
+            'reply_count': count_subquery(Comment.objects.all(), 'parent'),
+        }, batch_size),
+    }
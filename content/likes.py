@@ -0,0 +1,55 @@
+# my_entrepreneur_platform/content/likes.py
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Like
+
+# With CONTENT_LIKED_IDS_CACHE_TTL set, a user's like flags are cached per page
+# of ids looked up together: each entry stays as small as a page and expires on
+# its own. Keys embed the user's generation for the model, which a like or
+# unlike bumps, so every cached page of theirs misses at once.
+GENERATION_KEY = 'content:liked:{user_id}:{model}:generation'
+PAGE_KEY = 'content:liked:{user_id}:{model}:{generation}:{ids}'
+
+
+def _generation_key(user_id, model):
+    return GENERATION_KEY.format(user_id=user_id, model=model._meta.label_lower)
+
+def _page_key(user_id, model, object_ids, ttl):
+    generation_key = _generation_key(user_id, model)
+    cache.add(generation_key, time.time_ns(), ttl)
+    digest = hashlib.sha1(','.join(map(str, sorted(set(object_ids)))).encode()).hexdigest()
+    return PAGE_KEY.format(user_id=user_id, model=model._meta.label_lower, generation=cache.get(generation_key), ids=digest)
+
+def liked_ids(user, model, object_ids):
+    """
+    The subset of `object_ids` (instances of `model`) that `user` has liked, in at
+    most one query, or none when the same page was looked up within
+    CONTENT_LIKED_IDS_CACHE_TTL seconds and nothing was liked or unliked since.
+    """
+    if user is None or not user.is_authenticated or not object_ids:
+        return set()
+    ttl = settings.CONTENT_LIKED_IDS_CACHE_TTL
+    key = _page_key(user.pk, model, object_ids, ttl) if ttl else None
+    found = cache.get(key) if key else None
+    if found is None:
+        found = set(Like.objects.filter(
+            user=user,
+            content_type=ContentType.objects.get_for_model(model), # Served from ContentType's cache
+            object_id__in=object_ids,
+        ).order_by().values_list('object_id', flat=True))
+        if key:
+            cache.set(key, found, ttl)
+    return found
+
+def forget_liked(user_id, model):
+    """Invalidates a user's cached like flags for `model` once their like or unlike commits."""
+    ttl = settings.CONTENT_LIKED_IDS_CACHE_TTL
+    if ttl:
+        transaction.on_commit(lambda: cache.set(_generation_key(user_id, model), time.time_ns(), ttl))
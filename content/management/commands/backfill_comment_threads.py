@@ -0,0 +1,21 @@
+# my_entrepreneur_platform/content/management/commands/backfill_comment_threads.py
+
+from django.core.management.base import BaseCommand
+
+from content.counters import reconcile_counters
+from content.models import Comment
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills in path and depth on comments saved before threaded replies, then "
+        "recounts reply_count. Run once after deploying threads; safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Comments updated per query.")
+
+    def handle(self, *args, **options):
+        updated = Comment.backfill_paths(batch_size=options['batch_size'])
+        repaired = reconcile_counters(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {updated} comment paths; repaired counters {repaired}."))
@@ -24,6 +24,7 @@ class Post(models.Model):
     )
     content = models.TextField(blank=True, null=True, help_text="Text content of the post.")
     image = models.ImageField(upload_to='post_images/', blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False) # Resized copies, see media.variants
     video = models.FileField(upload_to='post_videos/', blank=True, null=True)
     link = models.URLField(blank=True, null=True, help_text="External link associated with the post.")
     post_type = models.CharField(max_length=10, choices=POST_TYPE_CHOICES, default='TEXT')
@@ -31,19 +32,43 @@ class Post(models.Model):
     # Boolean to control visibility (e.g., public vs. followers only) - for future use
     is_public = models.BooleanField(default=True)
 
+    # Denormalized counters, kept in step by content.counters and reconciled periodically
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Posts"
         ordering = ['-created_at'] # Newest posts first
+        # Back the keyset-paginated listings (optionally filtered by owner or type)
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='content_post_keyset_idx'),
+            models.Index(fields=['owner', '-created_at', '-id'], name='content_post_owner_keyset_idx'),
+            models.Index(fields=['post_type', '-created_at', '-id'], name='content_post_type_keyset_idx'),
+            # The posts embedding a link preview, re-versioned when it is unfurled
+            models.Index(fields=['link'], name='content_post_link_idx'),
+        ]
 
     def __str__(self):
         return f"Post by {self.owner.username} at {self.created_at.strftime('%Y-%m-%d %H:%M')}"
 
+# Materialized comment paths: each ancestor's id as a fixed-width base-36 segment,
+# so sorting by path lists a thread depth-first and a subtree is one path range
+PATH_SEGMENT_WIDTH = 7 # 36**7 ids
+PATH_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+def path_segment(pk):
+    digits = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        digits = PATH_DIGITS[remainder] + digits
+    return digits.rjust(PATH_SEGMENT_WIDTH, '0')
+
 class Comment(models.Model):
     """
-    Represents a comment on a Post.
+    Represents a comment on a Post, or a reply to another comment.
     """
     post = models.ForeignKey(
         Post,
@@ -57,16 +82,82 @@ class Comment(models.Model):
         related_name='comments',
         help_text="The user who wrote the comment."
     )
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='replies',
+        help_text="The comment this is a reply to (empty for top-level comments)."
+    )
     content = models.TextField(help_text="Text content of the comment.")
+    # Thread position: ancestors' and own id segments (see path_segment), and nesting level
+    path = models.CharField(max_length=255, editable=False, blank=True)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    likes_count = models.PositiveIntegerField(default=0, editable=False) # Denormalized, see content.counters
+    reply_count = models.PositiveIntegerField(default=0, editable=False) # Direct replies, denormalized
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name_plural = "Comments"
         ordering = ['created_at'] # Oldest comments first
+        indexes = [
+            # Top-level comments of a post (depth 0), and direct replies of a comment
+            models.Index(fields=['post', 'depth', 'created_at', 'id'], name='content_comment_keyset_idx'),
+            models.Index(fields=['parent', 'created_at', 'id'], name='content_comment_replies_idx'),
+            # Subtree range scans
+            models.Index(fields=['post', 'path'], name='content_comment_path_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on Post {self.post.id}"
 
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.depth = self.parent.depth + 1 if self.parent_id else 0
+        super().save(*args, **kwargs)
+        # The path ends with our own id, so it can only be set once we have one. A
+        # reply to a comment that predates paths is left for backfill_paths instead.
+        if not self.path and (not self.parent_id or self.parent.path):
+            self.path = (self.parent.path if self.parent_id else '') + path_segment(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
+    def subtree(self):
+        """This comment and all its descendants, as one range over (post, path)."""
+        if not self.path:
+            # An empty range start would match every comment on the post
+            raise ValueError(f"Comment {self.pk} has no path yet; run manage.py backfill_comment_threads.")
+        return Comment.objects.filter(post_id=self.post_id, path__gte=self.path, path__lt=self.path + '~')
+
+    @classmethod
+    def backfill_paths(cls, batch_size=1000):
+        """
+        Sets path and depth on comments saved before threads had them, in
+        primary-key batches. A reply needs its parent's path, so passes repeat
+        until one finds nothing left to fill in. Returns the number of comments updated.
+        """
+        updated = 0
+        while True:
+            filled = 0
+            last_pk = 0
+            while True:
+                rows = list(
+                    cls.objects.filter(path='', pk__gt=last_pk)
+                    .filter(models.Q(parent__isnull=True) | models.Q(parent__path__gt=''))
+                    .order_by('pk').values_list('pk', 'parent__path', 'parent__depth')[:batch_size]
+                )
+                if not rows:
+                    break
+                last_pk = rows[-1][0]
+                cls.objects.bulk_update([
+                    cls(pk=pk, path=(parent_path or '') + path_segment(pk), depth=0 if parent_path is None else parent_depth + 1)
+                    for pk, parent_path, parent_depth in rows
+                ], ['path', 'depth'])
+                filled += len(rows)
+            if not filled:
+                return updated
+            updated += filled
+
 class Like(models.Model):
     """
     Represents a 'like' on a Post or Comment.
@@ -90,6 +181,68 @@ class Like(models.Model):
         # Ensure a user can only like a specific content_object once
         unique_together = ('user', 'content_type', 'object_id')
         ordering = ['-created_at']
+        indexes = [
+            # Likes of one post or comment in time order (trending rescoring)
+            models.Index(fields=['content_type', 'object_id', 'created_at'], name='content_like_target_idx'),
+        ]
+
+    def __str__(self):
+        return f"Like by {self.user.username} on {self.content_object}"
+
+class LinkPreview(models.Model):
+    """
+    Unfurled title/description/image of an external URL, shared by every post
+    linking to it. Fetched once per URL in the background (see content.unfurl) and
+    refetched only after `expires_at`.
+    """
+    PENDING = 'PENDING'
+    READY = 'READY'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (READY, 'Ready'),
+        (FAILED, 'Failed'),
+    ]
+
+    url = models.URLField(unique=True) # Same max length as Post.link
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    title = models.CharField(max_length=300, blank=True)
+    description = models.TextField(blank=True)
+    image_url = models.URLField(max_length=500, blank=True)
+    fetched_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(help_text="When the preview (or failed attempt) may be fetched again.")
+
+    class Meta:
+        verbose_name_plural = "Link previews"
+
+    def __str__(self):
+        return f"Preview of {self.url} ({self.status})"
+
+class TrendingScore(models.Model):
+    """
+    Time-decayed engagement score of a post in one trending window (see
+    content.trending). Stored as a log of a forward-decayed sum, so scores
+    computed at different times stay comparable and only posts whose likes or
+    comments changed are rescored.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='trending_scores')
+    window = models.CharField(max_length=10) # A key of settings.TRENDING_WINDOWS
+    log_score = models.FloatField()
+    last_event_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('post', 'window')
+        indexes = [
+            models.Index(fields=['window', '-log_score'], name='content_trending_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} in {self.window}: {self.log_score:.3f}"
+
+class TrendingRefresh(models.Model):
+    """Marks a post whose likes or comments changed since its trending scores were computed."""
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    marked_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"Like by {self.user.username} on {self.content_object}"
\ No newline at end of file
+        return f"Refresh trending scores of post {self.post_id}"
@@ -1,7 +1,13 @@
 # my_entrepreneur_platform/content/serializers.py
 
 from rest_framework import serializers
-from .models import Post, Comment, Like
+from django.conf import settings
+from django.db import models
+from media.serializers import VariantsField
+from my_entrepreneur_platform.serializers import ViewerMixin
+from .likes import liked_ids
+from .models import Post, Comment, Like, LinkPreview
+from .unfurl import previews_for
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType # For GenericForeignKey
 
@@ -13,30 +19,86 @@ class BasicUserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username']
 
-# Serializer for Post model (UPDATED FOR LIKES_COUNT)
-class PostSerializer(serializers.ModelSerializer):
+# Resolves the viewer's likes for a whole page with one query, then serializes the items
+class LikedFlagListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.page_liked_ids = liked_ids(self.child.viewer, self.child.Meta.model, [item.pk for item in items])
+        return super().to_representation(items)
+
+# Shared by serializers exposing `has_liked = serializers.SerializerMethodField()`
+class LikedFlagMixin(ViewerMixin):
+    page_liked_ids = None # Filled in by LikedFlagListSerializer for list responses
+
+    def get_has_liked(self, obj):
+        if self.page_liked_ids is None: # A single object, not a page
+            return obj.pk in liked_ids(self.viewer, type(obj), [obj.pk])
+        return obj.pk in self.page_liked_ids
+
+# Posts also resolve the link previews of the whole page in one query
+class PostListSerializer(LikedFlagListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.page_previews = previews_for(item.link for item in items)
+        return super().to_representation(items)
+
+# Serializer for an unfurled link (title, description and image of Post.link)
+class LinkPreviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LinkPreview
+        fields = ['url', 'title', 'description', 'image_url']
+
+# Serializer for Post model
+class PostSerializer(LikedFlagMixin, serializers.ModelSerializer):
     owner = BasicUserSerializer(read_only=True) # Display owner's info
     owner_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='owner', write_only=True) # For input
-    likes_count = serializers.IntegerField(read_only=True) # <--- IMPORTANT: ADD THIS LINE
+    has_liked = serializers.SerializerMethodField() # Whether the requesting user liked this post
+    variants = VariantsField(source='image_variants') # Resized copies of `image`, by size name
+    link_preview = serializers.SerializerMethodField() # None until the link has been unfurled
+    page_previews = None # Filled in by PostListSerializer for list responses
 
     class Meta:
         model = Post
         fields = [
-            'id', 'owner', 'owner_id', 'content', 'image', 'video', 'link',
-            'post_type', 'is_public', 'created_at', 'updated_at',
-            'likes_count' # <--- IMPORTANT: ADD THIS LINE
+            'id', 'owner', 'owner_id', 'content', 'image', 'variants', 'video', 'link',
+            'link_preview', 'post_type', 'is_public', 'created_at', 'updated_at',
+            'likes_count', 'comments_count', 'has_liked'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'likes_count']
+        read_only_fields = ['created_at', 'updated_at', 'likes_count', 'comments_count']
+        list_serializer_class = PostListSerializer
+
+    def get_link_preview(self, obj):
+        previews = self.page_previews if self.page_previews is not None else previews_for([obj.link])
+        preview = previews.get(obj.link)
+        return LinkPreviewSerializer(preview).data if preview else None
 
 # Serializer for Comment model
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(LikedFlagMixin, serializers.ModelSerializer):
     author = BasicUserSerializer(read_only=True) # Display author's info
     author_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='author', write_only=True) # For input
-    
+    has_liked = serializers.SerializerMethodField() # Whether the requesting user liked this comment
+    parent = serializers.PrimaryKeyRelatedField(queryset=Comment.objects.all(), required=False, allow_null=True) # Reply target
+
+    def validate_parent(self, parent):
+        # Depth and path are fixed at creation, so an update may only repeat the current parent (null included)
+        if self.instance is not None and self.instance.parent_id != (parent.pk if parent else None):
+            raise serializers.ValidationError("A comment cannot be moved to another thread.")
+        if parent is None:
+            return parent
+        if parent.post_id != self.context['view'].kwargs['post_id']:
+            raise serializers.ValidationError("The parent comment belongs to another post.")
+        if parent.depth + 1 > settings.COMMENT_MAX_DEPTH:
+            raise serializers.ValidationError(f"Replies cannot be nested more than {settings.COMMENT_MAX_DEPTH} levels deep.")
+        return parent
+
     class Meta:
         model = Comment
-        fields = ['id', 'post', 'author', 'author_id', 'content', 'created_at']
-        read_only_fields = ['created_at']
+        fields = [
+            'id', 'post', 'parent', 'author', 'author_id', 'content', 'created_at',
+            'depth', 'reply_count', 'likes_count', 'has_liked'
+        ]
+        read_only_fields = ['created_at', 'depth', 'reply_count', 'likes_count']
+        list_serializer_class = LikedFlagListSerializer
 
 # Serializer for Like model (for creating/deleting likes)
 class LikeSerializer(serializers.ModelSerializer):
@@ -0,0 +1,53 @@
+# my_entrepreneur_platform/content/signals.py
+
+import logging
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Comment, Like, Post
+from .caching import bump_post_version
+from .tasks import unfurl_link
+from .trending import mark_for_refresh as mark_trending_refresh
+from .unfurl import request_preview
+
+logger = logging.getLogger(__name__)
+
+
+# Edits (including media variants being attached) and deletes invalidate the cached detail
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_representation(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_post_version(instance.pk))
+
+@receiver(post_save, sender=Post)
+def unfurl_post_link(sender, instance, update_fields=None, **kwargs):
+    if not instance.link or (update_fields is not None and 'link' not in update_fields):
+        return
+    url = instance.link
+
+    def enqueue():
+        if not request_preview(url):
+            return # Fresh (or already being fetched) for another post
+        try:
+            unfurl_link.delay(url)
+        except Exception:
+            # The post is saved; the preview is retried once the claim expires
+            logger.exception(f"Could not enqueue link preview for {url}.")
+    transaction.on_commit(enqueue)
+
+
+# Likes and comments added or removed (cascades and the admin included) rescore their post
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def like_changed(sender, instance, created=True, **kwargs):
+    if created and instance.content_type_id == ContentType.objects.get_for_model(Post).pk:
+        mark_trending_refresh(instance.object_id)
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, created=True, **kwargs):
+    if created:
+        mark_trending_refresh(instance.post_id)
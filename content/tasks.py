@@ -0,0 +1,31 @@
+# my_entrepreneur_platform/content/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from .counters import reconcile_counters
+from .trending import update_scores
+from .unfurl import refresh_preview
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def reconcile_content_counters(self):
+    """Periodically repairs drift in the denormalized like/comment counters."""
+    repaired = reconcile_counters()
+    logger.info(f"Task {self.request.id} completed: repaired counters {repaired}")
+    return repaired
+
+@shared_task(bind=True)
+def unfurl_link(self, url):
+    """Fetches and caches the preview of a link posted in a Post."""
+    preview = refresh_preview(url)
+    logger.info(f"Task {self.request.id} completed: preview of {url} is {preview.status}")
+    return preview.status
+
+@shared_task(bind=True)
+def update_trending(self):
+    """Rescores posts whose likes/comments changed and refreshes the trending top lists."""
+    rescored = update_scores()
+    logger.info(f"Task {self.request.id} completed: rescored {rescored} posts")
+    return rescored
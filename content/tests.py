@@ -1,3 +1,530 @@
-from django.test import TestCase
+import io
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
 
-# Create your tests here.
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .caching import post_version
+from .counters import adjust_comments, reconcile_counters
+from .likes import liked_ids
+from .models import Comment, Like, LinkPreview, Post, TrendingRefresh, TrendingScore, path_segment
+from .trending import current_score, update_scores
+from .unfurl import UnfurlError, _PinnedHTTPConnection, fetch_url, refresh_preview
+from .views import CommentRetrieveUpdateDestroyAPIView, LikeCreateDeleteAPIView
+
+User = get_user_model()
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', 'http://10.255.255.1/latest/meta-data/')
+            self.end_headers()
+            return
+        body = b'<html><head><title>Public page</title></head><body></body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _resolve_to_loopback(host, port, *args, **kwargs):
+    """getaddrinfo stand-in: every *.test name resolves to the local test server."""
+    address = '127.0.0.1' if host.endswith('.test') else host
+    return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (address, port))]
+
+
+@override_settings(LINK_PREVIEW_ALLOW_PRIVATE_HOSTS=False, LINK_PREVIEW_FETCHER='content.unfurl.fetch_url')
+class FetchUrlTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = HTTPServer(('127.0.0.1', 0), _PageHandler)
+        cls.port = cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        # Treat the loopback test server as a public host; everything else keeps the real check
+        patcher = mock.patch('content.unfurl._is_public', lambda address: address == '127.0.0.1')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetches_through_the_checked_address(self):
+        with mock.patch('content.unfurl.socket.getaddrinfo', _resolve_to_loopback):
+            fields = fetch_url(f'http://page.test:{self.port}/')
+        self.assertEqual(fields['title'], 'Public page')
+
+    def test_redirect_to_private_address_is_not_followed(self):
+        connected = []
+        original_connect = _PinnedHTTPConnection.connect
+
+        def connect(conn):
+            connected.append(conn.address)
+            original_connect(conn)
+
+        with mock.patch('content.unfurl.socket.getaddrinfo', _resolve_to_loopback), \
+                mock.patch.object(_PinnedHTTPConnection, 'connect', connect):
+            with self.assertRaises(UnfurlError):
+                fetch_url(f'http://page.test:{self.port}/redirect')
+        self.assertEqual(connected, ['127.0.0.1']) # The 10.x hop was never connected
+
+    def test_private_address_is_rejected(self):
+        with self.assertRaises(UnfurlError):
+            fetch_url('http://169.254.169.254/latest/meta-data/')
+
+    def test_unresolvable_host_marks_preview_failed(self):
+        with mock.patch('content.unfurl.socket.getaddrinfo', side_effect=socket.gaierror(-2, 'Name or service not known')):
+            with self.assertRaises(UnfurlError):
+                fetch_url('http://no-such-host.invalid/')
+            preview = refresh_preview('http://no-such-host.invalid/')
+        self.assertEqual(preview.status, LinkPreview.FAILED)
+
+
+class CommentReparentTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='x')
+        self.post = Post.objects.create(owner=self.author, content='Hello')
+        self.root = Comment.objects.create(post=self.post, author=self.author, content='Root')
+        self.reply = Comment.objects.create(post=self.post, author=self.author, parent=self.root, content='Reply')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def url(self, comment):
+        return f'/api/posts/{self.post.pk}/comments/{comment.pk}/'
+
+    def test_reply_cannot_be_detached(self):
+        response = self.client.patch(self.url(self.reply), {'parent': None}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.reply.refresh_from_db()
+        self.assertEqual((self.reply.parent_id, self.reply.depth), (self.root.pk, 1))
+
+    def test_top_level_comment_cannot_be_attached(self):
+        other = Comment.objects.create(post=self.post, author=self.author, content='Other')
+        response = self.client.patch(self.url(other), {'parent': self.root.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_edit_repeating_the_parent(self):
+        response = self.client.patch(self.url(self.reply), {'parent': self.root.pk, 'content': 'Edited'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(self.url(self.root), {'parent': None, 'content': 'Edited'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class CounterInvalidationTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(owner=User.objects.create_user(username='owner', password='x'), content='Hello')
+
+    def test_version_is_bumped_after_commit(self):
+        before = post_version(self.post.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            adjust_comments(self.post.pk, 1)
+            self.assertEqual(post_version(self.post.pk), before) # Readers still see the committed counts
+        self.assertNotEqual(post_version(self.post.pk), before)
+
+    def test_reconcile_repairs_and_invalidates(self):
+        Post.objects.filter(pk=self.post.pk).update(comments_count=7)
+        before = post_version(self.post.pk)
+        self.assertEqual(reconcile_counters()['posts'], 1)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comments_count, 0)
+        self.assertNotEqual(post_version(self.post.pk), before)
+
+
+@override_settings(ALLOWED_HOSTS=['one.example', 'two.example'])
+class PostDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            owner=User.objects.create_user(username='owner', password='x'), content='Hello',
+            image='post_images/photo.png', image_variants={'source': 'post_images/photo.png', 'files': {'thumb': 'post_images/photo__thumb.webp'}},
+        )
+        self.client = APIClient()
+
+    def test_media_urls_follow_each_request_host(self):
+        first = self.client.get(f'/api/posts/{self.post.pk}/', HTTP_HOST='one.example')
+        self.assertEqual(first.data['image'], 'http://one.example/media/post_images/photo.png')
+
+        with self.assertNumQueries(0): # Served from the representation cached by the first request
+            second = self.client.get(f'/api/posts/{self.post.pk}/', HTTP_HOST='two.example', secure=True)
+        self.assertEqual(second.data['image'], 'https://two.example/media/post_images/photo.png')
+        self.assertEqual(second.data['variants'], {'thumb': 'https://two.example/media/post_images/photo__thumb.webp'})
+        self.assertIsNone(second.data['video'])
+        self.assertEqual(second['ETag'], first['ETag'])
+
+
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='x')
+        self.post = Post.objects.create(owner=self.author, content='Hello')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        # a
+        # |- b
+        # |  `- d
+        # `- c
+        # e
+        self.a = self.comment('a')
+        self.b = self.comment('b', self.a)
+        self.c = self.comment('c', self.a)
+        self.d = self.comment('d', self.b)
+        self.e = self.comment('e')
+
+    def comment(self, content, parent=None):
+        response = self.client.post(f'/api/posts/{self.post.pk}/comments/', {
+            'content': content, 'parent': parent.pk if parent else None, 'post': self.post.pk, 'author_id': self.author.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return Comment.objects.get(pk=response.data['id'])
+
+    def contents(self, url):
+        results = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            results.extend(item['content'] for item in response.data['results'])
+            url = response.data['next']
+        return results
+
+    def url(self, comment, suffix=''):
+        return f'/api/posts/{self.post.pk}/comments/{comment.pk}/{suffix}'
+
+    def counts(self):
+        return (
+            Post.objects.get(pk=self.post.pk).comments_count,
+            dict(Comment.objects.values_list('content', 'reply_count')),
+        )
+
+    def test_paths_sort_depth_first(self):
+        ordered = Comment.objects.filter(post=self.post).order_by('path').values_list('content', 'depth')
+        self.assertEqual(list(ordered), [('a', 0), ('b', 1), ('d', 2), ('c', 1), ('e', 0)])
+
+    def test_listings(self):
+        self.assertEqual(self.contents(f'/api/posts/{self.post.pk}/comments/?page_size=1'), ['a', 'e'])
+        self.assertEqual(self.contents(self.url(self.a, 'replies/?page_size=1')), ['b', 'c'])
+        self.assertEqual(self.contents(self.url(self.a, 'thread/?page_size=1')), ['b', 'd', 'c'])
+        self.assertEqual(self.contents(self.url(self.e, 'thread/')), [])
+
+    def test_deleting_a_subtree_updates_the_counters(self):
+        self.assertEqual(self.counts(), (5, {'a': 2, 'b': 1, 'c': 0, 'd': 0, 'e': 0}))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(self.url(self.b)).status_code, 204)
+        self.assertEqual(self.counts(), (3, {'a': 1, 'c': 0, 'e': 0}))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(self.url(self.a))
+        self.assertEqual(self.counts(), (1, {'e': 0}))
+
+    def make_legacy(self):
+        """Puts the comments back in the state they were saved in before paths."""
+        Comment.objects.update(path='', depth=0, reply_count=0)
+        for comment in (self.a, self.b, self.c, self.d, self.e):
+            comment.refresh_from_db()
+
+    def test_empty_path_has_no_subtree(self):
+        self.make_legacy()
+        with self.assertRaises(ValueError):
+            self.a.subtree()
+        self.assertEqual(self.client.get(self.url(self.a, 'thread/')).status_code, 404)
+        self.assertEqual(self.contents(f'/api/posts/{self.post.pk}/comments/'), ['a', 'e'])
+
+        # Deleting a legacy comment recounts the post instead of trusting a subtree range
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(self.url(self.b)).status_code, 204)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comments_count, 3)
+
+    def test_backfill(self):
+        expected = dict(Comment.objects.values_list('pk', 'path'))
+        self.make_legacy()
+        # A reply to a legacy comment waits for the backfill too
+        f = self.comment('f', self.d)
+        self.assertEqual(f.path, '')
+
+        call_command('backfill_comment_threads', batch_size=2, stdout=io.StringIO())
+        expected[f.pk] = expected[self.d.pk] + path_segment(f.pk)
+        self.assertEqual(dict(Comment.objects.values_list('pk', 'path')), expected)
+        rows = {comment.content: (comment.depth, comment.reply_count) for comment in Comment.objects.all()}
+        self.assertEqual(rows, {
+            'a': (0, 2), 'b': (1, 1), 'c': (1, 0), 'd': (2, 1), 'e': (0, 0), 'f': (3, 0),
+        })
+        self.assertEqual(self.contents(self.url(self.a, 'thread/')), ['b', 'd', 'f', 'c'])
+
+
+class ContentPaginationTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='x')
+        self.bob = User.objects.create_user(username='bob', password='x')
+        self.posts = [
+            Post.objects.create(owner=owner, content=f'Post {number}', post_type=post_type)
+            for number, (owner, post_type) in enumerate([
+                (self.alice, 'TEXT'), (self.bob, 'LINK'), (self.alice, 'LINK'), (self.bob, 'TEXT'), (self.alice, 'TEXT'),
+            ])
+        ]
+        Post.objects.update(created_at=timezone.now()) # Ties are broken by id
+        self.client = APIClient()
+
+    def pages(self, url, params=None):
+        ids = []
+        response = self.client.get(url, {**(params or {}), 'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_posts_newest_first(self):
+        self.assertEqual(self.pages('/api/posts/'), [post.pk for post in reversed(self.posts)])
+
+    def test_post_filters(self):
+        alices = [post.pk for post in reversed(self.posts) if post.owner == self.alice]
+        links = [post.pk for post in reversed(self.posts) if post.post_type == 'LINK']
+        self.assertEqual(self.pages('/api/posts/', {'owner': self.alice.pk}), alices)
+        self.assertEqual(self.pages('/api/posts/', {'post_type': 'LINK'}), links)
+        self.assertEqual(self.pages('/api/posts/', {'owner': self.alice.pk, 'post_type': 'LINK'}), [self.posts[2].pk])
+
+    def test_invalid_filters_are_rejected(self):
+        for params in ({'owner': '²'}, {'owner': 'x'}, {'owner': '0'}, {'owner': str(2 ** 64)}, {'post_type': 'POLL'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/posts/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.data)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/api/posts/', {'cursor': 'garbage'}).status_code, 404)
+
+    def test_comments_oldest_first(self):
+        post = self.posts[0]
+        comments = [Comment.objects.create(post=post, author=self.bob, content=f'Comment {number}') for number in range(5)]
+        Comment.objects.update(created_at=timezone.now())
+        Comment.objects.create(post=self.posts[1], author=self.bob, content='Elsewhere')
+        self.assertEqual(self.pages(f'/api/posts/{post.pk}/comments/'), [comment.pk for comment in comments])
+
+
+@override_settings(
+    TRENDING_WINDOWS={'24h': {'half_life': 6 * 3600, 'horizon': 24 * 3600}, '7d': {'half_life': 48 * 3600, 'horizon': 7 * 24 * 3600}},
+    TRENDING_WEIGHTS={'like': 1.0, 'comment': 3.0},
+    TRENDING_BATCH_SIZE=2,
+)
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'user{number}', password='x') for number in range(4)]
+        self.posts = [Post.objects.create(owner=self.users[0], content=f'Post {number}') for number in range(3)]
+        self.post_type = ContentType.objects.get_for_model(Post)
+        self.client = APIClient()
+
+    def like(self, user, post, hours_ago=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            like = Like.objects.create(user=user, content_type=self.post_type, object_id=post.pk)
+        Like.objects.filter(pk=like.pk).update(created_at=timezone.now() - timedelta(hours=hours_ago))
+        return like
+
+    def comment(self, post, hours_ago=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comment.objects.create(post=post, author=self.users[0], content='Nice')
+        Comment.objects.filter(pk=comment.pk).update(created_at=timezone.now() - timedelta(hours=hours_ago))
+        return comment
+
+    def delete(self, row):
+        with self.captureOnCommitCallbacks(execute=True):
+            row.delete()
+
+    def log_scores(self):
+        return {(post_id, window): log_score for post_id, window, log_score in TrendingScore.objects.values_list('post_id', 'window', 'log_score')}
+
+    def assertScores(self, window, expected):
+        """Current scores match `expected`, give or take the per-minute grouping of events (under 0.2%)."""
+        half_life = settings.TRENDING_WINDOWS[window]['half_life']
+        scores = {post_id: current_score(log_score, half_life) for (post_id, name), log_score in self.log_scores().items() if name == window}
+        self.assertEqual(set(scores), set(expected))
+        for post_id, score in expected.items():
+            self.assertAlmostEqual(scores[post_id], score, delta=score * 0.003)
+
+    def test_decay(self):
+        first, second, _third = self.posts
+        self.like(self.users[0], first, hours_ago=6) # One half-life ago in 24h, an eighth of one in 7d
+        self.comment(first)
+        self.like(self.users[1], second, hours_ago=30) # Outside 24h's horizon, inside 7d's
+        update_scores()
+        self.assertScores('24h', {first.pk: 3.5, second.pk: 2 ** (-30 / 6)})
+        self.assertScores('7d', {first.pk: 3 + 2 ** (-6 / 48), second.pk: 2 ** (-30 / 48)})
+
+        response = self.client.get('/api/posts/trending/', {'window': '24h'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['results']], [first.pk])
+        self.assertAlmostEqual(response.data['results'][0]['trending_score'], 3.5, delta=0.01)
+
+    def test_incremental_updates_match_a_rebuild(self):
+        first, second, third = self.posts
+        likes = [self.like(user, first, hours_ago=number) for number, user in enumerate(self.users)]
+        self.comment(second, hours_ago=2)
+        update_scores()
+        self.assertFalse(TrendingRefresh.objects.exists())
+
+        # Only the posts touched since are rescored: an unlike and a deleted comment count too
+        self.delete(likes[0])
+        self.delete(Comment.objects.get(post=second))
+        self.like(self.users[0], third)
+        self.assertEqual(update_scores(), 3)
+        self.assertEqual(update_scores(), 0)
+        self.assertScores('24h', {first.pk: 2 ** (-1 / 6) + 2 ** (-2 / 6) + 2 ** (-3 / 6), third.pk: 1.0})
+        incremental = self.log_scores()
+
+        update_scores(rebuild=True)
+        rebuilt = self.log_scores()
+        self.assertEqual(set(rebuilt), set(incremental))
+        for key, log_score in incremental.items():
+            self.assertAlmostEqual(rebuilt[key], log_score, places=9)
+
+    def test_late_commits_are_not_skipped(self):
+        first, second, _third = self.posts
+        with self.captureOnCommitCallbacks() as callbacks:
+            Like.objects.create(user=self.users[0], content_type=self.post_type, object_id=first.pk) # Commits last
+        self.like(self.users[1], second)
+        self.like(self.users[1], first)
+        update_scores()
+        for callback in callbacks:
+            callback()
+        update_scores()
+        self.assertScores('24h', {first.pk: 2.0, second.pk: 1.0})
+
+    def test_limit(self):
+        for post in self.posts:
+            self.like(self.users[0], post)
+        update_scores()
+        for limit in ('-5', '0', 'x'):
+            with self.subTest(limit=limit):
+                response = self.client.get('/api/posts/trending/', {'limit': limit})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.client.get('/api/posts/trending/', {'limit': 2}).data['results']), 2)
+        self.assertEqual(self.client.get('/api/posts/trending/', {'window': '1y'}).status_code, 400)
+
+        # Deleted posts drop out of the cached ranking without a rescore
+        self.posts[0].delete()
+        self.assertEqual(len(self.client.get('/api/posts/trending/').data['results']), 2)
+
+
+@override_settings(CONTENT_LIKED_IDS_CACHE_TTL=30)
+class LikedFlagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.viewer = User.objects.create_user(username='viewer', password='x')
+        owner = User.objects.create_user(username='owner', password='x')
+        self.posts = [Post.objects.create(owner=owner, content=f'Post {number}') for number in range(4)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+        ContentType.objects.get_for_model(Post) # Warm ContentType's cache
+
+    def like(self, post, method='post'):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(f'/api/likes/post/{post.pk}/', {
+                'user_id': self.viewer.pk, 'content_type': 'post', 'object_id': post.pk,
+            }, format='json')
+        self.assertIn(response.status_code, (201, 204))
+
+    def flags(self):
+        response = self.client.get('/api/posts/')
+        return {item['id']: item['has_liked'] for item in response.data['results']}
+
+    def test_has_liked_follows_likes_and_unlikes(self):
+        first, second = self.posts[:2]
+        self.assertFalse(any(self.flags().values()))
+        self.like(first)
+        self.assertEqual({post_id for post_id, liked in self.flags().items() if liked}, {first.pk})
+        self.assertTrue(self.client.get(f'/api/posts/{first.pk}/').data['has_liked'])
+        self.assertFalse(self.client.get(f'/api/posts/{second.pk}/').data['has_liked'])
+
+        self.like(first, method='delete')
+        self.assertFalse(any(self.flags().values()))
+        self.assertFalse(self.client.get(f'/api/posts/{first.pk}/').data['has_liked'])
+
+    def test_one_query_per_page_then_cached(self):
+        page, other_page = [post.pk for post in self.posts[:2]], [post.pk for post in self.posts[2:]]
+        Like.objects.create(user=self.viewer, content_type=ContentType.objects.get_for_model(Post), object_id=page[0])
+        with self.assertNumQueries(1):
+            self.assertEqual(liked_ids(self.viewer, Post, page), {page[0]})
+        with self.assertNumQueries(1):
+            self.assertEqual(liked_ids(self.viewer, Post, other_page), set())
+        with self.assertNumQueries(0):
+            self.assertEqual(liked_ids(self.viewer, Post, list(reversed(page))), {page[0]})
+            self.assertEqual(liked_ids(self.viewer, Post, other_page), set())
+
+        self.like(self.posts[2]) # Invalidates every cached page of the viewer's
+        with self.assertNumQueries(1):
+            self.assertEqual(liked_ids(self.viewer, Post, other_page), {other_page[0]})
+        with self.assertNumQueries(0):
+            self.assertEqual(liked_ids(self.viewer, Post, other_page), {other_page[0]})
+
+    def test_anonymous_viewers_run_no_query(self):
+        self.client.force_authenticate(None)
+        with self.assertNumQueries(0):
+            self.assertEqual(liked_ids(None, Post, [self.posts[0].pk]), set())
+        self.assertFalse(any(self.flags().values()))
+
+
+class CounterPathTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='x')
+        self.post = Post.objects.create(owner=self.author, content='Hello')
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def counts(self):
+        self.post.refresh_from_db()
+        return self.post.likes_count, self.post.comments_count
+
+    def test_like_and_unlike(self):
+        url = f'/api/likes/post/{self.post.pk}/'
+        data = {'user_id': self.author.pk, 'content_type': 'post', 'object_id': self.post.pk}
+        self.assertEqual(self.client.post(url, data, format='json').status_code, 201)
+        self.assertEqual(self.client.post(url, data, format='json').status_code, 400) # Already liked
+        self.assertEqual(self.counts(), (1, 0))
+        stale = Like.objects.get()
+
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.counts(), (0, 0))
+        Post.objects.filter(pk=self.post.pk).update(likes_count=1) # Another user's like
+        # A concurrent unlike that found the row before it was deleted must not decrement again
+        LikeCreateDeleteAPIView().perform_destroy(stale)
+        self.assertEqual(self.counts(), (1, 0))
+        self.assertEqual(self.client.delete(url).status_code, 404)
+
+    def test_comment_and_reply_counts(self):
+        url = f'/api/posts/{self.post.pk}/comments/'
+        data = {'post': self.post.pk, 'author_id': self.author.pk}
+        root = self.client.post(url, {**data, 'content': 'Root'}, format='json').data['id']
+        reply = self.client.post(url, {**data, 'content': 'Reply', 'parent': root}, format='json').data['id']
+        self.client.post(url, {**data, 'content': 'Nested', 'parent': reply}, format='json')
+        self.assertEqual(self.counts(), (0, 3))
+        self.assertEqual(Comment.objects.get(pk=root).reply_count, 1)
+
+        stale = Comment.objects.get(pk=reply)
+        self.assertEqual(self.client.delete(f'{url}{reply}/').status_code, 204)
+        self.assertEqual(self.counts(), (0, 1))
+        self.assertEqual(Comment.objects.get(pk=root).reply_count, 0)
+
+        Comment.objects.filter(pk=root).update(reply_count=1)
+        CommentRetrieveUpdateDestroyAPIView().perform_destroy(stale) # Lost a race with the delete above
+        self.assertEqual(self.counts(), (0, 1))
+        self.assertEqual(Comment.objects.get(pk=root).reply_count, 1)
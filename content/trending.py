@@ -0,0 +1,168 @@
+# my_entrepreneur_platform/content/trending.py
+
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, Max, OuterRef
+from django.db.models.functions import TruncMinute
+from django.utils import timezone
+
+from my_entrepreneur_platform.refresh import mark_on_commit
+from .models import Post, Comment, Like, TrendingRefresh, TrendingScore
+
+# Forward decay: an event at time t contributes weight * 2**((t - LANDMARK) / half_life).
+# Contributions grow with time instead of old ones shrinking, so scores computed
+# at different times stay comparable and only posts with changed activity are
+# rescored. Scores are kept as natural logs to stay finite however far t is from LANDMARK.
+LANDMARK = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+TOP_KEY = 'content:trending:top:{window}'
+LOCK_KEY = 'content:trending:lock' # One run at a time
+LOCK_TIMEOUT = 15 * 60
+
+
+def _log_contribution(weight, at, half_life):
+    return math.log(weight) + math.log(2) * (at - LANDMARK).total_seconds() / half_life
+
+def _logaddexp(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+def current_score(log_score, half_life, now=None):
+    """The decayed score as of `now`: weighted events, each halved every half-life since it happened."""
+    now = now or timezone.now()
+    return math.exp(log_score - math.log(2) * (now - LANDMARK).total_seconds() / half_life)
+
+
+# --- Scoring ---
+# A like or comment being added or removed (cascades included) marks its post
+# once the write commits (see content.signals); each run rescores the marked
+# posts from their events. Marks are cleared before the events are read, so a
+# change committed during a run is picked up by the next one, whatever order
+# transactions commit in, and removals lower the score like additions raise it.
+
+def mark_for_refresh(post_id):
+    mark_on_commit(TrendingRefresh, post_id)
+
+def update_scores(rebuild=False):
+    """
+    Rescores the posts marked since the last run, then refreshes the cached
+    top-N lists. With `rebuild` (or when no scores exist yet) every post with
+    events inside the longest window is rescored instead.
+    Returns the number of posts rescored.
+    """
+    if not cache.add(LOCK_KEY, True, LOCK_TIMEOUT):
+        return 0 # Another run is in progress
+    try:
+        return _update_scores(rebuild or not TrendingScore.objects.exists())
+    finally:
+        cache.delete(LOCK_KEY)
+
+def _update_scores(rebuild):
+    now = timezone.now()
+    oldest = now - timedelta(seconds=max(window['horizon'] for window in settings.TRENDING_WINDOWS.values()))
+    if rebuild:
+        TrendingRefresh.objects.all().delete() # Everything read from here on is covered
+        TrendingScore.objects.all().delete() # The cached top lists are served until refresh_top
+        active = Post.objects.filter(
+            Exists(Like.objects.filter(content_type=ContentType.objects.get_for_model(Post), object_id=OuterRef('pk'), created_at__gte=oldest))
+            | Exists(Comment.objects.filter(post=OuterRef('pk'), created_at__gte=oldest))
+        )
+        batches = _id_batches(active, 'pk', clear=False)
+    else:
+        batches = _id_batches(TrendingRefresh.objects.all(), 'post_id', clear=True)
+
+    rescored = 0
+    for post_ids in batches:
+        _rescore(post_ids, since=oldest)
+        rescored += len(post_ids)
+    # Posts quiet for longer than every window can never rank again
+    TrendingScore.objects.filter(last_event_at__lt=oldest).delete()
+    refresh_top()
+    return rescored
+
+def _id_batches(queryset, field, clear):
+    """`field` values of `queryset` in ascending TRENDING_BATCH_SIZE batches, deleting each batch's rows first if `clear`."""
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(**{f'{field}__gt': last_id}).order_by(field)
+            .values_list(field, flat=True)[:settings.TRENDING_BATCH_SIZE]
+        )
+        if not batch:
+            return
+        last_id = batch[-1]
+        if clear:
+            queryset.filter(**{f'{field}__in': batch}).delete()
+        yield batch
+
+def _events(post_ids, since):
+    """
+    (post id, minute, weight) for the likes and comments of `post_ids` since
+    `since`, grouped per minute in the database: every event counts from the
+    start of its minute (under 0.2% off for half-lives of hours).
+    """
+    weights = settings.TRENDING_WEIGHTS
+    likes = Like.objects.filter(content_type=ContentType.objects.get_for_model(Post), object_id__in=post_ids)
+    comments = Comment.objects.filter(post_id__in=post_ids)
+    for kind, queryset, post_field in (('like', likes, 'object_id'), ('comment', comments, 'post_id')):
+        rows = (
+            queryset.filter(created_at__gte=since).order_by()
+            .annotate(minute=TruncMinute('created_at')).values_list(post_field, 'minute')
+            .annotate(events=Count('pk'), latest=Max('created_at'))
+        )
+        for post_id, minute, events, latest in rows.iterator(chunk_size=5000):
+            yield post_id, minute, latest, weights[kind] * events
+
+def _rescore(post_ids, since):
+    log_scores = {name: defaultdict(lambda: -math.inf) for name in settings.TRENDING_WINDOWS}
+    last_seen = {}
+    for post_id, minute, latest, weight in _events(post_ids, since):
+        for name, window in settings.TRENDING_WINDOWS.items():
+            log_scores[name][post_id] = _logaddexp(log_scores[name][post_id], _log_contribution(weight, minute, window['half_life']))
+        last_seen[post_id] = max(latest, last_seen.get(post_id, latest))
+
+    existing = set(Post.objects.filter(pk__in=list(last_seen)).values_list('pk', flat=True)) # Skip posts deleted meanwhile
+    with transaction.atomic():
+        # Posts left without events in range (every like/comment removed) drop out of the ranking
+        TrendingScore.objects.filter(post_id__in=post_ids).exclude(post_id__in=existing).delete()
+        TrendingScore.objects.bulk_create(
+            [
+                TrendingScore(post_id=post_id, window=name, log_score=scores[post_id], last_event_at=last_seen[post_id])
+                for name, scores in log_scores.items() for post_id in scores if post_id in existing
+            ],
+            update_conflicts=True,
+            unique_fields=['post', 'window'],
+            update_fields=['log_score', 'last_event_at'],
+            batch_size=1000,
+        )
+
+
+# --- Top-N ---
+def refresh_top():
+    """Caches each window's TRENDING_TOP_N as a compact [(post id, score)] list, best first."""
+    now = timezone.now()
+    for name, window in settings.TRENDING_WINDOWS.items():
+        rows = (
+            TrendingScore.objects
+            .filter(window=name, last_event_at__gte=now - timedelta(seconds=window['horizon']))
+            .order_by('-log_score')
+            .values_list('post_id', 'log_score')[:settings.TRENDING_TOP_N]
+        )
+        cache.set(
+            TOP_KEY.format(window=name),
+            [(post_id, round(current_score(log_score, window['half_life'], now), 4)) for post_id, log_score in rows],
+            None,
+        )
+
+def top_posts(window):
+    """[(post id, score)] for a window, computing it once if the cache is cold."""
+    ranked = cache.get(TOP_KEY.format(window=window))
+    if ranked is None:
+        refresh_top()
+        ranked = cache.get(TOP_KEY.format(window=window), [])
+    return ranked
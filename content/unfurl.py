@@ -0,0 +1,194 @@
+# my_entrepreneur_platform/content/unfurl.py
+
+import http.client
+import ipaddress
+import socket
+import urllib.request
+from datetime import timedelta
+from functools import partial
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .caching import bump_post_versions
+from .models import LinkPreview, Post
+
+TITLE_MAX_LENGTH = 300
+DESCRIPTION_MAX_LENGTH = 1000
+
+
+class UnfurlError(Exception):
+    """The URL could not be fetched or is not an HTML page."""
+
+
+# --- Default fetcher ---
+class _MetaParser(HTMLParser):
+    """Collects <title> and the Open Graph / description <meta> tags from a page head."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ''
+        self._in_title = False
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            key = (attrs.get('property') or attrs.get('name') or '').lower()
+            if key and attrs.get('content') and key not in self.meta:
+                self.meta[key] = attrs['content'].strip()
+        elif tag == 'body':
+            self.done = True # Everything we want lives in <head>
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'head':
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+def _is_public(address):
+    return ipaddress.ip_address(address).is_global
+
+def _public_address(url):
+    """
+    The IP address to connect to for `url`. Unless LINK_PREVIEW_ALLOW_PRIVATE_HOSTS
+    is on, every address the host resolves to must be public, so post links can't
+    make the server probe its own network.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise UnfurlError(f"Unsupported URL: {url}")
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        addresses = [info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)]
+    except (OSError, ValueError) as e: # Unresolvable host, bad port
+        raise UnfurlError(f"Cannot resolve {parts.hostname}: {e}") from e
+    if not settings.LINK_PREVIEW_ALLOW_PRIVATE_HOSTS:
+        for address in addresses:
+            if not _is_public(address):
+                raise UnfurlError(f"{parts.hostname} resolves to a non-public address.")
+    return addresses[0]
+
+# The connection goes to the address that was checked, not to a fresh lookup of
+# the host name, so a DNS rebind between check and connect can't redirect it
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, address, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.address = address
+
+    def connect(self):
+        self.sock = socket.create_connection((self.address, self.port), self.timeout, self.source_address)
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, address, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.address = address
+
+    def connect(self):
+        sock = socket.create_connection((self.address, self.port), self.timeout, self.source_address)
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host) # Certificate still checked against the host name
+
+class _PinnedHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(partial(_PinnedHTTPConnection, address=_public_address(req.full_url)), req)
+
+class _PinnedHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(partial(_PinnedHTTPSConnection, address=_public_address(req.full_url)), req, context=self._context)
+
+class _CheckedRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Validates every redirect hop before following it."""
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _public_address(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+def _opener():
+    # No ProxyHandler: a proxy would do its own lookup and bypass the pinned address
+    return urllib.request.build_opener(
+        urllib.request.ProxyHandler({}), _PinnedHTTPHandler, _PinnedHTTPSHandler, _CheckedRedirectHandler,
+    )
+
+def fetch_url(url):
+    """
+    Fetches a page's title, description and image with LINK_PREVIEW_TIMEOUT and
+    reads at most LINK_PREVIEW_MAX_BYTES of it. Returns a dict with those keys.
+    """
+    request = urllib.request.Request(url, headers={'User-Agent': settings.LINK_PREVIEW_USER_AGENT, 'Accept': 'text/html'})
+    try:
+        with _opener().open(request, timeout=settings.LINK_PREVIEW_TIMEOUT) as response:
+            final_url = response.geturl()
+            if response.headers.get_content_type() != 'text/html':
+                raise UnfurlError(f"{url} is not an HTML page.")
+            charset = response.headers.get_content_charset() or 'utf-8'
+            parser = _MetaParser()
+            remaining = settings.LINK_PREVIEW_MAX_BYTES
+            while remaining > 0 and not parser.done:
+                block = response.read(min(16 * 1024, remaining))
+                if not block:
+                    break
+                remaining -= len(block)
+                parser.feed(block.decode(charset, errors='replace'))
+    except (OSError, ValueError) as e: # URLError, timeouts, bad charsets
+        raise UnfurlError(str(e)) from e
+
+    meta = parser.meta
+    image = meta.get('og:image') or meta.get('twitter:image')
+    return {
+        'title': (meta.get('og:title') or meta.get('twitter:title') or parser.title).strip(),
+        'description': meta.get('og:description') or meta.get('description') or meta.get('twitter:description') or '',
+        'image': urljoin(final_url, image) if image else '',
+    }
+
+
+# --- Preview cache ---
+def request_preview(url):
+    """
+    Makes sure a preview of `url` exists or is being fetched. Returns True if the
+    caller should enqueue a fetch: the URL is new, or its cached preview expired.
+    Claiming the row moves its expiry forward first, so concurrent posts of the
+    same URL enqueue only one fetch.
+    """
+    now = timezone.now()
+    retry_at = now + timedelta(seconds=settings.LINK_PREVIEW_FAILURE_TTL)
+    preview, created = LinkPreview.objects.get_or_create(url=url, defaults={'expires_at': retry_at})
+    if created:
+        return True
+    return bool(LinkPreview.objects.filter(pk=preview.pk, expires_at__lte=now).update(expires_at=retry_at))
+
+def refresh_preview(url):
+    """Fetches `url` with LINK_PREVIEW_FETCHER and stores the result (or the failure)."""
+    fetcher = import_string(settings.LINK_PREVIEW_FETCHER)
+    now = timezone.now()
+    try:
+        fields = fetcher(url)
+    except UnfurlError:
+        fields = None
+    if fields is None:
+        values = {'status': LinkPreview.FAILED, 'expires_at': now + timedelta(seconds=settings.LINK_PREVIEW_FAILURE_TTL)}
+    else:
+        values = {
+            'status': LinkPreview.READY,
+            'title': fields.get('title', '')[:TITLE_MAX_LENGTH],
+            'description': fields.get('description', '')[:DESCRIPTION_MAX_LENGTH],
+            'image_url': fields.get('image', '')[:LinkPreview._meta.get_field('image_url').max_length],
+            'expires_at': now + timedelta(seconds=settings.LINK_PREVIEW_TTL),
+        }
+    preview, _created = LinkPreview.objects.update_or_create(url=url, defaults={**values, 'fetched_at': now})
+    bump_post_versions(Post.objects.filter(link=url).values_list('pk', flat=True)) # They embed the preview
+    return preview
+
+def previews_for(urls):
+    """{url: LinkPreview} for the ready previews among `urls`, in one query."""
+    urls = {url for url in urls if url}
+    if not urls:
+        return {}
+    return {preview.url: preview for preview in LinkPreview.objects.filter(url__in=urls, status=LinkPreview.READY)}
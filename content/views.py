@@ -1,14 +1,23 @@
 # my_entrepreneur_platform/content/views.py
 
-from rest_framework import generics, permissions, status
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db import transaction
 from django.contrib.contenttypes.models import ContentType
+from django.utils.http import http_date
 
+from .counters import adjust_comments, adjust_likes, adjust_replies
+from .caching import get_representation, post_version, set_representation, with_absolute_urls
+from .likes import forget_liked, liked_ids
+from .trending import top_posts
 from .models import Post, Comment, Like
 from .serializers import PostSerializer, CommentSerializer, LikeSerializer
+from media.serving import not_modified
+from my_entrepreneur_platform.facets import parse_id_filter
+from my_entrepreneur_platform.pagination import KeysetCursorPagination
 
 
 # Custom Permission: Only the owner/author of the object can modify/delete it
@@ -19,20 +28,38 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.owner == request.user if hasattr(obj, 'owner') else obj.author == request.user
 
 
+# --- Pagination ---
+# Newest posts first, oldest comments first; each ordering matches an index in content.models
+class PostCursorPagination(KeysetCursorPagination):
+    ordering = ('-created_at', '-id')
+
+class CommentCursorPagination(KeysetCursorPagination):
+    ordering = ('created_at', 'id')
+
+class ThreadCursorPagination(KeysetCursorPagination):
+    ordering = ('path',) # Depth-first; paths are unique
+
+
 # --- Post Views ---
 class PostListCreateAPIView(generics.ListCreateAPIView): # <--- THIS IS THE MISSING CLASS
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = PostCursorPagination
 
     def get_queryset(self):
-        post_content_type = ContentType.objects.get_for_model(Post)
-
-        return Post.objects.all().annotate(
-            likes_count=Count(
-                'likes',
-                filter=Q(likes__content_type=post_content_type)
-            )
-        ).select_related('owner').order_by('-created_at')
+        # likes_count/comments_count are stored on the row, so no aggregation is needed
+        queryset = Post.objects.all().select_related('owner')
+
+        # Optional filters, e.g. ?owner=3&post_type=IMAGE (each has its own keyset index)
+        owner = self.request.query_params.get('owner')
+        if owner:
+            queryset = queryset.filter(owner_id=parse_id_filter(owner, 'owner', "Must be a user id."))
+        post_type = self.request.query_params.get('post_type')
+        if post_type:
+            if post_type not in dict(Post.POST_TYPE_CHOICES):
+                raise serializers.ValidationError({'post_type': f"Must be one of {', '.join(dict(Post.POST_TYPE_CHOICES))}."})
+            queryset = queryset.filter(post_type=post_type)
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -42,36 +69,121 @@ class PostRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsOwnerOrReadOnly]
 
     def get_queryset(self):
-        post_content_type = ContentType.objects.get_for_model(Post)
+        return Post.objects.all().select_related('owner')
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serves the post from a cached representation keyed by its version (see
+        content.caching), and answers If-None-Match / If-Modified-Since with 304.
+        Once warm, a poll costs no post queries; has_liked is added per viewer.
+        """
+        post_id = self.kwargs['pk']
+        version = post_version(post_id)
+        data = get_representation(post_id, version)
+        if data is None:
+            # Serialized without the request, so media URLs stay relative and has_liked is left to the viewer below
+            serializer = self.get_serializer_class()(self.get_object(), context={**self.get_serializer_context(), 'request': None})
+            data = dict(serializer.data)
+            data.pop('has_liked')
+            set_representation(post_id, version, data)
+
+        has_liked = post_id in liked_ids(request.user, Post, [post_id])
+        etag = f'"{post_id}-{version:x}-{int(has_liked)}"'
+        modified = version / 1e9
+        if not_modified(request, etag, modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({**with_absolute_urls(request, data), 'has_liked': has_liked})
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        response['Cache-Control'] = 'private, no-cache' # Revalidate every time, cheaply
+        return response
+
+
+class TrendingPostsAPIView(APIView):
+    """Top posts of a trending window (?window=24h), served from the precomputed ranking."""
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
-        return Post.objects.all().annotate(
-            likes_count=Count(
-                'likes',
-                filter=Q(likes__content_type=post_content_type)
-            )
-        ).select_related('owner')
+    def get(self, request, *args, **kwargs):
+        window = request.query_params.get('window', next(iter(settings.TRENDING_WINDOWS)))
+        if window not in settings.TRENDING_WINDOWS:
+            return Response({"detail": f"window must be one of {', '.join(settings.TRENDING_WINDOWS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response({"detail": "limit must be a positive number."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, settings.TRENDING_TOP_N)
+
+        ranked = top_posts(window)[:limit]
+        posts = Post.objects.select_related('owner').in_bulk([post_id for post_id, _score in ranked])
+        ranked = [(posts[post_id], score) for post_id, score in ranked if post_id in posts] # Skip deleted posts
+        data = PostSerializer([post for post, _score in ranked], many=True, context={'request': request}).data
+        for item, (_post, score) in zip(data, ranked):
+            item['trending_score'] = score
+        return Response({'window': window, 'results': data}, status=status.HTTP_200_OK)
 
 
 # --- Comment Views ---
 class CommentListCreateAPIView(generics.ListCreateAPIView): # <--- THIS IS ANOTHER MISSING CLASS
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self):
+        # Top-level comments only; replies are expanded through CommentRepliesAPIView
         post_id = self.kwargs['post_id']
         post = get_object_or_404(Post, id=post_id)
-        return Comment.objects.filter(post=post).select_related('author').order_by('created_at')
+        # parent__isnull also keeps out replies that predate paths (depth 0 until backfilled)
+        return Comment.objects.filter(post=post, depth=0, parent__isnull=True).select_related('author')
 
     def perform_create(self, serializer):
         post_id = self.kwargs['post_id']
         post = get_object_or_404(Post, id=post_id)
-        serializer.save(author=self.request.user, post=post)
+        with transaction.atomic():
+            comment = serializer.save(author=self.request.user, post=post)
+            adjust_comments(post.pk, 1)
+            if comment.parent_id:
+                adjust_replies(comment.parent_id, 1)
 
 class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Comment.objects.all().select_related('author')
     serializer_class = CommentSerializer
     permission_classes = [IsOwnerOrReadOnly]
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            _deleted, per_model = instance.delete()
+            # The comment and the replies cascaded with it; none if a concurrent request deleted it first
+            removed = per_model.get(Comment._meta.label, 0)
+            if removed:
+                adjust_comments(instance.post_id, -removed)
+                if instance.parent_id:
+                    adjust_replies(instance.parent_id, -1)
+
+class CommentRepliesAPIView(generics.ListAPIView):
+    """Direct replies of one comment, oldest first: one page per expansion in the client."""
+    serializer_class = CommentSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CommentCursorPagination
+
+    def get_queryset(self):
+        parent = get_object_or_404(Comment, pk=self.kwargs['pk'], post_id=self.kwargs['post_id'])
+        return Comment.objects.filter(parent=parent).select_related('author')
+
+class CommentThreadAPIView(generics.ListAPIView):
+    """All descendants of one comment in depth-first order, paged over a single path range."""
+    serializer_class = CommentSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ThreadCursorPagination
+
+    def get_queryset(self):
+        # A comment that predates paths has no subtree range until it is backfilled
+        root = get_object_or_404(Comment, pk=self.kwargs['pk'], post_id=self.kwargs['post_id'], path__gt='')
+        return root.subtree().exclude(pk=root.pk).select_related('author')
+
 
 # --- Like Views ---
 class LikeCreateDeleteAPIView(generics.CreateAPIView, generics.DestroyAPIView): # This one was in your screenshot
@@ -97,7 +209,17 @@ class LikeCreateDeleteAPIView(generics.CreateAPIView, generics.DestroyAPIView):
         return obj
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            like = serializer.save(user=self.request.user)
+            adjust_likes(like.content_type, like.object_id, 1)
+        forget_liked(like.user_id, like.content_type.model_class())
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            deleted, _per_model = instance.delete()
+            if deleted: # Not if a concurrent unlike got there first
+                adjust_likes(instance.content_type, instance.object_id, -1)
+        forget_liked(instance.user_id, instance.content_type.model_class())
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
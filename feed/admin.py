@@ -0,0 +1,7 @@
+# my_entrepreneur_platform/feed/admin.py
+
+from django.contrib import admin
+from .models import TimelineEntry
+
+# Register your models here
+admin.site.register(TimelineEntry)
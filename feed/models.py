@@ -0,0 +1,33 @@
+# my_entrepreneur_platform/feed/models.py
+
+from django.db import models
+from django.conf import settings # To refer to the User model
+from content.models import Post
+
+class TimelineEntry(models.Model):
+    """
+    One post pushed into one user's precomputed home timeline (fan-out on write).
+    Timelines are bounded to FEED_TIMELINE_LENGTH entries per user.
+    """
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        help_text="The user whose home timeline this entry belongs to."
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    # Copies of the post's author and creation time, so timeline reads and
+    # unfollow clean-ups never need to join the post table
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Timeline Entries"
+        unique_together = ('owner', 'post')
+        indexes = [
+            # Keyset pagination over one user's timeline, newest first
+            models.Index(fields=['owner', '-created_at', '-post'], name='feed_timeline_keyset_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} in {self.owner_id}'s timeline"
@@ -0,0 +1,36 @@
+# my_entrepreneur_platform/feed/signals.py
+
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from content.models import Post
+from social.bulk import in_bulk_write
+from social.models import Follow
+from .tasks import fan_out_post, rebuild_timeline
+
+logger = logging.getLogger(__name__)
+
+
+def _delay_on_commit(task, *args):
+    def enqueue():
+        try:
+            task.delay(*args)
+        except Exception:
+            # A broker outage must not fail the user's write; the feed catches up on the next rebuild
+            logger.exception(f"Could not enqueue {task.name}{args}.")
+    transaction.on_commit(enqueue)
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    if created:
+        _delay_on_commit(fan_out_post, instance.pk)
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def rebuild_follower_timeline(sender, instance, **kwargs):
+    if in_bulk_write():
+        return # social.bulk queues one rebuild for the whole batch
+    _delay_on_commit(rebuild_timeline, instance.follower_id)
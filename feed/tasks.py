@@ -0,0 +1,33 @@
+# my_entrepreneur_platform/feed/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from content.models import Post
+from . import timelines
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def fan_out_post(self, post_id):
+    """Pushes a newly created post into its author's followers' home timelines."""
+    post = Post.objects.filter(pk=post_id).only('pk', 'owner_id', 'created_at').first()
+    if post is None:
+        return 0 # Deleted before the task ran
+    written = timelines.fan_out(post)
+    logger.info(f"Task {self.request.id} completed: post {post_id} pushed to {written} timelines")
+    return written
+
+@shared_task(bind=True)
+def rebuild_timeline(self, user_id):
+    """Recomputes one user's home timeline after they follow or unfollow someone."""
+    written = timelines.rebuild_timeline(user_id)
+    logger.info(f"Task {self.request.id} completed: rebuilt timeline of user {user_id} ({written} entries)")
+    return written
+
+@shared_task(bind=True)
+def trim_timelines(self):
+    """Keeps every timeline bounded to FEED_TIMELINE_LENGTH entries."""
+    deleted = timelines.trim_timelines()
+    logger.info(f"Task {self.request.id} completed: trimmed {deleted} timeline entries")
+    return deleted
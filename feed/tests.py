@@ -0,0 +1,83 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from content.models import Post
+from social.graph import adjust_follow_counts
+from social.models import Follow
+from startups.models import Startup
+from .timelines import audience_sizes, home_timeline
+
+User = get_user_model()
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+class MalformedCursorTests(TestCase):
+    CURSORS = {
+        'empty list': _cursor([]),
+        'too short': _cursor(['2024-01-01T00:00:00+00:00']),
+        'too long': _cursor(['2024-01-01T00:00:00+00:00', 1, 2]),
+        'not a date': _cursor(['yesterday', 1]),
+        'not an id': _cursor(['2024-01-01T00:00:00+00:00', 'x']),
+        'nested': _cursor([[1], {'a': 1}]),
+        'null': _cursor([None, None]),
+        'not a list': _cursor({'created_at': 1}),
+        'not base64': '!!!',
+    }
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', password='x')
+        Post.objects.create(owner=self.user, content='Hello')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_malformed_cursors_are_not_found(self):
+        urls = ['/api/posts/', '/api/projects/', '/api/startups/', f'/api/users/{self.user.pk}/following/', '/api/feed/']
+        for url in urls:
+            for name, cursor in self.CURSORS.items():
+                with self.subTest(url=url, cursor=name):
+                    response = self.client.get(url, {'cursor': cursor})
+                    self.assertEqual(response.status_code, 404)
+
+    def test_next_cursor_round_trips(self):
+        for number in range(3):
+            Post.objects.create(owner=self.user, content=f'Post {number}')
+        response = self.client.get('/api/posts/', {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+
+class AudienceSizeTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='x')
+        self.startup = Startup.objects.create(owner=self.author, name='Acme', description='A startup')
+        self.user_type = ContentType.objects.get_for_model(User)
+        self.startup_type = ContentType.objects.get_for_model(Startup)
+        for number in range(3):
+            fan = User.objects.create_user(username=f'fan{number}', password='x')
+            Follow.objects.create(follower=fan, content_type=self.user_type, object_id=self.author.pk)
+            adjust_follow_counts(fan.pk, self.user_type, [self.author.pk], 1)
+            if number:
+                Follow.objects.create(follower=fan, content_type=self.startup_type, object_id=self.startup.pk)
+                adjust_follow_counts(fan.pk, self.startup_type, [self.startup.pk], 1)
+
+    def test_sizes_come_from_the_counters(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(audience_sizes([self.author.pk]), {self.author.pk: 5})
+
+    def test_home_timeline_pulls_authors_over_the_threshold(self):
+        reader = User.objects.get(username='fan0')
+        post = Post.objects.create(owner=self.author, content='Hello')
+        with self.settings(FEED_FANOUT_THRESHOLD=2):
+            posts, has_more = home_timeline(reader)
+        self.assertEqual([item.pk for item in posts], [post.pk])
+        self.assertFalse(has_more)
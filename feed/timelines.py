@@ -0,0 +1,158 @@
+# my_entrepreneur_platform/feed/timelines.py
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F, Q, Sum, Window
+from django.db.models.functions import RowNumber
+
+from content.models import Post
+from social.models import Follow
+from startups.models import Startup
+from users.models import UserProfile
+from my_entrepreneur_platform.pagination import keyset_filter
+from .models import TimelineEntry
+
+User = get_user_model()
+
+# Keyset orderings for the two sources of a home timeline
+TIMELINE_ORDERING = ('-created_at', '-post_id')
+POST_ORDERING = ('-created_at', '-id')
+
+
+# --- Follow graph lookups ---
+# Posts have no startup field, so following a startup means following the posts
+# written by its owner.
+
+def followed_author_ids(user_id):
+    """Authors whose posts belong in a user's feed: followed users plus owners of followed startups."""
+    user_type = ContentType.objects.get_for_model(User)
+    startup_type = ContentType.objects.get_for_model(Startup)
+    follows = Follow.objects.filter(follower_id=user_id, content_type__in=[user_type, startup_type])
+    authors = set()
+    startup_ids = []
+    for content_type_id, object_id in follows.values_list('content_type_id', 'object_id'):
+        if content_type_id == user_type.id:
+            authors.add(object_id)
+        else:
+            startup_ids.append(object_id)
+    if startup_ids:
+        authors.update(Startup.objects.filter(pk__in=startup_ids).values_list('owner_id', flat=True))
+    authors.discard(user_id)
+    return authors
+
+def _audience_follows(author_ids):
+    user_type = ContentType.objects.get_for_model(User)
+    startup_type = ContentType.objects.get_for_model(Startup)
+    owned_startups = Startup.objects.filter(owner_id__in=author_ids).values('pk')
+    return Follow.objects.filter(
+        Q(content_type=user_type, object_id__in=author_ids) |
+        Q(content_type=startup_type, object_id__in=owned_startups)
+    )
+
+def audience_ids(author_id):
+    """Users who receive an author's posts: their followers plus followers of the startups they own."""
+    return set(_audience_follows([author_id]).values_list('follower_id', flat=True)) - {author_id}
+
+def audience_sizes(author_ids):
+    """
+    {author id: their followers plus their startups' followers}, for the fan-out
+    threshold check. Read from the denormalized counters (see social.graph), so
+    the cost does not grow with the audience.
+    """
+    if not author_ids:
+        return {}
+    sizes = dict(UserProfile.objects.filter(user_id__in=author_ids).values_list('user_id', 'followers_count'))
+    startup_followers = (
+        Startup.objects.filter(owner_id__in=author_ids).order_by()
+        .values('owner_id').annotate(followers=Sum('followers_count'))
+        .values_list('owner_id', 'followers')
+    )
+    for author_id, followers in startup_followers:
+        sizes[author_id] = sizes.get(author_id, 0) + followers
+    return sizes
+
+def fans_out_on_write(audience_size):
+    """Authors above FEED_FANOUT_THRESHOLD are not pushed; their posts are merged in at read time."""
+    return audience_size <= settings.FEED_FANOUT_THRESHOLD
+
+
+# --- Writes ---
+def fan_out(post):
+    """Pushes a new post into its audience's timelines. Returns the number of timelines written."""
+    if not fans_out_on_write(audience_sizes([post.owner_id]).get(post.owner_id, 0)):
+        return 0
+    followers = list(audience_ids(post.owner_id))
+    batch_size = settings.FEED_FANOUT_BATCH_SIZE
+    for start in range(0, len(followers), batch_size):
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(owner_id=follower_id, post_id=post.pk, author_id=post.owner_id, created_at=post.created_at)
+                for follower_id in followers[start:start + batch_size]
+            ],
+            ignore_conflicts=True,
+        )
+    return len(followers)
+
+def rebuild_timeline(user_id):
+    """
+    Recomputes a user's timeline from the authors they follow (after a follow or
+    unfollow): the newest FEED_TIMELINE_LENGTH posts by fan-out-on-write authors.
+    """
+    authors = followed_author_ids(user_id)
+    sizes = audience_sizes(authors)
+    pushed_authors = [author_id for author_id in authors if fans_out_on_write(sizes.get(author_id, 0))]
+    recent = (
+        Post.objects.filter(owner_id__in=pushed_authors)
+        .order_by(*POST_ORDERING)
+        .values_list('pk', 'owner_id', 'created_at')[:settings.FEED_TIMELINE_LENGTH]
+    )
+    entries = [
+        TimelineEntry(owner_id=user_id, post_id=post_id, author_id=author_id, created_at=created_at)
+        for post_id, author_id, created_at in recent
+    ]
+    with transaction.atomic():
+        TimelineEntry.objects.filter(owner_id=user_id).delete()
+        TimelineEntry.objects.bulk_create(entries, batch_size=settings.FEED_FANOUT_BATCH_SIZE)
+    return len(entries)
+
+def trim_timelines():
+    """Deletes entries beyond the newest FEED_TIMELINE_LENGTH of every timeline."""
+    overflow = (
+        TimelineEntry.objects
+        .annotate(position=Window(
+            RowNumber(),
+            partition_by=[F('owner_id')],
+            order_by=[F('created_at').desc(), F('post_id').desc()],
+        ))
+        .filter(position__gt=settings.FEED_TIMELINE_LENGTH)
+        .values_list('pk', flat=True)
+    )
+    deleted, _ = TimelineEntry.objects.filter(pk__in=list(overflow)).delete()
+    return deleted
+
+
+# --- Reads ---
+def home_timeline(user, position=None, limit=20):
+    """
+    One page of a user's home timeline, newest first: the precomputed entries merged
+    with recent posts from high-follower authors (and the user's own posts), which are
+    read on demand. `position` is the (created_at, post id) of the last post already seen.
+    Returns (posts, has_more).
+    """
+    authors = followed_author_ids(user.pk)
+    sizes = audience_sizes(authors)
+    pulled_authors = {author_id for author_id in authors if not fans_out_on_write(sizes.get(author_id, 0))}
+    pulled_authors.add(user.pk)
+
+    entries = TimelineEntry.objects.filter(owner=user).select_related('post__owner').order_by(*TIMELINE_ORDERING)
+    pulled = Post.objects.filter(owner_id__in=pulled_authors).select_related('owner').order_by(*POST_ORDERING)
+    if position:
+        entries = entries.filter(keyset_filter(TIMELINE_ORDERING, position))
+        pulled = pulled.filter(keyset_filter(POST_ORDERING, position))
+
+    posts = {entry.post.pk: entry.post for entry in entries[:limit + 1]}
+    posts.update((post.pk, post) for post in pulled[:limit + 1])
+    merged = sorted(posts.values(), key=lambda post: (post.created_at, post.pk), reverse=True)
+    return merged[:limit], len(merged) > limit
@@ -0,0 +1,27 @@
+# my_entrepreneur_platform/feed/views.py
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from content.models import Post
+from content.serializers import PostSerializer
+from my_entrepreneur_platform.pagination import KeysetCursorPagination, decode_cursor, encode_cursor, position_of
+from .timelines import POST_ORDERING, home_timeline
+
+# View for the authenticated user's home timeline (followed users and startups)
+class HomeTimelineAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+
+    def get(self, request, *args, **kwargs):
+        paginator = self.pagination_class()
+        paginator.request = request
+        cursor = request.query_params.get(paginator.cursor_query_param)
+        position = decode_cursor(cursor, Post, POST_ORDERING) if cursor else None
+
+        posts, has_more = home_timeline(request.user, position, limit=paginator.get_page_size(request))
+        paginator.next_cursor = encode_cursor(position_of(posts[-1], POST_ORDERING)) if has_more else None
+
+        serializer = PostSerializer(posts, many=True, context={'request': request})
+        return Response(paginator.get_paginated_response(serializer.data).data, status=status.HTTP_200_OK)
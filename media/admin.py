@@ -0,0 +1,7 @@
+# my_entrepreneur_platform/media/admin.py
+
+from django.contrib import admin
+from .models import UploadSession
+
+# Register your models here
+admin.site.register(UploadSession)
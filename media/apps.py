@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class MediaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'media'
+
+    def ready(self):
+        from . import signals # noqa: F401 (connects the variant generation receivers)
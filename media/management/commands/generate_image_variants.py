@@ -0,0 +1,36 @@
+# my_entrepreneur_platform/media/management/commands/generate_image_variants.py
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from media.tasks import generate_image_variants
+from media.variants import VARIANT_FIELDS, variants_field_name
+
+
+class Command(BaseCommand):
+    help = "Builds missing or outdated image variants for existing uploads (e.g. after changing MEDIA_IMAGE_VARIANTS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true', help="Render in this process instead of queueing Celery tasks.")
+        parser.add_argument('--force', action='store_true', help="Rebuild variants even when they are up to date.")
+
+    def handle(self, *args, **options):
+        for model_label, field_names in VARIANT_FIELDS.items():
+            model = apps.get_model(model_label)
+            for field_name in field_names:
+                variants_field = variants_field_name(field_name)
+                rows = (
+                    model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+                    .values_list('pk', field_name, variants_field)
+                )
+                queued = 0
+                for pk, name, variants in rows.iterator(chunk_size=1000):
+                    if not options['force'] and (variants or {}).get('source') == name:
+                        continue
+                    task_args = (model_label, pk, field_name, options['force'])
+                    if options['sync']:
+                        generate_image_variants.apply(args=task_args)
+                    else:
+                        generate_image_variants.delay(*task_args)
+                    queued += 1
+                self.stdout.write(f"{model_label}.{field_name}: {queued} images {'processed' if options['sync'] else 'queued'}.")
@@ -0,0 +1,43 @@
+# my_entrepreneur_platform/media/models.py
+
+import os
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+class UploadSession(models.Model):
+    """
+    A resumable, chunked upload of a large file (a Post video). Chunks are written
+    to a temp file under MEDIA_UPLOAD_TEMP_DIR; `offset` counts the bytes received
+    so far, which is where the client resumes after a dropped connection.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='upload_sessions',
+        help_text="The user uploading the file."
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Total file size in bytes, declared up front.")
+    sha256 = models.CharField(max_length=64, help_text="Hex SHA-256 of the whole file, checked on completion.")
+    offset = models.PositiveBigIntegerField(default=0, help_text="Bytes received so far.")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True) # Stale sessions are garbage-collected by age
+
+    def __str__(self):
+        return f"Upload {self.pk} of {self.filename} ({self.offset}/{self.size} bytes)"
+
+    @property
+    def temp_path(self):
+        return os.path.join(settings.MEDIA_UPLOAD_TEMP_DIR, f'{self.pk}.part')
+
+    def discard(self):
+        """Deletes the session and its partial file."""
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+        self.delete()
@@ -0,0 +1,54 @@
+# my_entrepreneur_platform/media/serializers.py
+
+import os
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from .models import UploadSession
+
+
+# Read-only {variant: URL} view of an image field's `<field>_variants` map
+class VariantsField(serializers.ReadOnlyField):
+    def to_representation(self, value):
+        request = self.context.get('request')
+        urls = {}
+        for variant, name in (value or {}).get('files', {}).items():
+            url = default_storage.url(name)
+            urls[variant] = request.build_absolute_uri(url) if request else url
+        return urls
+
+
+# Serializer for starting/inspecting a chunked upload session
+class UploadSessionSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField() # Largest chunk the server accepts
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'sha256', 'offset', 'chunk_size', 'created_at', 'updated_at']
+        read_only_fields = ['offset', 'created_at', 'updated_at']
+
+    def get_chunk_size(self, obj):
+        return settings.MEDIA_UPLOAD_CHUNK_SIZE
+
+    def validate_size(self, value):
+        if value > settings.MEDIA_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Uploads are limited to {settings.MEDIA_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        if not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError("Must be a hex-encoded SHA-256 digest.")
+        return value.lower()
+
+    def validate_filename(self, value):
+        name = os.path.basename(value) # Never let the client choose a directory
+        if not name:
+            raise serializers.ValidationError("Must be a file name.")
+        if os.path.splitext(name)[1].lower() not in settings.MEDIA_UPLOAD_VIDEO_EXTENSIONS:
+            raise serializers.ValidationError(
+                f"Only video files can be uploaded ({', '.join(settings.MEDIA_UPLOAD_VIDEO_EXTENSIONS)})."
+            )
+        return name
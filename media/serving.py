@@ -0,0 +1,144 @@
+# my_entrepreneur_platform/media/serving.py
+
+import os
+import re
+import uuid
+
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_SPEC_RE = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
+# More ranges than this in one request is treated as no Range header at all
+# (full 200 response), rather than letting clients ask for thousands of tiny parts
+MAX_RANGES = 16
+# Only these are served inline, by extension. Anything else is an opaque
+# download, so an uploaded HTML or SVG file never runs script on our origin
+INLINE_CONTENT_TYPES = {
+    '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg', '.png': 'image/png', '.gif': 'image/gif', '.webp': 'image/webp',
+    '.mp4': 'video/mp4', '.m4v': 'video/mp4', '.mov': 'video/quicktime', '.webm': 'video/webm',
+}
+
+
+def content_headers(path):
+    """(Content-Type, Content-Disposition) to serve the file at `path` with."""
+    content_type = INLINE_CONTENT_TYPES.get(os.path.splitext(path)[1].lower())
+    if content_type:
+        return content_type, 'inline'
+    return 'application/octet-stream', content_disposition_header(True, os.path.basename(path))
+
+
+def parse_range(header, size):
+    """
+    Parses a `Range: bytes=...` header against a file of `size` bytes into sorted,
+    merged, inclusive [(start, end)] pairs clipped to the file.
+    Returns None when the header is absent, malformed or not in bytes (serve the
+    whole file), and [] when no range is satisfiable (416).
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not specs:
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        match = RANGE_SPEC_RE.match(spec)
+        if not match or match.groups() == ('', ''):
+            return None
+        first, last = match.groups()
+        if first == '': # Suffix range: the last N bytes
+            start, end = max(0, size - int(last)), size - 1
+            if int(last) == 0:
+                continue
+        else:
+            start = int(first)
+            if last and int(last) < start:
+                return None
+            end = min(int(last), size - 1) if last else size - 1
+        if start < size:
+            ranges.append((start, end))
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def file_validators(stat):
+    """(ETag, Last-Modified) for a file, from its size and modification time."""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"', http_date(stat.st_mtime)
+
+def _etags(header):
+    return {tag.strip().removeprefix('W/') for tag in header.split(',')}
+
+def not_modified(request, etag, mtime):
+    """Whether If-None-Match / If-Modified-Since let us answer 304."""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        tags = _etags(if_none_match)
+        return '*' in tags or etag in tags
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return since is not None and int(mtime) <= since
+
+def range_applies(request, etag, mtime):
+    """If-Range: honour Range only if the client's copy is still current."""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range.strip() == etag # Strong comparison only
+    return parse_http_date_safe(if_range) == int(mtime)
+
+
+class BoundedReader:
+    """A read()-only view of `length` bytes of an open file, starting at `start`."""
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+class MultipartRanges:
+    """
+    Body of a multipart/byteranges response, streamed part by part in
+    `block_size` reads. `content_length` is known up front.
+    """
+    def __init__(self, path, ranges, size, content_type, block_size):
+        self.path = path
+        self.ranges = ranges
+        self.block_size = block_size
+        self.boundary = uuid.uuid4().hex
+        self.headers = [
+            (f'--{self.boundary}\r\nContent-Type: {content_type}\r\n'
+             f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n').encode()
+            for start, end in ranges
+        ]
+        self.closing = f'\r\n--{self.boundary}--\r\n'.encode()
+        self.content_length = (
+            sum(len(header) for header in self.headers)
+            + sum(end - start + 1 for start, end in ranges)
+            + 2 * (len(ranges) - 1) # CRLF between parts
+            + len(self.closing)
+        )
+
+    def __iter__(self):
+        with open(self.path, 'rb') as file:
+            for index, ((start, end), header) in enumerate(zip(self.ranges, self.headers)):
+                yield (b'\r\n' if index else b'') + header
+                part = BoundedReader(file, start, end - start + 1)
+                for block in iter(lambda: part.read(self.block_size), b''):
+                    yield block
+        yield self.closing
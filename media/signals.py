@@ -0,0 +1,34 @@
+# my_entrepreneur_platform/media/signals.py
+
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from .tasks import generate_image_variants
+from .variants import VARIANT_FIELDS, needs_variants, variants_field_name
+
+logger = logging.getLogger(__name__)
+
+
+def schedule_variants(sender, instance, update_fields=None, **kwargs):
+    """Queues variant generation for every image field whose file changed in this save."""
+    for field_name in VARIANT_FIELDS[sender._meta.label]:
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        if not needs_variants(getattr(instance, field_name), getattr(instance, variants_field_name(field_name))):
+            continue
+        transaction.on_commit(
+            lambda field_name=field_name: _enqueue(sender._meta.label, instance.pk, field_name)
+        )
+
+def _enqueue(model_label, pk, field_name):
+    try:
+        generate_image_variants.delay(model_label, pk, field_name)
+    except Exception:
+        # The upload itself succeeded; clients fall back to the original until a backfill runs
+        logger.exception(f"Could not enqueue image variants for {model_label} {pk} {field_name}.")
+
+for model_label in VARIANT_FIELDS:
+    post_save.connect(schedule_variants, sender=apps.get_model(model_label), dispatch_uid=f'media-variants-{model_label}')
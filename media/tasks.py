@@ -0,0 +1,41 @@
+# my_entrepreneur_platform/media/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from django.apps import apps
+
+from .uploads import purge_stale_sessions
+from .variants import delete_variants, needs_variants, render_variants, variants_field_name
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def generate_image_variants(self, model_label, pk, field_name, force=False):
+    """
+    (Re)builds the resized variants of one image field after an upload, and
+    removes the variants of the file it replaced.
+    """
+    instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+    if instance is None:
+        return None # Deleted before the task ran
+    file = getattr(instance, field_name)
+    variants_field = variants_field_name(field_name)
+    previous = getattr(instance, variants_field)
+    if not force and not needs_variants(file, previous):
+        return previous # Already built, e.g. by a duplicate task
+
+    variants = render_variants(file) if file else {}
+    setattr(instance, variants_field, variants)
+    # Only the variants column is written, so concurrent edits to the row are kept
+    instance.save(update_fields=[variants_field])
+    delete_variants(file.storage, previous)
+    logger.info(f"Task {self.request.id} completed: {len(variants.get('files', {}))} variants for {model_label} {pk} {field_name}")
+    return variants
+
+@shared_task(bind=True)
+def purge_stale_uploads(self):
+    """Garbage-collects abandoned chunked upload sessions and their temp files."""
+    removed = purge_stale_sessions()
+    logger.info(f"Task {self.request.id} completed: removed {removed} stale upload sessions")
+    return removed
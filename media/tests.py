@@ -0,0 +1,367 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from content.models import Post
+from search.queries import search_users
+from search.serializers import UserSearchSerializer
+from .models import UploadSession
+from .serving import MAX_RANGES, MultipartRanges, file_validators, parse_range
+from .tasks import generate_image_variants
+from .uploads import OffsetMismatch, append_chunk, purge_stale_sessions, start_session
+
+User = get_user_model()
+
+# Smallest plausible MP4: an ftyp box, then filler
+MP4_BYTES = b'\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2' + bytes(range(256)) * 4
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_no_header_serves_the_whole_file(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('', 100))
+
+    def test_single_ranges(self):
+        self.assertEqual(parse_range('bytes=0-9', 100), [(0, 9)])
+        self.assertEqual(parse_range('bytes=90-', 100), [(90, 99)])
+        self.assertEqual(parse_range('bytes=-10', 100), [(90, 99)])
+        self.assertEqual(parse_range('bytes = 5 - 7', 100), [(5, 7)])
+
+    def test_ranges_are_clipped_to_the_file(self):
+        self.assertEqual(parse_range('bytes=50-500', 100), [(50, 99)])
+        self.assertEqual(parse_range('bytes=-500', 100), [(0, 99)])
+
+    def test_overlapping_and_adjacent_ranges_are_merged(self):
+        self.assertEqual(parse_range('bytes=20-29,0-9,10-14,25-40', 100), [(0, 14), (20, 40)])
+
+    def test_unsatisfiable(self):
+        self.assertEqual(parse_range('bytes=100-', 100), [])
+        self.assertEqual(parse_range('bytes=-0', 100), [])
+        self.assertEqual(parse_range('bytes=0-', 0), [])
+
+    def test_malformed_headers_are_ignored(self):
+        for header in ('bytes=', 'bytes=-', 'bytes=a-b', 'bytes=9-5', 'items=0-9', 'bytes=0-9,,', 'bytes=²-'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, 100))
+
+    def test_too_many_ranges(self):
+        header = 'bytes=' + ','.join(f'{start}-{start}' for start in range(0, 2 * (MAX_RANGES + 1), 2))
+        self.assertIsNone(parse_range(header, 100))
+        header = 'bytes=' + ','.join(f'{start}-{start}' for start in range(0, 2 * MAX_RANGES, 2))
+        self.assertEqual(len(parse_range(header, 100)), MAX_RANGES)
+
+
+class MultipartRangesTests(SimpleTestCase):
+    def test_content_length_matches_the_body(self):
+        with tempfile.NamedTemporaryFile() as file:
+            file.write(bytes(range(256)) * 4)
+            file.flush()
+            for ranges in ([(0, 0), (1023, 1023)], [(0, 99), (200, 299), (900, 1023)]):
+                with self.subTest(ranges=ranges):
+                    body = MultipartRanges(file.name, ranges, 1024, 'video/mp4', block_size=7)
+                    self.assertEqual(len(b''.join(body)), body.content_length)
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        local_disk = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SENDFILE_HEADER=None)
+        local_disk.enable()
+        self.addCleanup(local_disk.disable)
+        self.data = bytes(range(256)) * 4
+        for name in ('clip.mp4', 'evil.html', 'evil.svg'):
+            with open(os.path.join(self.media_root, name), 'wb') as file:
+                file.write(self.data)
+        self.client = Client()
+
+    def get(self, name, **headers):
+        response = self.client.get(f'/media/{name}', headers=headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_whole_file(self):
+        response, body = self.get('clip.mp4')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertEqual(response['Content-Disposition'], 'inline')
+        self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_other_types_download_as_attachments(self):
+        for name in ('evil.html', 'evil.svg'):
+            with self.subTest(name=name):
+                response, body = self.get(name)
+                self.assertEqual(response['Content-Type'], 'application/octet-stream')
+                self.assertEqual(response['Content-Disposition'], f'attachment; filename="{name}"')
+                self.assertEqual(response['X-Content-Type-Options'], 'nosniff')
+
+    def test_single_range(self):
+        response, body = self.get('clip.mp4', Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, self.data[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(self.data)}')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+
+    def test_unsatisfiable_range(self):
+        response, body = self.get('clip.mp4', Range=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_multiple_ranges(self):
+        response, body = self.get('clip.mp4', Range='bytes=0-9,-10')
+        self.assertEqual(response.status_code, 206)
+        boundary = response['Content-Type'].split('boundary=')[1]
+        self.assertEqual(int(response['Content-Length']), len(body))
+        parts = body.split(f'--{boundary}'.encode())
+        self.assertEqual(parts[-1], b'--\r\n')
+        self.assertEqual(len(parts), 4) # Preamble, two parts, closing
+        self.assertIn(b'Content-Range: bytes 0-9/1024\r\n\r\n' + self.data[:10] + b'\r\n', parts[1])
+        self.assertIn(b'Content-Range: bytes 1014-1023/1024\r\n\r\n' + self.data[-10:] + b'\r\n', parts[2])
+
+    def test_conditional_requests(self):
+        etag, last_modified = file_validators(os.stat(os.path.join(self.media_root, 'clip.mp4')))
+        response, body = self.get('clip.mp4', If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, b'')
+        response, body = self.get('clip.mp4', If_None_Match='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        # A stale If-Range gets the whole file instead of the range
+        response, body = self.get('clip.mp4', Range='bytes=0-9', If_Range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.data)
+        response, body = self.get('clip.mp4', Range='bytes=0-9', If_Range=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_missing_files_and_escapes(self):
+        self.assertEqual(self.get('missing.mp4')[0].status_code, 404)
+        self.assertEqual(self.get('../etc/passwd')[0].status_code, 404)
+
+
+class UploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        local_disk = override_settings(MEDIA_ROOT=self.media_root, MEDIA_UPLOAD_TEMP_DIR=self.temp_dir, MEDIA_UPLOAD_CHUNK_SIZE=512)
+        local_disk.enable()
+        self.addCleanup(local_disk.disable)
+
+        self.user = User.objects.create_user(username='uploader', password='x')
+        self.post = Post.objects.create(owner=self.user, content='A demo')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def start(self, data, filename='demo.mp4', sha256=None):
+        response = self.client.post('/api/uploads/', {
+            'filename': filename, 'size': len(data), 'sha256': sha256 or hashlib.sha256(data).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def send(self, session_id, offset, chunk):
+        return self.client.generic(
+            'PATCH', f'/api/uploads/{session_id}/', chunk,
+            content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def upload(self, data, **kwargs):
+        session_id = self.start(data, **kwargs)
+        for offset in range(0, len(data), 512):
+            self.assertEqual(self.send(session_id, offset, data[offset:offset + 512]).status_code, 200)
+        return session_id
+
+    def complete(self, session_id, post_id=None):
+        return self.client.post(f'/api/uploads/{session_id}/complete/', {'post_id': self.post.pk if post_id is None else post_id}, format='json')
+
+    def test_upload_is_stored_under_a_server_chosen_name(self):
+        session_id = self.upload(MP4_BYTES, filename='../../My Demo.mp4')
+        response = self.complete(session_id)
+        self.assertEqual(response.status_code, 200)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.video.name, f'post_videos/{session_id.replace("-", "")}.mp4')
+        with self.post.video.open('rb') as video:
+            self.assertEqual(video.read(), MP4_BYTES)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_only_video_extensions_are_accepted(self):
+        for filename in ('evil.html', 'evil.svg', 'evil.mp4.html', 'evil'):
+            with self.subTest(filename=filename):
+                response = self.client.post('/api/uploads/', {
+                    'filename': filename, 'size': 10, 'sha256': '0' * 64,
+                }, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('filename', response.data)
+
+    def test_content_that_is_not_a_video_is_discarded(self):
+        html = b'<html><script>alert(document.cookie)</script></html>'
+        response = self.complete(self.upload(html, filename='evil.mp4'))
+        self.assertEqual(response.status_code, 400)
+        self.post.refresh_from_db()
+        self.assertFalse(self.post.video)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_chunk_at_the_wrong_offset_is_a_conflict(self):
+        session_id = self.start(MP4_BYTES)
+        self.assertEqual(self.send(session_id, 0, MP4_BYTES[:512]).status_code, 200)
+        for offset in (0, 1024):
+            with self.subTest(offset=offset):
+                response = self.send(session_id, offset, MP4_BYTES[offset:offset + 512])
+                self.assertEqual(response.status_code, 409)
+                self.assertEqual(response.data['offset'], 512)
+
+    def test_resume_after_a_dropped_connection(self):
+        session = start_session(self.user, 'demo.mp4', len(MP4_BYTES), hashlib.sha256(MP4_BYTES).hexdigest())
+        append_chunk(session, 0, io.BytesIO(MP4_BYTES[:300]), 512) # The connection drops after 300 bytes
+        response = self.client.get(f'/api/uploads/{session.pk}/')
+        self.assertEqual(response.data['offset'], 300)
+        with self.assertRaises(OffsetMismatch):
+            append_chunk(session, 512, io.BytesIO(MP4_BYTES[512:1024]), 512)
+
+        for offset in range(300, len(MP4_BYTES), 512):
+            self.assertEqual(self.send(session.pk, offset, MP4_BYTES[offset:offset + 512]).status_code, 200)
+        self.assertEqual(self.complete(session.pk).status_code, 200)
+        self.post.refresh_from_db()
+        with self.post.video.open('rb') as video:
+            self.assertEqual(video.read(), MP4_BYTES)
+
+    def test_checksum_mismatch_discards_the_upload(self):
+        session_id = self.upload(MP4_BYTES, sha256='0' * 64)
+        response = self.complete(session_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_incomplete_upload(self):
+        session_id = self.start(MP4_BYTES)
+        self.send(session_id, 0, MP4_BYTES[:512])
+        response = self.complete(session_id)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['offset'], 512)
+
+    def test_invalid_post_ids_are_rejected(self):
+        session_id = self.upload(MP4_BYTES)
+        for post_id in ('²', 'x', '0', str(2 ** 64), ''):
+            with self.subTest(post_id=post_id):
+                response = self.complete(session_id, post_id)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('post_id', response.data)
+        other = Post.objects.create(owner=User.objects.create_user(username='other', password='x'), content='Theirs')
+        self.assertEqual(self.complete(session_id, other.pk).status_code, 404)
+
+    def test_purge_stale_sessions(self):
+        stale = start_session(self.user, 'old.mp4', 10, '0' * 64)
+        fresh = start_session(self.user, 'new.mp4', 10, '0' * 64)
+        UploadSession.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        orphan = os.path.join(self.temp_dir, 'orphan.part')
+        recent_orphan = os.path.join(self.temp_dir, 'recent.part')
+        for path in (orphan, recent_orphan):
+            open(path, 'wb').close()
+        two_days_ago = (timezone.now() - timedelta(days=2)).timestamp()
+        os.utime(orphan, (two_days_ago, two_days_ago))
+
+        self.assertEqual(purge_stale_sessions(), 1)
+        self.assertEqual(list(UploadSession.objects.values_list('pk', flat=True)), [fresh.pk])
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), sorted([f'{fresh.pk}.part', 'recent.part']))
+
+
+def png_upload(name, size, color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_VARIANT_FORMAT='WEBP', MEDIA_IMAGE_VARIANTS={'thumb': 160, 'small': 480, 'large': 1280})
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        local_disk = override_settings(MEDIA_ROOT=self.media_root)
+        local_disk.enable()
+        self.addCleanup(local_disk.disable)
+        scheduled = mock.patch('media.signals.generate_image_variants') # No broker: tasks are run with apply()
+        self.scheduled = scheduled.start()
+        self.addCleanup(scheduled.stop)
+
+        self.user = User.objects.create_user(username='photographer', password='x')
+        self.post = Post.objects.create(owner=self.user, content='A photo')
+
+    def upload(self, instance, field_name, file):
+        self.scheduled.delay.reset_mock()
+        setattr(instance, field_name, file)
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save()
+        self.scheduled.delay.assert_called_once_with(instance._meta.label, instance.pk, field_name)
+        generate_image_variants.apply(args=(instance._meta.label, instance.pk, field_name))
+        instance.refresh_from_db()
+        return getattr(instance, f'{field_name}_variants')
+
+    def test_variants_are_generated_at_each_size(self):
+        variants = self.upload(self.post, 'image', png_upload('wide.png', (2000, 1000)))
+        self.assertEqual(variants['source'], self.post.image.name)
+        sizes = {}
+        for variant, name in variants['files'].items():
+            self.assertTrue(name.endswith(f'__{variant}.webp'))
+            with default_storage.open(name) as file, Image.open(file) as image:
+                self.assertEqual(image.format, 'WEBP')
+                sizes[variant] = image.size
+        self.assertEqual(sizes, {'thumb': (160, 80), 'small': (480, 240), 'large': (1280, 640)})
+
+    def test_small_images_are_not_upscaled(self):
+        variants = self.upload(self.post, 'image', png_upload('icon.png', (100, 50)))
+        with default_storage.open(variants['files']['large']) as file, Image.open(file) as image:
+            self.assertEqual(image.size, (100, 50))
+
+    def test_replacing_an_image_removes_the_old_variants(self):
+        old = self.upload(self.post, 'image', png_upload('first.png', (600, 600)))
+        new = self.upload(self.post, 'image', png_upload('second.png', (600, 600), color='blue'))
+        self.assertEqual(new['source'], self.post.image.name)
+        for name in old['files'].values():
+            self.assertFalse(default_storage.exists(name))
+        for name in new['files'].values():
+            self.assertTrue(default_storage.exists(name))
+
+        # A duplicate task finds the variants current and renders nothing
+        with mock.patch('media.tasks.render_variants') as render:
+            self.assertEqual(generate_image_variants.apply(args=('content.Post', self.post.pk, 'image')).get(), new)
+        render.assert_not_called()
+
+    def test_clearing_an_image_removes_its_variants(self):
+        old = self.upload(self.post, 'image', png_upload('first.png', (300, 300)))
+        self.assertEqual(self.upload(self.post, 'image', None), {})
+        for name in old['files'].values():
+            self.assertFalse(default_storage.exists(name))
+
+    def test_serializers_expose_the_variant_urls(self):
+        variants = self.upload(self.post, 'image', png_upload('wide.png', (2000, 1000)))
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f'/api/posts/{self.post.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['variants'], {
+            variant: f'http://testserver/media/{name}' for variant, name in variants['files'].items()
+        })
+
+        profile = self.user.userprofile
+        variants = self.upload(profile, 'profile_picture', png_upload('me.png', (300, 300)))
+        results = UserSearchSerializer(search_users('photographer'), many=True).data # No request: relative URLs
+        self.assertEqual(results[0]['profile']['variants'], {
+            variant: f'/media/{name}' for variant, name in variants['files'].items()
+        })
@@ -0,0 +1,124 @@
+# my_entrepreneur_platform/media/uploads.py
+
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .models import UploadSession
+
+# Bytes copied per read/write, so memory per request is bounded by this
+# (and by MEDIA_UPLOAD_CHUNK_SIZE), never by the file size
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class OffsetMismatch(Exception):
+    """The client sent a chunk for a different position than the server has reached."""
+    def __init__(self, expected):
+        super().__init__(f"Expected a chunk at offset {expected}.")
+        self.expected = expected
+
+
+def start_session(owner, filename, size, sha256):
+    os.makedirs(settings.MEDIA_UPLOAD_TEMP_DIR, exist_ok=True)
+    session = UploadSession.objects.create(owner=owner, filename=filename, size=size, sha256=sha256.lower())
+    open(session.temp_path, 'wb').close()
+    return session
+
+def append_chunk(session, offset, stream, length):
+    """
+    Writes `length` bytes from `stream` at `offset` and advances the session.
+    A short read (dropped connection) keeps whatever arrived, so the client can
+    resume from the returned session's offset.
+    """
+    if offset != session.offset:
+        raise OffsetMismatch(session.offset)
+    written = 0
+    with open(session.temp_path, 'r+b') as part:
+        part.seek(offset)
+        while written < length:
+            block = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not block:
+                break
+            part.write(block)
+            written += len(block)
+        part.truncate() # Drop anything a racing writer left past our end
+
+    # Optimistic check: a concurrent request for the same offset loses here
+    advanced = UploadSession.objects.filter(pk=session.pk, offset=offset).update(
+        offset=offset + written, updated_at=timezone.now()
+    )
+    if not advanced:
+        session.refresh_from_db()
+        raise OffsetMismatch(session.offset)
+    session.offset = offset + written
+    return session
+
+class NotAVideo(Exception):
+    """The finished upload is not a video container we accept, whatever its name says."""
+
+
+def sniff_video(path):
+    """
+    The extension for the video container at `path` ('.mp4', '.mov' or '.webm'),
+    read from its leading bytes, or None if it isn't one of them.
+    """
+    with open(path, 'rb') as part:
+        head = part.read(64)
+    if head[4:8] == b'ftyp': # ISO base media file: MP4, or QuickTime by its brand
+        return '.mov' if head[8:12] == b'qt  ' else '.mp4'
+    if head[:4] == b'\x1a\x45\xdf\xa3' and b'webm' in head: # EBML header with the WebM doctype
+        return '.webm'
+    return None
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(COPY_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def attach_video(session, post):
+    """
+    Moves a finished upload into `post.video` (replacing any previous video) and
+    ends the session. Returns False, and discards the upload, if the checksum
+    doesn't match; raises NotAVideo, also discarding it, if the bytes aren't a
+    video container. The stored name is the session id with the sniffed
+    extension: the client's filename never reaches storage.
+    """
+    if file_sha256(session.temp_path) != session.sha256:
+        session.discard()
+        return False
+    extension = sniff_video(session.temp_path)
+    if extension is None:
+        session.discard()
+        raise NotAVideo("The upload is not an MP4, QuickTime or WebM video.")
+    previous = post.video.name
+    with open(session.temp_path, 'rb') as part:
+        post.video.save(f'{session.pk.hex}{extension}', File(part), save=False) # Storage copies in chunks
+    post.save(update_fields=['video', 'updated_at'])
+    if previous and previous != post.video.name:
+        post.video.storage.delete(previous)
+    session.discard()
+    return True
+
+def purge_stale_sessions():
+    """
+    Deletes sessions idle for longer than MEDIA_UPLOAD_SESSION_TTL, and temp
+    files that no longer belong to any session. Returns the number of sessions removed.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.MEDIA_UPLOAD_SESSION_TTL)
+    stale = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+    for session in stale:
+        session.discard()
+
+    if os.path.isdir(settings.MEDIA_UPLOAD_TEMP_DIR):
+        live = {f'{pk}.part' for pk in UploadSession.objects.values_list('pk', flat=True)}
+        for name in os.listdir(settings.MEDIA_UPLOAD_TEMP_DIR):
+            path = os.path.join(settings.MEDIA_UPLOAD_TEMP_DIR, name)
+            if name not in live and os.path.getmtime(path) < cutoff.timestamp():
+                os.remove(path)
+    return len(stale)
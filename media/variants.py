@@ -0,0 +1,64 @@
+# my_entrepreneur_platform/media/variants.py
+
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Image fields that get resized variants, by model label. Each field has a
+# JSONField companion named `<field>_variants` holding
+# {'source': <original file name>, 'files': {<variant>: <variant file name>}}.
+VARIANT_FIELDS = {
+    'content.Post': ('image',),
+    'users.UserProfile': ('profile_picture',),
+    'startups.Startup': ('logo',),
+    'projects.Project': ('project_logo',),
+}
+
+FORMAT_EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg', 'PNG': 'png'}
+
+
+def variants_field_name(field_name):
+    return f'{field_name}_variants'
+
+def variant_name(source_name, variant):
+    root, _extension = os.path.splitext(source_name)
+    return f'{root}__{variant}.{FORMAT_EXTENSIONS[settings.MEDIA_VARIANT_FORMAT]}'
+
+def needs_variants(file, variants):
+    """Whether the stored variants were built from a different file than the field now holds."""
+    return (file.name or None) != (variants or {}).get('source')
+
+def render_variants(file):
+    """
+    Writes every MEDIA_IMAGE_VARIANTS size of an image next to the original and
+    returns the variants map for it.
+
+    Memory stays bounded for large uploads: the file is streamed from storage
+    rather than read into memory, JPEGs are decoded straight at the nearest
+    1/2-1/8 scale of the largest variant (draft mode), and each smaller variant
+    is resized from the previous one instead of the original.
+    """
+    sizes = sorted(settings.MEDIA_IMAGE_VARIANTS.items(), key=lambda item: item[1], reverse=True)
+    files = {}
+    with file.storage.open(file.name, 'rb') as source, Image.open(source) as image: # Reads the header only
+        if image.width * image.height > settings.MEDIA_MAX_IMAGE_PIXELS:
+            raise ValueError(f"{file.name} is {image.width}x{image.height}, over MEDIA_MAX_IMAGE_PIXELS.")
+        largest = sizes[0][1]
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image) # Decodes, and applies the camera rotation
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha and settings.MEDIA_VARIANT_FORMAT != 'JPEG' else 'RGB')
+
+        for variant, size in sizes:
+            image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0) # Never upscales
+            buffer = io.BytesIO()
+            image.save(buffer, format=settings.MEDIA_VARIANT_FORMAT, quality=settings.MEDIA_VARIANT_QUALITY)
+            files[variant] = file.storage.save(variant_name(file.name, variant), ContentFile(buffer.getvalue()))
+    return {'source': file.name, 'files': files}
+
+def delete_variants(storage, variants):
+    for name in (variants or {}).get('files', {}).values():
+        storage.delete(name)
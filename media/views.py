@@ -0,0 +1,152 @@
+# my_entrepreneur_platform/media/views.py
+
+import os
+
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from content.models import Post
+from my_entrepreneur_platform.facets import parse_id_filter
+from .models import UploadSession
+from .serializers import UploadSessionSerializer
+from .serving import (
+    BoundedReader, MultipartRanges, content_headers, file_validators, not_modified, parse_range, range_applies
+)
+from .uploads import NotAVideo, OffsetMismatch, append_chunk, attach_video, start_session
+
+
+# --- Chunked, resumable uploads ---
+# 1. POST /api/uploads/ with filename, size and sha256 starts a session.
+# 2. PATCH /api/uploads/<id>/ with a raw chunk as the body and an Upload-Offset
+#    header appends it; after a failure, GET the session to find where to resume.
+# 3. POST /api/uploads/<id>/complete/ with post_id verifies the checksum and
+#    attaches the file to the post's video.
+
+class UploadSessionCreateAPIView(generics.CreateAPIView):
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def perform_create(self, serializer):
+        serializer.instance = start_session(self.request.user, **serializer.validated_data)
+
+class UploadSessionDetailAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_session(self, request, pk):
+        return get_object_or_404(UploadSession, pk=pk, owner=request.user)
+
+    # GET: Current offset, to resume an interrupted upload
+    def get(self, request, pk, *args, **kwargs):
+        return Response(UploadSessionSerializer(self.get_session(request, pk)).data)
+
+    # PATCH: Append one chunk, streamed from the request body
+    def patch(self, request, pk, *args, **kwargs):
+        session = self.get_session(request, pk)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response({"detail": "Upload-Offset and Content-Length headers are required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if length <= 0 or length > settings.MEDIA_UPLOAD_CHUNK_SIZE:
+            return Response({"detail": f"Chunks must be 1 to {settings.MEDIA_UPLOAD_CHUNK_SIZE} bytes."},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if offset + length > session.size:
+            return Response({"detail": "Chunk extends past the declared file size."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            session = append_chunk(session, offset, request.stream, length)
+        except OffsetMismatch as e:
+            return Response({"detail": str(e), "offset": e.expected}, status=status.HTTP_409_CONFLICT)
+        return Response(UploadSessionSerializer(session).data)
+
+    # DELETE: Abandon the upload
+    def delete(self, request, pk, *args, **kwargs):
+        self.get_session(request, pk).discard()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class UploadSessionCompleteAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk, *args, **kwargs):
+        session = get_object_or_404(UploadSession, pk=pk, owner=request.user)
+        post_id = parse_id_filter(request.data.get('post_id'), 'post_id', "Must be the id of one of your posts.")
+        post = get_object_or_404(Post, pk=post_id, owner=request.user)
+
+        if session.offset != session.size:
+            return Response({"detail": "Upload is incomplete.", "offset": session.offset},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            attached = attach_video(session, post)
+        except NotAVideo as e:
+            return Response({"detail": f"{e} The upload was discarded."}, status=status.HTTP_400_BAD_REQUEST)
+        if not attached:
+            return Response({"detail": "Checksum mismatch; the upload was discarded."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response({"post_id": post.pk, "video": post.video.url}, status=status.HTTP_200_OK)
+
+
+# --- Media serving ---
+@require_safe
+def serve_media(request, path):
+    """
+    Serves an uploaded file with Range/If-Range, ETag and Last-Modified support, so
+    video players can seek without re-downloading. Bodies stream in
+    MEDIA_STREAM_BLOCK_SIZE reads (constant memory per request), or are handed to
+    the web server via MEDIA_SENDFILE_HEADER when that is configured. Only image
+    and video types are served inline; anything else downloads as an attachment.
+    """
+    try:
+        full_path = default_storage.path(path)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, NotImplementedError, OSError):
+        raise Http404("File not found.")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found.")
+
+    etag, last_modified = file_validators(stat)
+    content_type, disposition = content_headers(full_path)
+    if not_modified(request, etag, stat.st_mtime):
+        response = HttpResponseNotModified()
+    elif settings.MEDIA_SENDFILE_HEADER:
+        # The web server reads the file and handles Range itself
+        response = HttpResponse(content_type=content_type)
+        response[settings.MEDIA_SENDFILE_HEADER] = f"{settings.MEDIA_SENDFILE_ROOT.rstrip('/')}/{path}"
+    else:
+        response = _stream_file(request, full_path, stat.st_size, content_type, etag, stat.st_mtime)
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = disposition
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+def _stream_file(request, full_path, size, content_type, etag, mtime):
+    ranges = parse_range(request.headers.get('Range'), size) if range_applies(request, etag, mtime) else None
+    if ranges is None:
+        response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    elif not ranges:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    elif len(ranges) == 1:
+        start, end = ranges[0]
+        response = FileResponse(BoundedReader(open(full_path, 'rb'), start, end - start + 1),
+                                status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        body = MultipartRanges(full_path, ranges, size, content_type, settings.MEDIA_STREAM_BLOCK_SIZE)
+        response = StreamingHttpResponse(body, status=206, content_type=f'multipart/byteranges; boundary={body.boundary}')
+        response['Content-Length'] = body.content_length
+        return response
+    response.block_size = settings.MEDIA_STREAM_BLOCK_SIZE # Read lazily, per block, while streaming
+    return response
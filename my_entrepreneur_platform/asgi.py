@@ -12,6 +12,12 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_entrepreneur_platform.settin
 
 django_asgi_app = get_asgi_application()
 
+from django.conf import settings
+from search.index import warm_search_index
+
+if settings.SEARCH_INDEX_WARM_ON_STARTUP:
+    warm_search_index()
+
 # Import the WebSocket routing maps from your apps
 import chat.routing
 import notifications.routing
@@ -0,0 +1,51 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/counters.py
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Denormalized counters (likes/comments/replies in content.counters, followers
+# and following in social.graph) are adjusted with F() expressions in the same
+# transaction as the write, and repaired in batches by a periodic reconcile job.
+
+
+def adjust(queryset, field, delta):
+    """Adds `delta` to `field` on every row of `queryset`, atomically in the database."""
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta}) # Never underflow; reconciliation repairs drift
+    queryset.update(**{field: F(field) + delta})
+
+
+def count_subquery(queryset, group_field, outer_field='pk'):
+    """The number of `queryset` rows whose `group_field` matches the outer row's `outer_field`, 0 if none."""
+    counts = queryset.filter(**{group_field: OuterRef(outer_field)}).order_by().values(group_field).annotate(total=Count('pk'))
+    return Coalesce(Subquery(counts.values('total')), Value(0))
+
+def reconcile(model, counters, batch_size, on_repaired=None):
+    """
+    Recomputes `counters` ({field: count expression}) for every row of `model`
+    in primary-key batches and writes back only the rows that drifted, passing
+    each batch of them to `on_repaired` if given. Returns the number of rows repaired.
+    """
+    repaired = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            model.objects.filter(pk__gt=last_pk).order_by('pk')
+            .annotate(**{f'actual_{field}': expression for field, expression in counters.items()})
+            .only('pk', *counters)[:batch_size]
+        )
+        if not rows:
+            return repaired
+        last_pk = rows[-1].pk
+        drifted = [
+            row for row in rows
+            if any(getattr(row, field) != getattr(row, f'actual_{field}') for field in counters)
+        ]
+        for row in drifted:
+            for field in counters:
+                setattr(row, field, getattr(row, f'actual_{field}'))
+        if drifted:
+            model.objects.bulk_update(drifted, list(counters))
+            repaired += len(drifted)
+            if on_repaired is not None:
+                on_repaired(drifted)
@@ -0,0 +1,76 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/facets.py
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from rest_framework import serializers
+
+# Facet counts are cached per (catalogue, filter set). Every write to a catalogue
+# bumps its generation; keys embed the generation, so a bump invalidates every
+# cached filter combination at once without enumerating them. The bump waits for
+# the write to commit: bumped earlier, a concurrent reader could still count the
+# old rows and cache them under the new generation.
+GENERATION_KEY = 'facets:{catalogue}:generation'
+COUNTS_KEY = 'facets:{catalogue}:{generation}:{filters}'
+
+def bump_generation(catalogue):
+    transaction.on_commit(lambda: cache.set(GENERATION_KEY.format(catalogue=catalogue), time.time_ns(), None))
+
+def generation(catalogue):
+    key = GENERATION_KEY.format(catalogue=catalogue)
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+def cached_counts(catalogue, filters, compute):
+    """Facet counts for `filters` (a dict of the applied filter values), computed by `compute()` on a miss."""
+    digest = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+    key = COUNTS_KEY.format(catalogue=catalogue, generation=generation(catalogue), filters=digest)
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute()
+        cache.set(key, counts, settings.FACET_CACHE_TTL)
+    return counts
+
+
+# Filter values that are primary keys arrive as query strings: anything but a
+# positive id a bigint column can hold is a 400, never a database error
+ID_FILTER = serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1)
+
+def parse_id_filter(value, param, message):
+    try:
+        return ID_FILTER.run_validation(value)
+    except serializers.ValidationError:
+        raise serializers.ValidationError({param: message})
+
+
+def grouped_counts(queryset, facets):
+    """
+    Counts per value for several facets in a single grouped query: rows are
+    grouped by every facet at once, then each facet is summed out of the groups.
+
+    `facets` maps a facet name to (value field, label field or a {value: label}
+    dict). Returns {facet: [{'value', 'label', 'count'}]}, largest count first.
+    Facets must be single-valued per row; many-to-many facets need their own query.
+    """
+    fields = {field for value_field, label in facets.values() for field in (value_field, label) if isinstance(field, str)}
+    totals = {name: {} for name in facets}
+    labels = {name: {} for name in facets}
+    for group in queryset.order_by().values(*fields).annotate(facet_count=Count('pk', distinct=True)):
+        for name, (value_field, label) in facets.items():
+            value = group[value_field]
+            if value is None:
+                continue
+            totals[name][value] = totals[name].get(value, 0) + group['facet_count']
+            labels[name][value] = label.get(value, value) if isinstance(label, dict) else group[label]
+    return {
+        name: sorted(
+            ({'value': value, 'label': labels[name][value], 'count': count} for value, count in counts.items()),
+            key=lambda item: (-item['count'], str(item['label'])),
+        )
+        for name, counts in totals.items()
+    }
@@ -0,0 +1,112 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/pagination.py
+
+import base64
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+# --- Keyset cursor helpers (shared with views that merge several sources) ---
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+def decode_cursor(cursor, model, ordering):
+    """The position in a cursor, one value per `ordering` field parsed to that field's type on `model`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError):
+        raise NotFound("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != len(ordering) or None in values:
+        raise NotFound("Invalid cursor.")
+    try:
+        return [_ordering_field(model, field).to_python(value) for field, value in zip(ordering, values)]
+    except (ValidationError, TypeError, ValueError):
+        raise NotFound("Invalid cursor.")
+
+def _ordering_field(model, field):
+    *relations, name = field.lstrip('-').split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+def keyset_filter(ordering, values):
+    """
+    Q selecting the rows strictly after `values` in `ordering`, e.g. for
+    ('-created_at', '-id'): created_at < v0 OR (created_at = v0 AND id < v1).
+    Every ordering field must sort in the same direction.
+    """
+    descending = ordering[0].startswith('-')
+    fields = [field.lstrip('-') for field in ordering]
+    lookup = 'lt' if descending else 'gt'
+    clauses = []
+    for i, field in enumerate(fields):
+        equal = {fields[j]: values[j] for j in range(i)}
+        clauses.append(Q(**equal, **{f'{field}__{lookup}': values[i]}))
+    return reduce(lambda left, right: left | right, clauses)
+
+def position_of(obj, ordering):
+    """The cursor values of `obj` for `ordering` (field paths may span relations with '__')."""
+    values = []
+    for field in ordering:
+        value = obj
+        for attribute in field.lstrip('-').split('__'):
+            value = getattr(value, attribute)
+        values.append(value)
+    return values
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination that seeks with a WHERE on the ordering columns instead of
+    an OFFSET, so every page costs the same however deep the client pages.
+    The ordering must end in a unique column (normally 'id') and should be
+    backed by a composite index.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(keyset_filter(self.ordering, decode_cursor(cursor, queryset.model, self.ordering)))
+
+        rows = list(queryset[:size + 1]) # One extra row tells us whether there is a next page
+        page = rows[:size]
+        self.next_cursor = encode_cursor(position_of(page[-1], self.ordering)) if len(rows) > size else None
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
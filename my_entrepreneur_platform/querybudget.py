@@ -0,0 +1,56 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/querybudget.py
+
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(limit, label):
+    """
+    Counts the queries run inside the block (through an execute wrapper, so it
+    works with DEBUG off), leaving out ContentType cache fills. Going over
+    `limit` logs a warning, or raises QueryBudgetExceeded when
+    QUERY_BUDGET_STRICT is on (the tests).
+    """
+    executed = []
+    # ContentType.objects.get_for_model fills a per-process cache on first use; that
+    # one-off lookup says nothing about what a page costs
+    content_type_lookup = f'FROM {connection.ops.quote_name(ContentType._meta.db_table)} WHERE'
+
+    def count(execute, sql, params, many, context):
+        if content_type_lookup not in sql:
+            executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        yield
+    if len(executed) > limit:
+        message = f"{label} ran {len(executed)} queries, over its budget of {limit}."
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class QueryBudgetMixin:
+    """
+    For list views whose queryset declares its prefetch plan: a page must cost at
+    most `query_budget` queries, whatever its size (authentication is not counted).
+    """
+    query_budget = None
+
+    def list(self, request, *args, **kwargs):
+        if self.query_budget is None:
+            return super().list(request, *args, **kwargs)
+        with query_budget(self.query_budget, type(self).__name__):
+            return super().list(request, *args, **kwargs)
@@ -0,0 +1,23 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/refresh.py
+
+from django.db import IntegrityError, transaction
+
+# The incremental jobs (people you may know, project matches, related startups)
+# keep one marker row per changed object: a model whose primary key is a
+# one-to-one to that object. Marks are written once the change commits, so a
+# write pays no extra queries inside its transaction, and a mark for an object
+# deleted in the same transaction (a user delete cascading to their follows and
+# projects) is dropped instead of failing on the foreign key.
+
+def mark_on_commit(model, pk):
+    transaction.on_commit(lambda: _mark(model, pk))
+
+def _mark(model, pk):
+    target = model._meta.pk.related_model
+    if not target.objects.filter(pk=pk).exists():
+        return
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([model(pk=pk)], ignore_conflicts=True) # Already marked is fine
+    except IntegrityError:
+        pass # Deleted between the check and the insert
@@ -0,0 +1,11 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/serializers.py
+
+
+# Shared by serializers whose output depends on who is asking (has_liked, is_following)
+class ViewerMixin:
+
+    @property
+    def viewer(self):
+        """The requesting user (possibly anonymous), or None without a request in the context."""
+        request = self.context.get('request')
+        return getattr(request, 'user', None)
@@ -50,6 +50,8 @@ INSTALLED_APPS = [
     'content', 
     'social',
     'search',
+    'feed',
+    'media',
 
 
     # --- Apps for 2FA (django-two-factor-auth) --- (TEMPORARILY COMMENTED OUT DUE TO COMPATIBILITY ISSUES)
@@ -140,6 +142,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# User uploads (post images, logos, profile pictures and their resized variants)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'uploads'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -158,6 +164,14 @@ CHANNEL_LAYERS = {
     },
 }
 
+# --- Cache (shared by web and Celery processes) ---
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1', # Database 1; Celery uses database 0
+    }
+}
+
 # --- Django REST Framework settings ---
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -202,4 +216,212 @@ CELERY_ACCEPT_CONTENT = ['json'] # Data format for messages
 CELERY_TASK_SERIALIZER = 'json' # Data format for tasks
 CELERY_RESULT_SERIALIZER = 'json' # Data format for results
 CELERY_TIMEZONE = 'UTC' # Use UTC consistently
+# Periodic tasks (run with: celery -A my_entrepreneur_platform beat)
+CELERY_BEAT_SCHEDULE = {
+    # Safety net for the debounced search index flush
+    'process-search-index-queue': {
+        'task': 'search.tasks.process_index_queue',
+        'schedule': 60.0,
+    },
+    # Repair drift in the denormalized like/comment counters
+    'reconcile-content-counters': {
+        'task': 'content.tasks.reconcile_content_counters',
+        'schedule': 3600.0,
+    },
+    # Repair drift in the denormalized follower/following counters
+    'reconcile-follow-counters': {
+        'task': 'social.tasks.reconcile_follow_counters',
+        'schedule': 3600.0,
+    },
+    # "People you may know": recompute users whose edges changed, and everyone nightly
+    'refresh-people-recommendations': {
+        'task': 'social.tasks.refresh_people_recommendations',
+        'schedule': 600.0,
+    },
+    'rebuild-people-recommendations': {
+        'task': 'social.tasks.rebuild_people_recommendations',
+        'schedule': 86400.0,
+    },
+    # Project/people matchmaking: recompute around changed projects, and everything nightly
+    'refresh-project-matches': {
+        'task': 'projects.tasks.refresh_project_matches',
+        'schedule': 600.0,
+    },
+    'rebuild-project-matches': {
+        'task': 'projects.tasks.rebuild_project_matches',
+        'schedule': 86400.0,
+    },
+    # Related startups: re-embed edited startups in batches, and everything nightly
+    'refresh-related-startups': {
+        'task': 'startups.tasks.refresh_related_startups',
+        'schedule': 900.0,
+    },
+    'rebuild-related-startups': {
+        'task': 'startups.tasks.rebuild_related_startups',
+        'schedule': 86400.0,
+    },
+    # Rescore posts whose likes/comments changed
+    'update-trending-posts': {
+        'task': 'content.tasks.update_trending',
+        'schedule': 300.0,
+    },
+    # Remove abandoned chunked upload sessions
+    'purge-stale-uploads': {
+        'task': 'media.tasks.purge_stale_uploads',
+        'schedule': 3600.0,
+    },
+    # Keep precomputed home timelines bounded to FEED_TIMELINE_LENGTH
+    'trim-feed-timelines': {
+        'task': 'feed.tasks.trim_timelines',
+        'schedule': 3600.0,
+    },
+}
 
+
+# --- Search Settings ---
+# Seconds each entity type (users, startups, projects, posts) may spend in the
+# async search view before it returns partial results for that type
+SEARCH_TYPE_TIME_BUDGET = 0.75
+# Minimum trigram (Jaccard) similarity for a fuzzy word match, and the most
+# vocabulary words one query word may expand to
+SEARCH_TRIGRAM_THRESHOLD = 0.25
+SEARCH_TRIGRAM_MAX_TERMS = 50
+# Fuzzy candidates hydrated per entity type when substring matching finds nothing
+SEARCH_FUZZY_LIMIT = 20
+# Index maintenance pipeline (search.indexing): writes only enqueue dirty ids.
+# The flush task runs SEARCH_INDEX_DEBOUNCE seconds after the first write, in
+# batches of SEARCH_INDEX_BATCH_SIZE; each process's in-memory index then pulls
+# the changes at most every SEARCH_INDEX_SYNC_INTERVAL seconds. Queued entries
+# older than SEARCH_INDEX_MAX_STALENESS seconds are reported as over the bound.
+SEARCH_INDEX_DEBOUNCE = 2
+SEARCH_INDEX_BATCH_SIZE = 1000
+SEARCH_INDEX_SYNC_INTERVAL = 5
+SEARCH_INDEX_MAX_STALENESS = 30
+# Build each web process's trigram index in the background at startup
+# (search.index.warm_search_index) instead of on its first search
+SEARCH_INDEX_WARM_ON_STARTUP = True
+
+
+# --- Content Settings ---
+# Rows per batch when the periodic job recomputes likes_count/comments_count
+CONTENT_COUNTER_RECONCILE_BATCH_SIZE = 1000
+# Deepest allowed reply nesting (top-level comments are depth 0)
+COMMENT_MAX_DEPTH = 8
+# Seconds to cache each user's looked-up like flags (has_liked); 0 disables the cache
+CONTENT_LIKED_IDS_CACHE_TTL = 30
+
+# Link previews (content.unfurl): each URL is fetched once by LINK_PREVIEW_FETCHER
+# (a dotted path; swap in a stub for tests) and reused for LINK_PREVIEW_TTL
+# seconds, failures for LINK_PREVIEW_FAILURE_TTL. Fetches time out after
+# LINK_PREVIEW_TIMEOUT seconds and read at most LINK_PREVIEW_MAX_BYTES.
+LINK_PREVIEW_FETCHER = 'content.unfurl.fetch_url'
+LINK_PREVIEW_TTL = 7 * 24 * 3600
+LINK_PREVIEW_FAILURE_TTL = 3600
+LINK_PREVIEW_TIMEOUT = 5
+LINK_PREVIEW_MAX_BYTES = 512 * 1024
+LINK_PREVIEW_USER_AGENT = 'MyEntrepreneurPlatformBot/1.0 (link previews)'
+# Allow links to private/loopback hosts (e.g. a local stub server in tests)
+LINK_PREVIEW_ALLOW_PRIVATE_HOSTS = False
+# Trending posts (content.trending): likes and comments (weighted by
+# TRENDING_WEIGHTS) decay with each window's half-life; a window ranks posts
+# with activity within its horizon. A periodic task rescores the posts whose
+# likes or comments changed, TRENDING_BATCH_SIZE posts at a time, and caches
+# the TRENDING_TOP_N posts per window.
+TRENDING_WINDOWS = {
+    '24h': {'half_life': 6 * 3600, 'horizon': 24 * 3600},
+    '7d': {'half_life': 48 * 3600, 'horizon': 7 * 24 * 3600},
+}
+TRENDING_WEIGHTS = {'like': 1.0, 'comment': 3.0}
+TRENDING_TOP_N = 100
+TRENDING_BATCH_SIZE = 1000
+# Seconds a post detail representation stays cached (it is also replaced as soon
+# as the post's version changes; see content.caching)
+POST_DETAIL_CACHE_TTL = 300
+
+
+# --- Social Settings ---
+# Rows per batch when the periodic job recomputes follower/following counts
+SOCIAL_COUNTER_RECONCILE_BATCH_SIZE = 1000
+# Most targets accepted by one bulk follow/unfollow request
+SOCIAL_BULK_FOLLOW_MAX = 200
+# "People you may know" (social.recommendations): candidates are scored from
+# mutual follows, startups followed in common and technologies shared on
+# projects, weighted by PYMK_WEIGHTS; the top PYMK_TOP_K are stored per user.
+# Users/startups/technologies with more than PYMK_MAX_HUB_DEGREE members carry
+# little signal and are skipped as intermediates. Users are written PYMK_BATCH_SIZE at a time.
+PYMK_WEIGHTS = {'mutual_follows': 1.0, 'shared_startups': 0.5, 'shared_technologies': 0.25}
+PYMK_TOP_K = 50
+PYMK_MAX_HUB_DEGREE = 5000
+PYMK_BATCH_SIZE = 1000
+
+
+# --- Media Settings ---
+# Resized copies generated for every uploaded image (media.variants), as
+# {name: longest side in pixels}, encoded in MEDIA_VARIANT_FORMAT
+MEDIA_IMAGE_VARIANTS = {'thumb': 160, 'small': 480, 'large': 1280}
+MEDIA_VARIANT_FORMAT = 'WEBP'
+MEDIA_VARIANT_QUALITY = 80
+# Uploads above this many pixels are not decoded (decompression-bomb guard)
+MEDIA_MAX_IMAGE_PIXELS = 50_000_000
+# Chunked uploads (media.uploads): partial files live in MEDIA_UPLOAD_TEMP_DIR
+# (outside MEDIA_ROOT, so never served), each request carries at most
+# MEDIA_UPLOAD_CHUNK_SIZE bytes, and sessions idle for MEDIA_UPLOAD_SESSION_TTL
+# seconds are garbage-collected
+MEDIA_UPLOAD_TEMP_DIR = BASE_DIR / 'upload_sessions'
+MEDIA_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+MEDIA_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+MEDIA_UPLOAD_SESSION_TTL = 24 * 3600
+# Extensions accepted for uploaded videos; the finished file must also be one
+# of these containers (media.uploads.sniff_video) and is stored under a server-chosen name
+MEDIA_UPLOAD_VIDEO_EXTENSIONS = ('.mp4', '.m4v', '.mov', '.webm')
+# Media serving (media.views.serve_media): bytes read per block when streaming.
+# Set MEDIA_SENDFILE_HEADER to hand files to the web server instead, e.g.
+# 'X-Accel-Redirect' with MEDIA_SENDFILE_ROOT = an nginx internal location, or
+# 'X-Sendfile' with MEDIA_SENDFILE_ROOT = str(MEDIA_ROOT)
+MEDIA_STREAM_BLOCK_SIZE = 64 * 1024
+MEDIA_SENDFILE_HEADER = None
+MEDIA_SENDFILE_ROOT = '/protected-media/'
+
+
+# --- Feed Settings ---
+# Home timelines are fanned out on write: a new post is pushed into each
+# follower's timeline in batches of FEED_FANOUT_BATCH_SIZE. Authors reaching
+# more than FEED_FANOUT_THRESHOLD followers are skipped and their posts are
+# merged in at read time instead. Timelines keep the newest FEED_TIMELINE_LENGTH posts.
+FEED_TIMELINE_LENGTH = 500
+FEED_FANOUT_THRESHOLD = 10000
+FEED_FANOUT_BATCH_SIZE = 1000
+
+
+# --- Browse Settings ---
+# Seconds startup/project facet counts stay cached per filter set (any write to
+# the catalogue invalidates them sooner; see my_entrepreneur_platform.facets)
+FACET_CACHE_TTL = 600
+# List views with a query_budget (my_entrepreneur_platform.querybudget) log a
+# warning when a page runs more queries than budgeted. The tests turn this on to
+# fail instead; keep it off in deployments, where a miss must not become a 500
+QUERY_BUDGET_STRICT = False
+
+
+# --- Discovery Settings ---
+# Matchmaking (projects.matching): projects whose looking_for is in
+# MATCHMAKING_LOOKING_FOR are matched to users by cosine similarity of TF-IDF
+# technology vectors; the best MATCHMAKING_TOP_N are stored per project and per
+# user. Technologies used by more than MATCHMAKING_MAX_POSTINGS users/projects
+# are left out of the dot products. Lists are written MATCHMAKING_BATCH_SIZE owners at a time.
+MATCHMAKING_LOOKING_FOR = ['COFOUNDERS', 'TALENT']
+MATCHMAKING_TOP_N = 20
+MATCHMAKING_MAX_POSTINGS = 20000
+MATCHMAKING_BATCH_SIZE = 1000
+# Related startups (startups.similarity): TF-IDF over tagline and description,
+# blended with same industry and same stage by STARTUP_RELATED_WEIGHTS; the
+# STARTUP_RELATED_TOP_K nearest are stored per startup. Each document keeps its
+# STARTUP_RELATED_MAX_TERMS heaviest terms, and words in more than
+# STARTUP_RELATED_MAX_POSTINGS startups are left out of the dot products.
+# Edited startups are re-embedded STARTUP_RELATED_REFRESH_BATCH at a time.
+STARTUP_RELATED_WEIGHTS = {'text': 0.7, 'industry': 0.2, 'stage': 0.1}
+STARTUP_RELATED_TOP_K = 10
+STARTUP_RELATED_MAX_TERMS = 64
+STARTUP_RELATED_MAX_POSTINGS = 20000
+STARTUP_RELATED_REFRESH_BATCH = 500
+STARTUP_RELATED_BATCH_SIZE = 1000
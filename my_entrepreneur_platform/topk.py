@@ -0,0 +1,176 @@
+# my_entrepreneur_platform/my_entrepreneur_platform/topk.py
+
+import heapq
+import math
+import time
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Shared by the offline similarity jobs (projects.matching, startups.similarity):
+# sparse unit vectors scored through inverted postings, and per-owner top-K
+# lists stored whole in a model. A list entry is (score, other id, *extra values).
+
+NO_POSTINGS = (array('I'), array('d'))
+
+
+# --- Sparse vectors ---
+def unit(vector):
+    """`vector` ({term: weight}) scaled to unit length, so dot products are cosines."""
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+def postings(vectors):
+    """Inverts {id: vector} into {term: (ids, weights)}."""
+    inverted = defaultdict(lambda: (array('I'), array('d')))
+    for owner, vector in vectors.items():
+        for term, weight in vector.items():
+            ids, weights = inverted[term]
+            ids.append(owner)
+            weights.append(weight)
+    return dict(inverted)
+
+def dot_products(vector, inverted, max_postings, overlaps=None):
+    """
+    {id: dot product} of `vector` with every vector in `inverted` sharing a term,
+    in one sweep over the postings. Terms with more than `max_postings` entries
+    are skipped: they carry little weight and would dominate the cost. If given,
+    the `overlaps` Counter receives the number of terms shared with each id.
+    """
+    totals = defaultdict(float)
+    for term, weight in vector.items():
+        ids, weights = inverted.get(term, NO_POSTINGS)
+        if len(ids) > max_postings:
+            continue
+        if overlaps is not None:
+            overlaps.update(ids)
+        for other, other_weight in zip(ids, weights):
+            totals[other] += weight * other_weight
+    return totals
+
+def top(scores, limit):
+    """The best `limit` entries of {other id: score or (score, *extra values)}, best first."""
+    return heapq.nlargest(limit, (
+        (value[0], other, *value[1:]) if isinstance(value, tuple) else (value, other)
+        for other, value in scores.items()
+    ))
+
+
+# --- Storage ---
+class TopKLists:
+    """
+    The stored lists of one model: a row per (owner, other) entry with a `score`
+    column and the `extra_fields` columns, written a batch of owners (the
+    `batch_size_setting` setting) per transaction.
+    """
+
+    def __init__(self, model, owner_field, other_field, extra_fields=(), batch_size_setting=None):
+        self.model = model
+        self.owner_field = owner_field
+        self.other_field = other_field
+        self.extra_fields = tuple(extra_fields)
+        self.batch_size_setting = batch_size_setting
+
+    def _batches(self, owners):
+        owners = sorted(owners)
+        batch_size = getattr(settings, self.batch_size_setting)
+        for start in range(0, len(owners), batch_size):
+            yield owners[start:start + batch_size]
+
+    def _owned_by(self, owners):
+        return self.model.objects.filter(**{f'{self.owner_field}__in': owners})
+
+    def _write(self, lists):
+        rows = [
+            self.model(
+                **{self.owner_field: owner, self.other_field: other},
+                score=score, **dict(zip(self.extra_fields, extra)),
+            )
+            for owner, entries in lists.items() for score, other, *extra in entries
+        ]
+        self._owned_by(list(lists)).delete()
+        self.model.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+    def replace(self, lists):
+        """Replaces the stored lists {owner id: [entry]}. Returns rows stored."""
+        stored = 0
+        for batch in self._batches(lists):
+            with transaction.atomic():
+                stored += self._write({owner: lists[owner] for owner in batch})
+        return stored
+
+    def merge(self, offers, limit, withdraw=(), skip=()):
+        """
+        Merges new entries {owner id: [entry]} into the stored lists, keeping the
+        best `limit`. The entries of the `withdraw` other ids are first dropped
+        from every list but those of the `skip` owners, in the same transaction
+        as the batch they are re-offered in, so readers never see them missing.
+        Returns rows stored.
+        """
+        owners = set(offers)
+        if withdraw:
+            owners.update(
+                self.model.objects.filter(**{f'{self.other_field}__in': withdraw})
+                .exclude(**{f'{self.owner_field}__in': skip})
+                .values_list(self.owner_field, flat=True).distinct()
+            )
+        stored = 0
+        for batch in self._batches(owners):
+            merged = {owner: list(offers.get(owner, ())) for owner in batch}
+            with transaction.atomic():
+                existing = (
+                    self._owned_by(batch).exclude(**{f'{self.other_field}__in': withdraw})
+                    .values_list(self.owner_field, 'score', self.other_field, *self.extra_fields)
+                )
+                for owner, *entry in existing:
+                    merged[owner].append(tuple(entry))
+                stored += self._write({owner: heapq.nlargest(limit, entries) for owner, entries in merged.items()})
+        return stored
+
+    def clear_others(self, keep):
+        """Deletes the stored lists of owners not in `keep` (e.g. projects that stopped looking for people)."""
+        stale = set(self.model.objects.values_list(self.owner_field, flat=True).distinct()) - set(keep)
+        for batch in self._batches(stale):
+            self._owned_by(batch).delete()
+
+
+# --- Jobs ---
+# Every job module exposes rebuild() -> rows stored and refresh() -> (owners refreshed, rows stored)
+
+def log_rebuild(logger, task, stored, rows_label):
+    logger.info(f"Task {task.request.id} completed: {stored} {rows_label} stored")
+    return stored
+
+def log_refresh(logger, task, result, rows_label, owners_label):
+    owners, stored = result
+    logger.info(f"Task {task.request.id} completed: {stored} {rows_label} stored around {owners} {owners_label}")
+    return stored
+
+
+class BuildListsCommand(BaseCommand):
+    """Base for the commands running a job's rebuild(), or its refresh() with --changed-only."""
+    rows_label = 'rows'
+    owners_label = 'owners'
+    changed_only_help = "Only refresh around what changed since the last run."
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def refresh(self):
+        raise NotImplementedError
+
+    def add_arguments(self, parser):
+        parser.add_argument('--changed-only', action='store_true', help=self.changed_only_help)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options['changed_only']:
+            owners, stored = self.refresh()
+            self.stdout.write(f"{stored} {self.rows_label} stored around {owners} {self.owners_label} in {time.monotonic() - started:.1f}s.")
+        else:
+            stored = self.rebuild()
+            self.stdout.write(f"{stored} {self.rows_label} stored in {time.monotonic() - started:.1f}s.")
@@ -1,5 +1,6 @@
 # my_entrepreneur_platform/my_entrepreneur_platform/urls.py
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from django.http import HttpResponse
@@ -29,29 +30,44 @@ from users.views import (
 # Import views from your startups application
 from startups.views import (
     IndustryListCreateAPIView, IndustryDetailAPIView,
-    StartupListCreateAPIView, StartupRetrieveUpdateDestroyAPIView
+    StartupListCreateAPIView, StartupRetrieveUpdateDestroyAPIView, StartupFacetsAPIView,
+    RelatedStartupsAPIView
 )
 
 # Import views from your projects application
 from projects.views import (
     TechnologyListCreateAPIView, TechnologyDetailAPIView,
-    ProjectListCreateAPIView, ProjectRetrieveUpdateDestroyAPIView
+    ProjectListCreateAPIView, ProjectRetrieveUpdateDestroyAPIView, ProjectFacetsAPIView,
+    ProjectMatchesAPIView, MyProjectMatchesAPIView
 )
 
 # Import views from your social application
 from social.views import (
     FollowCreateDeleteAPIView,
+    BulkFollowAPIView,
     FollowingListAPIView,
-    FollowersListAPIView
+    FollowersListAPIView,
+    PeopleYouMayKnowAPIView,
+    StartupFollowersListAPIView,
 )
 
 # Import views from your search application
-from search.views import GlobalSearchAPIView
+from search.views import GlobalSearchAPIView, async_global_search_view, SearchIndexStatusAPIView
+
+# Import views from your feed application
+from feed.views import HomeTimelineAPIView
+
+# Import views from your media application
+from media.views import (
+    UploadSessionCreateAPIView, UploadSessionDetailAPIView, UploadSessionCompleteAPIView,
+    serve_media
+)
 
 # Import views from your content application # <--- UNCOMMENTED THIS IMPORT BLOCK
 from content.views import (
-    PostListCreateAPIView, PostRetrieveUpdateDestroyAPIView,
+    PostListCreateAPIView, PostRetrieveUpdateDestroyAPIView, TrendingPostsAPIView,
     CommentListCreateAPIView, CommentRetrieveUpdateDestroyAPIView,
+    CommentRepliesAPIView, CommentThreadAPIView,
     LikeCreateDeleteAPIView
 )
 
@@ -100,7 +116,10 @@ urlpatterns = [
     path('api/industries/<int:pk>/', IndustryDetailAPIView.as_view(), name='industry-detail'),
     # Startups
     path('api/startups/', StartupListCreateAPIView.as_view(), name='startup-list-create'),
+    path('api/startups/facets/', StartupFacetsAPIView.as_view(), name='startup-facets'),
     path('api/startups/<int:pk>/', StartupRetrieveUpdateDestroyAPIView.as_view(), name='startup-retrieve-update-destroy'),
+    path('api/startups/<int:pk>/followers/', StartupFollowersListAPIView.as_view(), name='startup-followers-list'),
+    path('api/startups/<int:pk>/related/', RelatedStartupsAPIView.as_view(), name='startup-related'),
 
     # API URLs for Project Pages
     # Technologies
@@ -108,27 +127,54 @@ urlpatterns = [
     path('api/technologies/<int:pk>/', TechnologyDetailAPIView.as_view(), name='technology-detail'),
     # Projects
     path('api/projects/', ProjectListCreateAPIView.as_view(), name='project-list-create'),
+    path('api/projects/facets/', ProjectFacetsAPIView.as_view(), name='project-facets'),
     path('api/projects/<int:pk>/', ProjectRetrieveUpdateDestroyAPIView.as_view(), name='project-retrieve-update-destroy'),
+    # Matchmaking: people for a project (owner only), and projects for the current user
+    path('api/projects/<int:pk>/matches/', ProjectMatchesAPIView.as_view(), name='project-matches'),
+    path('api/me/project-matches/', MyProjectMatchesAPIView.as_view(), name='my-project-matches'),
 
     # --- API URLs for Content/Posts System (UNCOMMENTED) ---
     # Posts
     path('api/posts/', PostListCreateAPIView.as_view(), name='post-list-create'),
     path('api/posts/<int:pk>/', PostRetrieveUpdateDestroyAPIView.as_view(), name='post-retrieve-update-destroy'),
+    path('api/posts/trending/', TrendingPostsAPIView.as_view(), name='post-trending'),
     # Comments
     path('api/posts/<int:post_id>/comments/', CommentListCreateAPIView.as_view(), name='comment-list-create'),
     path('api/posts/<int:post_id>/comments/<int:pk>/', CommentRetrieveUpdateDestroyAPIView.as_view(), name='comment-retrieve-update-destroy'),
+    # Threaded replies: direct replies (lazy expansion) and a whole subtree in thread order
+    path('api/posts/<int:post_id>/comments/<int:pk>/replies/', CommentRepliesAPIView.as_view(), name='comment-replies'),
+    path('api/posts/<int:post_id>/comments/<int:pk>/thread/', CommentThreadAPIView.as_view(), name='comment-thread'),
     # Likes
     path('api/likes/<str:content_type_model>/<int:object_id>/', LikeCreateDeleteAPIView.as_view(), name='like-create-delete'),
     # --- End API URLs ---
 
     # API URLs for Follow/Unfollow System
+    # Follow/unfollow many users and startups at once
+    path('api/follows/bulk/', BulkFollowAPIView.as_view(), name='follow-bulk'),
     # Create/Delete Follow
     path('api/follows/<str:content_type_model>/<int:object_id>/', FollowCreateDeleteAPIView.as_view(), name='follow-create-delete'),
     # List Following (who a user follows)
     path('api/users/<int:user_id>/following/', FollowingListAPIView.as_view(), name='user-following-list'),
     # List Followers (who follows a user)
     path('api/users/<int:user_id>/followers/', FollowersListAPIView.as_view(), name='user-followers-list'),
+    # "People you may know" for the current user
+    path('api/me/people-you-may-know/', PeopleYouMayKnowAPIView.as_view(), name='people-you-may-know'),
     
     # NEW API URL for Global Search
     path('api/search/', GlobalSearchAPIView.as_view(), name='global-search'),
+    # Concurrent variant with a per-type time budget (serve under ASGI)
+    path('api/search/async/', async_global_search_view, name='global-search-async'),
+    # Search index backlog (admin only)
+    path('api/search/index-status/', SearchIndexStatusAPIView.as_view(), name='search-index-status'),
+
+    # Home timeline of the authenticated user
+    path('api/feed/', HomeTimelineAPIView.as_view(), name='home-timeline'),
+
+    # Chunked, resumable uploads (post videos)
+    path('api/uploads/', UploadSessionCreateAPIView.as_view(), name='upload-session-create'),
+    path('api/uploads/<uuid:pk>/', UploadSessionDetailAPIView.as_view(), name='upload-session-detail'),
+    path('api/uploads/<uuid:pk>/complete/', UploadSessionCompleteAPIView.as_view(), name='upload-session-complete'),
+
+    # Uploaded files (images, variants, videos), with byte-range support
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", serve_media, name='media'),
 ]
\ No newline at end of file
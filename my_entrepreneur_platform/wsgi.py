@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_entrepreneur_platform.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings
+from search.index import warm_search_index
+
+if settings.SEARCH_INDEX_WARM_ON_STARTUP:
+    warm_search_index()
@@ -0,0 +1,69 @@
+# my_entrepreneur_platform/notifications/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+
+from startups.models import Startup
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+@shared_task(bind=True)
+def notify_new_follows(self, follower_id, content_type_id, object_ids):
+    """
+    Tells the followed users (or startup owners) that `follower_id` followed them:
+    one bulk INSERT for every notification, then a channel message for each.
+    """
+    follower = User.objects.filter(pk=follower_id).only('pk', 'username').first()
+    if follower is None:
+        return 0
+    content_type = ContentType.objects.get_for_id(content_type_id)
+    model = content_type.model_class()
+    if model is User:
+        recipients = {object_id: object_id for object_id in object_ids}
+    elif model is Startup:
+        recipients = dict(Startup.objects.filter(pk__in=object_ids).values_list('pk', 'owner_id'))
+    else:
+        return 0
+    actor_type = ContentType.objects.get_for_model(User)
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            recipient_id=recipient_id,
+            actor_content_type=actor_type, actor_object_id=follower.pk,
+            verb='followed',
+            target_content_type=content_type, target_object_id=object_id,
+        )
+        for object_id, recipient_id in recipients.items()
+        if recipient_id != follower.pk # No notification for following your own startup
+    ])
+
+    channel_layer = get_channel_layer()
+    for notification in notifications:
+        payload = {
+            "id": notification.id,
+            "recipient_id": notification.recipient_id,
+            "actor_id": follower.pk,
+            "actor_username": follower.username,
+            "verb": notification.verb,
+            "target_info": f"{content_type.model} {notification.target_object_id}",
+            "action_url": notification.action_url,
+            "timestamp": notification.timestamp.isoformat(),
+            "is_read": notification.is_read,
+            "message": f"{follower.username} followed you!" if model is User else f"{follower.username} followed your startup!",
+        }
+        try:
+            async_to_sync(channel_layer.group_send)(
+                f'user_{notification.recipient_id}_notifications',
+                {'type': 'send_notification', 'notification_data': payload},
+            )
+        except Exception:
+            # The rows are saved; clients that miss the push see them in the notification list
+            logger.exception(f"Could not push notification {notification.id}.")
+    logger.info(f"Task {self.request.id} completed: {len(notifications)} follow notifications for {follower_id}")
+    return len(notifications)
@@ -1,8 +1,10 @@
 # my_entrepreneur_platform/projects/admin.py
 
 from django.contrib import admin
-from .models import Technology, Project
+from .models import Technology, Project, ProjectMatch, UserProjectMatch
 
 # Register your models here
 admin.site.register(Technology)
-admin.site.register(Project)
\ No newline at end of file
+admin.site.register(Project)
+admin.site.register(ProjectMatch)
+admin.site.register(UserProjectMatch)
@@ -0,0 +1,17 @@
+# my_entrepreneur_platform/projects/management/commands/build_project_matches.py
+
+from my_entrepreneur_platform.topk import BuildListsCommand
+from projects.matching import rebuild_matches, refresh_matches
+
+
+class Command(BuildListsCommand):
+    help = "Computes the stored project/people matches from the technologies on users' projects."
+    changed_only_help = "Only refresh around users whose projects changed since the last run."
+    rows_label = 'matches'
+    owners_label = 'users'
+
+    def rebuild(self):
+        return rebuild_matches()
+
+    def refresh(self):
+        return refresh_matches()
@@ -0,0 +1,156 @@
+# my_entrepreneur_platform/projects/matching.py
+
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from my_entrepreneur_platform.refresh import mark_on_commit
+from my_entrepreneur_platform.topk import TopKLists, dot_products, postings, top, unit
+from .models import MatchRefresh, Project, ProjectMatch, UserProjectMatch
+
+
+# --- Technology vectors ---
+# A user is the technologies of the projects they own (weighted by how many of
+# their projects use each one), an open project is its own technologies. Both
+# are TF-IDF weighted over users and normalised to unit length, so a dot product
+# is their cosine similarity. Dot products are computed from inverted postings
+# (technology -> ids and weights), one whole row of scores at a time.
+
+class TechnologyVectors:
+
+    def __init__(self, rows, open_project_ids):
+        """`rows` are (project id, owner id, technology id); `open_project_ids` are the projects seeking people."""
+        project_technologies = defaultdict(set)
+        user_counts = defaultdict(Counter)
+        self.owners = {}
+        self.owned = defaultdict(set)
+        for project_id, owner_id, technology_id in rows:
+            project_technologies[project_id].add(technology_id)
+            user_counts[owner_id][technology_id] += 1
+            self.owners[project_id] = owner_id
+            self.owned[owner_id].add(project_id)
+
+        document_frequency = Counter(technology_id for counts in user_counts.values() for technology_id in counts)
+        total = len(user_counts)
+        idf = {technology_id: math.log((1 + total) / (1 + df)) + 1 for technology_id, df in document_frequency.items()}
+
+        self.users = {
+            user_id: unit({technology_id: (1 + math.log(count)) * idf[technology_id] for technology_id, count in counts.items()})
+            for user_id, counts in user_counts.items()
+        }
+        self.projects = {
+            project_id: unit({technology_id: idf[technology_id] for technology_id in technologies})
+            for project_id, technologies in project_technologies.items()
+            if project_id in open_project_ids
+        }
+        self.user_postings = postings(self.users)
+        self.project_postings = postings(self.projects)
+
+    @classmethod
+    def load(cls):
+        rows = (
+            Project.technologies_used.through.objects.order_by()
+            .values_list('project_id', 'project__owner_id', 'technology_id').iterator(chunk_size=10000)
+        )
+        open_ids = set(
+            Project.objects.filter(looking_for__in=settings.MATCHMAKING_LOOKING_FOR).values_list('pk', flat=True)
+        )
+        return cls(rows, open_ids)
+
+    def _scores(self, vector, inverted, excluded):
+        """{id: (cosine, shared technologies)} against every vector in `inverted` sharing a technology."""
+        shared = Counter()
+        totals = dot_products(vector, inverted, settings.MATCHMAKING_MAX_POSTINGS, overlaps=shared)
+        return {other: (score, shared[other]) for other, score in totals.items() if other not in excluded}
+
+    def project_scores(self, project_id):
+        """Users scored against an open project (its owner excluded)."""
+        return self._scores(self.projects.get(project_id, {}), self.user_postings, {self.owners.get(project_id)})
+
+    def user_scores(self, user_id):
+        """Open projects scored against a user (their own projects excluded)."""
+        return self._scores(self.users.get(user_id, {}), self.project_postings, self.owned.get(user_id, set()))
+
+
+# --- Storage ---
+# Each list is stored whole: ProjectMatch rows per project (other = user) and
+# UserProjectMatch rows per user (other = project).
+PROJECT_LISTS = TopKLists(ProjectMatch, 'project_id', 'user_id', ('shared_technologies',), 'MATCHMAKING_BATCH_SIZE')
+USER_LISTS = TopKLists(UserProjectMatch, 'user_id', 'project_id', ('shared_technologies',), 'MATCHMAKING_BATCH_SIZE')
+
+
+# --- Jobs ---
+def rebuild_matches():
+    """
+    Scores every open project against every user in one pass: each project's row
+    gives its own top list and feeds a bounded heap per user. Returns rows stored.
+    """
+    limit = settings.MATCHMAKING_TOP_N
+    # Clear the marks before reading: a project written from here on marks its owner again
+    MatchRefresh.objects.all().delete()
+    vectors = TechnologyVectors.load()
+
+    project_lists = {}
+    user_heaps = defaultdict(list)
+    for project_id in vectors.projects:
+        scores = vectors.project_scores(project_id)
+        project_lists[project_id] = top(scores, limit)
+        for user_id, (score, shared) in scores.items():
+            heap = user_heaps[user_id]
+            if len(heap) < limit:
+                heapq.heappush(heap, (score, project_id, shared))
+            elif (score, project_id, shared) > heap[0]:
+                heapq.heapreplace(heap, (score, project_id, shared))
+
+    stored = PROJECT_LISTS.replace(project_lists)
+    stored += USER_LISTS.replace({user_id: sorted(heap, reverse=True) for user_id, heap in user_heaps.items()})
+    PROJECT_LISTS.clear_others(project_lists)
+    USER_LISTS.clear_others(user_heaps)
+    return stored
+
+def refresh_matches():
+    """
+    Recomputes after the projects of the users marked by mark_for_refresh changed:
+    their own lists and their projects' lists are rebuilt, and their entries in
+    everyone else's lists are withdrawn and re-offered at the new scores.
+    Returns (users refreshed, rows stored).
+    """
+    marked = set(MatchRefresh.objects.values_list('user_id', flat=True))
+    if not marked:
+        return 0, 0
+    # Clear the marks before reading: a project written from here on marks its owner again
+    MatchRefresh.objects.filter(user_id__in=marked).delete()
+    limit = settings.MATCHMAKING_TOP_N
+    vectors = TechnologyVectors.load()
+    changed_projects = {project_id for project_id in vectors.projects if vectors.owners[project_id] in marked}
+
+    project_scores = {project_id: vectors.project_scores(project_id) for project_id in changed_projects}
+    user_scores = {user_id: vectors.user_scores(user_id) for user_id in marked}
+
+    # The lists of their projects that are no longer open
+    ProjectMatch.objects.filter(project__owner_id__in=marked).exclude(project_id__in=changed_projects).delete()
+
+    user_offers = defaultdict(list)
+    for project_id, scores in project_scores.items():
+        for user_id, (score, shared) in scores.items():
+            if user_id not in marked:
+                user_offers[user_id].append((score, project_id, shared))
+    project_offers = defaultdict(list)
+    for user_id, scores in user_scores.items():
+        for project_id, (score, shared) in scores.items():
+            if project_id not in changed_projects:
+                project_offers[project_id].append((score, user_id, shared))
+
+    stored = PROJECT_LISTS.replace({project_id: top(scores, limit) for project_id, scores in project_scores.items()})
+    stored += USER_LISTS.replace({user_id: top(scores, limit) for user_id, scores in user_scores.items()})
+    # Withdraw the marked users from other projects' lists, and their projects from other users' lists,
+    # re-offering the new scores in the same transactions
+    stored += PROJECT_LISTS.merge(project_offers, limit, withdraw=marked, skip=changed_projects)
+    owned_projects = set(Project.objects.filter(owner_id__in=marked).values_list('pk', flat=True))
+    stored += USER_LISTS.merge(user_offers, limit, withdraw=owned_projects, skip=marked)
+    return len(marked), stored
+
+def mark_for_refresh(user_id):
+    mark_on_commit(MatchRefresh, user_id)
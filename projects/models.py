@@ -58,6 +58,7 @@ class Project(models.Model):
     tagline = models.CharField(max_length=255, blank=True, null=True, help_text="A short, catchy phrase for the project.")
     description = models.TextField()
     project_logo = models.ImageField(upload_to='project_logos/', blank=True, null=True)
+    project_logo_variants = models.JSONField(default=dict, blank=True, editable=False) # Resized copies, see media.variants
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='IDEA')
     technologies_used = models.ManyToManyField(
         Technology,
@@ -81,6 +82,53 @@ class Project(models.Model):
     class Meta:
         verbose_name_plural = "Projects"
         ordering = ['-created_at'] # Newest projects first
+        indexes = [
+            # Browse pages: newest first, optionally narrowed by one facet
+            models.Index(fields=['-created_at', '-id'], name='projects_keyset_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='projects_status_keyset_idx'),
+            models.Index(fields=['looking_for', '-created_at', '-id'], name='projects_looking_keyset_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+# --- Matchmaking (see projects.matching) ---
+class ProjectMatch(models.Model):
+    """A person suggested for a project that is looking for co-founders or talent (top MATCHMAKING_TOP_N per project)."""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='candidate_matches')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField() # Cosine similarity of the technology vectors
+    shared_technologies = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('project', 'user')
+        ordering = ['-score']
+        indexes = [models.Index(fields=['project', '-score'], name='projects_match_project_idx')]
+
+    def __str__(self):
+        return f"User {self.user_id} for project {self.project_id} ({self.score:.2f})"
+
+class UserProjectMatch(models.Model):
+    """A project suggested to a user (top MATCHMAKING_TOP_N per user)."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='project_matches')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    shared_technologies = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'project')
+        ordering = ['-score']
+        indexes = [models.Index(fields=['user', '-score'], name='projects_match_user_idx')]
+
+    def __str__(self):
+        return f"Project {self.project_id} for user {self.user_id} ({self.score:.2f})"
+
+class MatchRefresh(models.Model):
+    """Marks a user whose projects (and so technology vector) changed since matches were computed."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    marked_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Refresh matches for {self.user_id}"
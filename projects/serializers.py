@@ -1,9 +1,12 @@
 # my_entrepreneur_platform/projects/serializers.py
 
 from rest_framework import serializers
-from .models import Technology, Project
+from django.db.models import Prefetch
+from media.serializers import VariantsField
+from .models import Technology, Project, ProjectMatch, UserProjectMatch
 from django.contrib.auth import get_user_model
-from startups.serializers import StartupSerializer as BasicStartupSerializer # For nesting Startup info
+from startups.models import Startup
+from startups.serializers import StartupSummarySerializer # For nesting Startup info
 from users.serializers import UserSerializer as BasicUserSerializer # For nesting User info
 
 User = get_user_model()
@@ -20,14 +23,15 @@ class ProjectSerializer(serializers.ModelSerializer):
     owner = BasicUserSerializer(read_only=True) # Read-only, will be set automatically by view
     owner_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='owner', write_only=True, required=False) # For input
     
-    related_startup = BasicStartupSerializer(read_only=True) # Nested display of Startup
+    related_startup = StartupSummarySerializer(read_only=True) # Slim nested display of Startup
     related_startup_id = serializers.PrimaryKeyRelatedField(
-        queryset=BasicStartupSerializer.Meta.model.objects.all(), # Use model from BasicStartupSerializer
+        queryset=Startup.objects.all(),
         source='related_startup', write_only=True, required=False, allow_null=True
     ) # For input (providing startup ID)
 
     # Display technologies_used using the TechnologySerializer
     technologies_used = TechnologySerializer(many=True, read_only=True)
+    variants = VariantsField(source='project_logo_variants') # Resized copies of the logo
     technologies_used_ids = serializers.PrimaryKeyRelatedField(
         queryset=Technology.objects.all(), source='technologies_used', many=True, write_only=True, required=False
     ) # For input (providing list of technology IDs)
@@ -35,11 +39,42 @@ class ProjectSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = [
-            'id', 'title', 'tagline', 'description', 'project_logo', 'status',
+            'id', 'title', 'tagline', 'description', 'project_logo', 'variants', 'status',
             'technologies_used', 'technologies_used_ids',
             'looking_for', 'link_to_repo', 'link_to_demo',
             'owner', 'owner_id',
             'related_startup', 'related_startup_id',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['created_at', 'updated_at']
+
+    @staticmethod
+    def prefetch_plan(queryset):
+        """Everything a page of ProjectSerializer reads: one query for the rows, one for their technologies."""
+        return queryset.select_related('owner', 'related_startup__industry').prefetch_related(
+            Prefetch('technologies_used', queryset=Technology.objects.order_by('name'))
+        )
+
+# Serializers for stored matchmaking results (see projects.matching)
+class ProjectMatchSerializer(serializers.ModelSerializer):
+    user = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProjectMatch
+        fields = ['user', 'score', 'shared_technologies', 'computed_at']
+        read_only_fields = fields
+
+    def get_user(self, obj):
+        return {'id': obj.user_id, 'username': obj.user.username}
+
+class UserProjectMatchSerializer(serializers.ModelSerializer):
+    project = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UserProjectMatch
+        fields = ['project', 'score', 'shared_technologies', 'computed_at']
+        read_only_fields = fields
+
+    def get_project(self, obj):
+        project = obj.project
+        return {'id': project.pk, 'title': project.title, 'tagline': project.tagline, 'status': project.status, 'looking_for': project.looking_for}
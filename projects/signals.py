@@ -0,0 +1,41 @@
+# my_entrepreneur_platform/projects/signals.py
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from my_entrepreneur_platform.facets import bump_generation
+from social.recommendations import mark_for_refresh as mark_recommendations_refresh
+from .matching import mark_for_refresh
+from .models import Project, Technology
+
+# Any project write, technology change on a project, or technology rename can change facet counts or labels.
+# Project writes also mark the owner for a matchmaking refresh (their technology vector may have changed).
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Technology)
+@receiver(post_delete, sender=Technology)
+def invalidate_project_facets(sender, **kwargs):
+    bump_generation('projects')
+
+@receiver(m2m_changed, sender=Project.technologies_used.through)
+def project_technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Technologies on a project changed: marks the owners for both matchmaking and people-you-may-know."""
+    if not reverse:
+        owner_ids = {instance.owner_id} if action in ('post_add', 'post_remove', 'post_clear') else set()
+    elif action == 'pre_clear': # Cleared from the Technology side: no pk_set is sent, read the projects first
+        owner_ids = set(sender.objects.filter(technology_id=instance.pk).values_list('project__owner_id', flat=True))
+    elif action in ('post_add', 'post_remove'): # From the Technology side: pk_set holds projects
+        owner_ids = set(Project.objects.filter(pk__in=pk_set).values_list('owner_id', flat=True))
+    else:
+        owner_ids = set()
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_generation('projects')
+    for owner_id in owner_ids:
+        mark_for_refresh(owner_id)
+        mark_recommendations_refresh(owner_id)
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    mark_for_refresh(instance.owner_id)
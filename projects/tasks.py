@@ -0,0 +1,19 @@
+# my_entrepreneur_platform/projects/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from my_entrepreneur_platform.topk import log_rebuild, log_refresh
+from .matching import rebuild_matches, refresh_matches
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def rebuild_project_matches(self):
+    """Nightly full recomputation of project/people matchmaking."""
+    return log_rebuild(logger, self, rebuild_matches(), 'matches')
+
+@shared_task(bind=True)
+def refresh_project_matches(self):
+    """Recomputes matches around users whose projects changed."""
+    return log_refresh(logger, self, refresh_matches(), 'matches', 'users')
@@ -1,3 +1,159 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from social.models import RecommendationRefresh
+from .matching import TechnologyVectors, rebuild_matches, refresh_matches
+from .models import MatchRefresh, Project, ProjectMatch, Technology, UserProjectMatch
+
+User = get_user_model()
+
+
+class RefreshMarkTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='x')
+        self.python = Technology.objects.create(name='Python')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(owner=self.owner, title='Ledger', description='Bookkeeping')
+        MatchRefresh.objects.all().delete()
+        RecommendationRefresh.objects.all().delete()
+
+    def test_technology_change_marks_both_jobs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.technologies_used.add(self.python)
+            self.assertFalse(MatchRefresh.objects.exists())
+        self.assertTrue(MatchRefresh.objects.filter(user=self.owner).exists())
+        self.assertTrue(RecommendationRefresh.objects.filter(user=self.owner).exists())
+
+    def test_clearing_from_the_technology_side_marks_the_owners(self):
+        self.project.technologies_used.add(self.python)
+        MatchRefresh.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.projects.clear()
+        self.assertTrue(MatchRefresh.objects.filter(user=self.owner).exists())
+
+    def test_deleting_a_user_with_projects(self):
+        self.project.technologies_used.add(self.python)
+        MatchRefresh.objects.all().delete()
+        RecommendationRefresh.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.delete() # The cascade fires the Project post_delete receivers
+
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(MatchRefresh.objects.exists())
+        self.assertFalse(RecommendationRefresh.objects.exists())
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class ProjectListQueryBudgetTests(TestCase):
+    def test_authenticated_page_with_a_cold_content_type_cache(self):
+        technologies = [Technology.objects.create(name=name) for name in ('Python', 'Rust', 'Go')]
+        for number in range(5):
+            owner = User.objects.create_user(username=f'owner{number}', password='x')
+            project = Project.objects.create(owner=owner, title=f'Project {number}', description='A project')
+            project.technologies_used.set(technologies[:number % 3 + 1])
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='viewer', password='x'))
+
+        ContentType.objects.clear_cache()
+        response = client.get('/api/projects/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 5)
+
+
+class ProjectFilterTests(TestCase):
+    def test_invalid_ids_are_rejected(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='viewer', password='x'))
+        for param in ('technology', 'startup'):
+            for value in ('²', 'x', '0', str(2 ** 64)):
+                for url in ('/api/projects/', '/api/projects/facets/'):
+                    with self.subTest(param=param, value=value, url=url):
+                        response = client.get(url, {param: value})
+                        self.assertEqual(response.status_code, 400)
+                        self.assertIn(param, response.data)
+
+
+class ProjectFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.python, self.rust = (Technology.objects.create(name=name) for name in ('Python', 'Rust'))
+        owner = User.objects.create_user(username='owner', password='x')
+        self.ledger = Project.objects.create(owner=owner, title='Ledger', description='x', looking_for='COFOUNDERS')
+        self.ledger.technologies_used.set([self.python, self.rust])
+        Project.objects.create(owner=owner, title='Garden', description='x').technologies_used.set([self.python])
+        self.client = APIClient()
+
+    def technology_counts(self, **filters):
+        response = self.client.get('/api/projects/facets/', filters)
+        self.assertEqual(response.status_code, 200)
+        return {item['label']: item['count'] for item in response.data['facets']['technology']}
+
+    def test_technology_counts_keep_other_technologies(self):
+        self.assertEqual(self.technology_counts(), {'Python': 2, 'Rust': 1})
+        self.assertEqual(self.technology_counts(technology=self.rust.pk), {'Python': 1, 'Rust': 1})
+
+    def test_technology_changes_invalidate_after_commit(self):
+        self.technology_counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ledger.technologies_used.remove(self.python)
+            self.assertEqual(self.technology_counts(), {'Python': 2, 'Rust': 1})
+        self.assertEqual(self.technology_counts(), {'Python': 1, 'Rust': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rust.delete()
+        self.assertEqual(self.technology_counts(), {'Python': 1})
+
+
+class MatchingJobTests(TestCase):
+    def setUp(self):
+        self.python, self.rust, self.go = (Technology.objects.create(name=name) for name in ('Python', 'Rust', 'Go'))
+        self.founder = User.objects.create_user(username='founder', password='x')
+        self.open_project = Project.objects.create(owner=self.founder, title='Ledger', description='x', looking_for='COFOUNDERS')
+        self.open_project.technologies_used.set([self.python, self.rust])
+        self.people = {}
+        for username, technologies in (('pythonista', [self.python]), ('both', [self.python, self.rust]), ('gopher', [self.go])):
+            user = User.objects.create_user(username=username, password='x')
+            Project.objects.create(owner=user, title=f'{username} project', description='x').technologies_used.set(technologies)
+            self.people[username] = user
+
+    def project_list(self):
+        return list(ProjectMatch.objects.filter(project=self.open_project).order_by('-score').values_list('user__username', 'shared_technologies'))
+
+    def test_rebuild_and_refresh(self):
+        rebuild_matches()
+        self.assertEqual(self.project_list(), [('both', 2), ('pythonista', 1)])
+        self.assertEqual(
+            list(UserProjectMatch.objects.filter(user=self.people['both']).values_list('project_id', flat=True)),
+            [self.open_project.pk],
+        )
+
+        # The gopher picks up Rust: only they are marked, and the project's list gains them
+        with self.captureOnCommitCallbacks(execute=True):
+            self.people['gopher'].owned_projects.get().technologies_used.add(self.rust)
+        self.assertEqual(refresh_matches()[0], 1)
+        self.assertEqual(self.project_list(), [('both', 2), ('pythonista', 1), ('gopher', 1)])
+
+        # And drops it again: they are withdrawn from the list, the others keep their entries
+        with self.captureOnCommitCallbacks(execute=True):
+            self.people['gopher'].owned_projects.get().technologies_used.remove(self.rust)
+        self.assertEqual(refresh_matches()[0], 1)
+        self.assertEqual(self.project_list(), [('both', 2), ('pythonista', 1)])
+        self.assertFalse(UserProjectMatch.objects.filter(user=self.people['gopher']).exists())
+
+    def test_a_mark_written_during_a_rebuild_survives_it(self):
+        gopher = self.people['gopher']
+        load = TechnologyVectors.load
+
+        def load_while_the_gopher_edits():
+            MatchRefresh.objects.create(user=gopher) # Committed while the job reads the vectors
+            return load()
+
+        with mock.patch.object(TechnologyVectors, 'load', side_effect=load_while_the_gopher_edits):
+            rebuild_matches()
+        self.assertTrue(MatchRefresh.objects.filter(user=gopher).exists())
@@ -3,10 +3,15 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404
 
-from .models import Technology, Project # Your models
-from .serializers import TechnologySerializer, ProjectSerializer # Your serializers
+from my_entrepreneur_platform.facets import cached_counts, grouped_counts, parse_id_filter
+from my_entrepreneur_platform.pagination import KeysetCursorPagination
+from my_entrepreneur_platform.querybudget import QueryBudgetMixin
+from .models import Technology, Project, ProjectMatch, UserProjectMatch # Your models
+from .serializers import TechnologySerializer, ProjectSerializer, ProjectMatchSerializer, UserProjectMatchSerializer # Your serializers
 from startups.models import Startup # Import Startup model for permission checking
 
 
@@ -31,23 +36,95 @@ class TechnologyDetailAPIView(generics.RetrieveAPIView):
     serializer_class = TechnologySerializer
     permission_classes = [permissions.AllowAny] # Anyone can view a specific technology
 
-# View for listing all projects and creating new ones
-class ProjectListCreateAPIView(generics.ListCreateAPIView):
+# --- Browsing ---
+def filter_projects(params):
+    """
+    Projects narrowed by the optional ?status=, ?looking_for=, ?technology=<id>
+    and ?startup=<id> filters. Returns (queryset, applied filters).
+    """
     queryset = Project.objects.all()
+    applied = {}
+    for param, choices in (('status', Project.STATUS_CHOICES), ('looking_for', Project.LOOKING_FOR_CHOICES)):
+        value = params.get(param)
+        if value:
+            if value not in dict(choices):
+                raise serializers.ValidationError({param: f"Must be one of {', '.join(dict(choices))}."})
+            applied[param] = value
+            queryset = queryset.filter(**{param: value})
+    for param, lookup in (('technology', 'technologies_used'), ('startup', 'related_startup_id')):
+        value = params.get(param)
+        if value:
+            applied[param] = parse_id_filter(value, param, f"Must be a {param} id.")
+            queryset = queryset.filter(**{lookup: applied[param]})
+    return queryset, applied
+
+# View for listing all projects and creating new ones
+class ProjectListCreateAPIView(QueryBudgetMixin, generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
+    query_budget = 2 # Page, technologies
     permission_classes = [permissions.IsAuthenticatedOrReadOnly] # Authenticated can create, anyone can list
+    pagination_class = KeysetCursorPagination # Newest first, (-created_at, -id)
+
+    def get_queryset(self):
+        queryset, _applied = filter_projects(self.request.query_params)
+        return ProjectSerializer.prefetch_plan(queryset)
 
     def perform_create(self, serializer):
         # Automatically set the owner of the project to the currently authenticated user
         serializer.save(owner=self.request.user)
 
+# Counts per status, looking_for and technology for the current filter set
+class ProjectFacetsAPIView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        queryset, applied = filter_projects(request.query_params)
+
+        def compute():
+            # status and looking_for share one grouped query; technologies (many-to-many) need their own
+            facets = grouped_counts(queryset, {
+                'status': ('status', dict(Project.STATUS_CHOICES)),
+                'looking_for': ('looking_for', dict(Project.LOOKING_FOR_CHOICES)),
+            })
+            # Re-select by pk so a ?technology= filter's join doesn't hide the projects' other technologies
+            matching = Project.objects.filter(pk__in=queryset.values('pk'))
+            facets.update(grouped_counts(matching, {'technology': ('technologies_used', 'technologies_used__name')}))
+            return facets
+
+        return Response({'filters': applied, 'facets': cached_counts('projects', applied, compute)})
+
 # View for retrieving, updating, and deleting a specific project
 class ProjectRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Project.objects.all()
+    queryset = ProjectSerializer.prefetch_plan(Project.objects.all())
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly] # Allow read for all, but need custom permission for update/delete
 
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
             self.permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
-        return super().get_permissions()
\ No newline at end of file
+        return super().get_permissions()
+
+# --- Matchmaking (stored by projects.matching) ---
+# People suggested for one of the requesting user's projects, best first
+class ProjectMatchesAPIView(generics.ListAPIView):
+    serializer_class = ProjectMatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None # At most MATCHMAKING_TOP_N rows
+
+    def get_queryset(self):
+        project = get_object_or_404(Project, pk=self.kwargs['pk'])
+        if project.owner_id != self.request.user.pk:
+            raise PermissionDenied("Only the project owner can see its matches.")
+        return ProjectMatch.objects.filter(project=project).select_related('user').order_by('-score', 'user_id')
+
+# Open projects suggested to the requesting user, best first
+class MyProjectMatchesAPIView(generics.ListAPIView):
+    serializer_class = UserProjectMatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        return (
+            UserProjectMatch.objects.filter(user=self.request.user)
+            .select_related('project').order_by('-score', 'project_id')
+        )
@@ -1,3 +1,8 @@
+# my_entrepreneur_platform/search/admin.py
+
 from django.contrib import admin
+from .models import IndexQueueEntry, SearchEntry
 
-# Register your models here.
+# Register your models here
+admin.site.register(IndexQueueEntry)
+admin.site.register(SearchEntry)
@@ -0,0 +1,377 @@
+# my_entrepreneur_platform/search/benchmarks.py
+
+"""
+Synthetic corpus generation, query-log replay and metrics for comparing search
+backends at scale. Driven by the benchmark_search management command.
+"""
+
+import json
+import math
+import random
+import statistics
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+
+from users.models import UserSearchDocument
+from startups.models import Industry, Startup
+from projects.models import Technology, Project
+from content.models import Post
+
+from .index import FUZZY_KINDS, get_search_index, reset_search_index
+from .indexing import mark_dirty, drain_index_queue
+from .queries import SEARCH_TYPES, fuzzy_search
+from .views import GlobalSearchAPIView, async_global_search_view
+
+User = get_user_model()
+
+INDUSTRIES = [
+    'Fintech', 'Healthcare', 'Edtech', 'Climate', 'Logistics', 'Retail', 'Artificial Intelligence',
+    'Cybersecurity', 'Gaming', 'Agritech', 'Biotech', 'Real Estate', 'Mobility', 'Media',
+]
+TECHNOLOGIES = [
+    'Python', 'Django', 'React', 'Kubernetes', 'PostgreSQL', 'Rust', 'Go', 'TypeScript', 'TensorFlow',
+    'PyTorch', 'Swift', 'Kotlin', 'Redis', 'GraphQL', 'Solidity', 'Flutter', 'Celery', 'Docker',
+]
+NAME_PARTS = [
+    'pay', 'flow', 'ledger', 'nova', 'quant', 'pixel', 'green', 'health', 'cloud', 'data', 'mind',
+    'grid', 'spark', 'leaf', 'bridge', 'stack', 'pulse', 'orbit', 'forge', 'wave', 'path', 'scale',
+]
+FIRST_NAMES = [
+    'Amara', 'Ben', 'Chen', 'Dara', 'Elif', 'Femi', 'Gita', 'Hugo', 'Ines', 'Jonas', 'Kemal', 'Lena',
+    'Mateo', 'Nadia', 'Omar', 'Priya', 'Quinn', 'Rosa', 'Sami', 'Tariq', 'Uma', 'Viktor', 'Yara', 'Zane',
+]
+LAST_NAMES = [
+    'Okafor', 'Schmidt', 'Wang', 'Silva', 'Yilmaz', 'Adeyemi', 'Patel', 'Laurent', 'Costa', 'Berg',
+    'Demir', 'Novak', 'Garcia', 'Haddad', 'Ito', 'Kowalski', 'Moreau', 'Rossi', 'Sato', 'Tanaka',
+]
+WORDS = [
+    'platform', 'customers', 'automate', 'payments', 'insights', 'network', 'marketplace', 'secure',
+    'fast', 'open', 'source', 'mobile', 'analytics', 'teams', 'launch', 'growth', 'users', 'pilot',
+    'funding', 'hiring', 'engineers', 'designers', 'feedback', 'beta', 'release', 'scale', 'carbon',
+    'patients', 'students', 'farmers', 'retailers', 'drivers', 'energy', 'privacy', 'compliance',
+]
+SYLLABLES = ['zo', 'rix', 'vel', 'qu', 'mar', 'thy', 'xan', 'lup', 'oro', 'kes', 'dra', 'ibe', 'fyn', 'gor']
+
+# Query-log categories. Only 'rare' and 'typo' queries carry labelled expectations.
+QUERY_CATEGORIES = ('short', 'long', 'rare', 'typo')
+
+
+def make_typo(rng, word):
+    """One random edit: deletion, adjacent transposition or substitution."""
+    if len(word) < 4:
+        return word
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(('delete', 'transpose', 'substitute'))
+    if edit == 'delete':
+        return word[:i] + word[i + 1:]
+    if edit == 'transpose':
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice('aeioustr') + word[i + 1:]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+# --- Corpus ---
+class SyntheticCorpus:
+    """
+    Generates users, startups (with industries), projects (with technologies) and
+    posts with bulk_create, in batches so millions of rows never sit in memory at once.
+    A handful of entities get a planted rare word; those are the labelled expectations.
+    Every generated user has an e-mail at `domain`, which is how the corpus is removed again.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, labelled=50, domain='search-benchmark.example', log=print):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.labelled = labelled
+        self.domain = domain
+        self.log = log
+        self.planted = {} # rare word -> (search type, unique name used to resolve the id)
+        self.labels = {}  # rare word -> (search type, id)
+        self.phrases = [] # Verbatim snippets of generated post content, for 'long' queries
+
+    def _rare_word(self):
+        while True:
+            word = ''.join(self.rng.choice(SYLLABLES) for _ in range(4))
+            if word not in self.planted:
+                return word
+
+    def _plant_every(self, total):
+        """Row step between planted entities, so each type gets about a third of the labels."""
+        return max(1, total // max(1, self.labelled // 3))
+
+    def generate(self, users, startups, projects, posts):
+        industries = [Industry.objects.get_or_create(name=name)[0] for name in INDUSTRIES]
+        technologies = [Technology.objects.get_or_create(name=name)[0] for name in TECHNOLOGIES]
+
+        self._generate_users(users)
+        owner_ids = list(User.objects.filter(email__endswith=f'@{self.domain}').values_list('pk', flat=True))
+        self._generate_startups(startups, owner_ids, industries)
+        self._generate_projects(projects, owner_ids, technologies)
+        self._generate_posts(posts, owner_ids)
+        self._resolve_labels()
+        self._index()
+
+    def _index(self):
+        # bulk_create skips the signals, so enqueue the generated ids in bulk and drain
+        # the queue here rather than waiting for the Celery task
+        users = User.objects.filter(email__endswith=f'@{self.domain}')
+        mark_dirty('users', users.values_list('pk', flat=True).iterator(), schedule=False)
+        mark_dirty('startups', Startup.objects.filter(owner__in=users).values_list('pk', flat=True).iterator(), schedule=False)
+        mark_dirty('projects', Project.objects.filter(owner__in=users).values_list('pk', flat=True).iterator(), schedule=False)
+        drain_index_queue()
+        reset_search_index()
+
+    def _batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield range(start, min(total, start + self.batch_size))
+
+    def _generate_users(self, total):
+        step = self._plant_every(total)
+        for batch in self._batches(total):
+            rows = []
+            for i in batch:
+                last_name = self.rng.choice(LAST_NAMES)
+                if i % step == 0 and len(self.planted) < self.labelled:
+                    last_name = self._rare_word().title()
+                    self.planted[last_name.lower()] = ('users', f'bench{i}')
+                rows.append(User(
+                    username=f'bench{i}', email=f'bench{i}@{self.domain}', password='!',
+                    first_name=self.rng.choice(FIRST_NAMES), last_name=last_name,
+                ))
+            User.objects.bulk_create(rows, batch_size=self.batch_size)
+        # bulk_create bypasses post_save, so build the search documents directly
+        UserSearchDocument.rebuild(User.objects.filter(email__endswith=f'@{self.domain}'), batch_size=self.batch_size)
+        self.log(f"  {total} users")
+
+    def _generate_startups(self, total, owner_ids, industries):
+        step = self._plant_every(total)
+        for batch in self._batches(total):
+            rows = []
+            for i in batch:
+                name = f'{self.rng.choice(NAME_PARTS).title()}{self.rng.choice(NAME_PARTS)} {i}'
+                if i % step == 0 and len(self.planted) < self.labelled * 2 // 3:
+                    word = self._rare_word()
+                    name = f'{word.title()} Labs {i}'
+                    self.planted[word] = ('startups', name)
+                rows.append(Startup(
+                    owner_id=self.rng.choice(owner_ids), name=name, industry=self.rng.choice(industries),
+                    tagline=' '.join(self.rng.sample(WORDS, 3)), description=' '.join(self.rng.sample(WORDS, 12)),
+                    stage=self.rng.choice(Startup.STAGE_CHOICES)[0], website_url=f'https://{self.domain}/s/{i}',
+                ))
+            Startup.objects.bulk_create(rows, batch_size=self.batch_size)
+        self.log(f"  {total} startups")
+
+    def _generate_projects(self, total, owner_ids, technologies):
+        step = self._plant_every(total)
+        through = Project.technologies_used.through
+        for batch in self._batches(total):
+            rows = []
+            for i in batch:
+                title = f'{self.rng.choice(NAME_PARTS).title()} {self.rng.choice(WORDS)} {i}'
+                if i % step == 0 and len(self.planted) < self.labelled:
+                    word = self._rare_word()
+                    title = f'{word.title()} engine {i}'
+                    self.planted[word] = ('projects', title)
+                rows.append(Project(
+                    owner_id=self.rng.choice(owner_ids), title=title,
+                    description=' '.join(self.rng.sample(WORDS, 12)),
+                    status=self.rng.choice(Project.STATUS_CHOICES)[0],
+                    looking_for=self.rng.choice(Project.LOOKING_FOR_CHOICES)[0],
+                    link_to_repo=f'https://{self.domain}/p/{i}',
+                ))
+            created = Project.objects.bulk_create(rows, batch_size=self.batch_size)
+            if any(project.pk is None for project in created): # Backend can't return ids from bulk inserts
+                ids = dict(Project.objects.filter(title__in=[p.title for p in created]).values_list('title', 'pk'))
+                for project in created:
+                    project.pk = ids[project.title]
+            through.objects.bulk_create([
+                through(project_id=project.pk, technology_id=technology.pk)
+                for project in created
+                for technology in self.rng.sample(technologies, self.rng.randint(1, 4))
+            ], batch_size=self.batch_size)
+        self.log(f"  {total} projects")
+
+    def _generate_posts(self, total, owner_ids):
+        for batch in self._batches(total):
+            rows = []
+            for i in batch:
+                content = ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(5, 30)))
+                if len(self.phrases) < 200 and self.rng.random() < 0.05:
+                    self.phrases.append(' '.join(content.split()[:3]))
+                rows.append(Post(owner_id=self.rng.choice(owner_ids), content=content, link=f'https://{self.domain}/posts/{i}'))
+            Post.objects.bulk_create(rows, batch_size=self.batch_size)
+        self.log(f"  {total} posts")
+
+    def _resolve_labels(self):
+        by_type = {}
+        for word, (search_type, unique_name) in self.planted.items():
+            by_type.setdefault(search_type, {})[unique_name] = word
+        lookups = {
+            'users': (User.objects, 'username'),
+            'startups': (Startup.objects, 'name'),
+            'projects': (Project.objects, 'title'),
+        }
+        for search_type, names in by_type.items():
+            manager, field = lookups[search_type]
+            for name, pk in manager.filter(**{f'{field}__in': list(names)}).values_list(field, 'pk'):
+                self.labels[names[name]] = (search_type, pk)
+
+    def query_log(self, per_category=25):
+        """Short fragments, long phrases, planted rare words and typo'd rare words."""
+        rare_words = list(self.labels)
+        log = []
+        for _ in range(per_category):
+            log.append({'q': self.rng.choice(NAME_PARTS)[:3], 'category': 'short', 'expected': []})
+            if self.phrases:
+                log.append({'q': self.rng.choice(self.phrases), 'category': 'long', 'expected': []})
+        for word in rare_words[:per_category]:
+            log.append({'q': word, 'category': 'rare', 'expected': [self.labels[word]]})
+            log.append({'q': make_typo(self.rng, word), 'category': 'typo', 'expected': [self.labels[word]]})
+        return log
+
+    def delete(self):
+        """Removes the generated rows (everything hangs off the generated users)."""
+        users = User.objects.filter(email__endswith=f'@{self.domain}')
+        user_ids = list(users.values_list('pk', flat=True))
+        startup_ids = list(Startup.objects.filter(owner__in=users).values_list('pk', flat=True))
+        project_ids = list(Project.objects.filter(owner__in=users).values_list('pk', flat=True))
+        Post.objects.filter(owner__in=users).delete()
+        Project.objects.filter(owner__in=users).delete()
+        Startup.objects.filter(owner__in=users).delete()
+        users.delete()
+        # The cascades above bypass the per-row signals for most rows; tombstone them in bulk
+        mark_dirty('users', user_ids, schedule=False)
+        mark_dirty('startups', startup_ids, schedule=False)
+        mark_dirty('projects', project_ids, schedule=False)
+        drain_index_queue()
+        reset_search_index()
+
+
+# --- Backends ---
+_factory = RequestFactory()
+
+def _run_sequential(query):
+    return GlobalSearchAPIView.as_view()(_factory.get('/api/search/', {'q': query})).data
+
+def _run_async(query):
+    response = async_to_sync(async_global_search_view)(_factory.get('/api/search/async/', {'q': query}))
+    return json.loads(response.content)
+
+def _run_fuzzy(query):
+    return {
+        search_type: SEARCH_TYPES[search_type][1](fuzzy_search(search_type, query), many=True).data
+        for search_type in FUZZY_KINDS
+    }
+
+# Every runnable search backend: name -> callable(query) returning {search type: [rows]}
+SEARCH_BACKENDS = {
+    'sequential': _run_sequential,
+    'async': _run_async,
+    'fuzzy': _run_fuzzy,
+}
+
+
+# --- Measurement ---
+class QueryCounter:
+    """
+    Counts SQL statements on every connection, including the ones worker threads
+    open for the async view (CaptureQueriesContext only sees the calling thread).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def _attach(self, sender, connection, **kwargs):
+        connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        connection.ensure_connection()
+        connection.execute_wrappers.append(self)
+        connection_created.connect(self._attach)
+        return self
+
+    def __exit__(self, *exc_info):
+        connection_created.disconnect(self._attach)
+        if self in connection.execute_wrappers:
+            connection.execute_wrappers.remove(self)
+
+
+def relevance(results, expected, k=10):
+    """Reciprocal rank, recall@k and success@1 of the expected (type, id) pairs."""
+    ranks = []
+    for search_type, pk in expected:
+        ids = [row['id'] for row in results.get(search_type, [])]
+        ranks.append(ids.index(pk) + 1 if pk in ids else None)
+    found = [rank for rank in ranks if rank is not None]
+    return {
+        'reciprocal_rank': 1 / min(found) if found else 0.0,
+        'recall_at_k': sum(1 for rank in found if rank <= k) / len(expected),
+        'success_at_1': 1.0 if 1 in found else 0.0,
+    }
+
+
+def run_backend(name, query_log):
+    """Replays the query log against one backend and returns the per-query measurements."""
+    backend = SEARCH_BACKENDS[name]
+    get_search_index() # Build the fuzzy index up front so it isn't billed to the first query
+    measurements = []
+    for entry in query_log:
+        with QueryCounter() as counter:
+            start = time.perf_counter()
+            results = backend(entry['q'])
+            elapsed = time.perf_counter() - start
+        measurement = {
+            'category': entry['category'],
+            'seconds': elapsed,
+            'queries': counter.count,
+            'results': sum(len(rows) for key, rows in results.items() if key in SEARCH_TYPES),
+        }
+        if entry['expected']:
+            measurement.update(relevance(results, [tuple(pair) for pair in entry['expected']]))
+        measurements.append(measurement)
+    return measurements
+
+
+def summarize(measurements):
+    """Latency percentiles, queries per request, result sizes and relevance, overall and per category."""
+    groups = {'all': measurements}
+    for category in QUERY_CATEGORIES:
+        rows = [m for m in measurements if m['category'] == category]
+        if rows:
+            groups[category] = rows
+
+    summary = {}
+    for group, rows in groups.items():
+        seconds = [m['seconds'] for m in rows]
+        stats = {
+            'count': len(rows),
+            'p50_ms': percentile(seconds, 50) * 1000,
+            'p95_ms': percentile(seconds, 95) * 1000,
+            'p99_ms': percentile(seconds, 99) * 1000,
+            'queries_mean': statistics.mean(m['queries'] for m in rows),
+            'queries_max': max(m['queries'] for m in rows),
+            'results_mean': statistics.mean(m['results'] for m in rows),
+        }
+        labelled = [m for m in rows if 'reciprocal_rank' in m]
+        if labelled:
+            stats['mrr'] = statistics.mean(m['reciprocal_rank'] for m in labelled)
+            stats['recall_at_10'] = statistics.mean(m['recall_at_k'] for m in labelled)
+            stats['success_at_1'] = statistics.mean(m['success_at_1'] for m in labelled)
+        summary[group] = stats
+    return summary
@@ -0,0 +1,127 @@
+# my_entrepreneur_platform/search/index.py
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from startups.models import Startup
+from projects.models import Project
+from .models import SearchEntry
+from .trigram import TrigramIndex
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+# Entity types covered by fuzzy matching. Posts have no names, titles or tags,
+# so they stay on plain substring matching.
+FUZZY_KINDS = ('users', 'startups', 'projects')
+
+_index = None
+_watermark = None  # Highest SearchEntry.change_id applied to _index
+_checked_at = 0.0  # time.monotonic() of the last sync
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """
+    Returns this process's trigram index. It is built from SearchEntry on first use,
+    then pulls entries changed by the indexing task at most every
+    SEARCH_INDEX_SYNC_INTERVAL seconds.
+    """
+    global _index, _checked_at
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = TrigramIndex(
+                    FUZZY_KINDS,
+                    threshold=settings.SEARCH_TRIGRAM_THRESHOLD,
+                    max_terms_per_word=settings.SEARCH_TRIGRAM_MAX_TERMS,
+                )
+                _sync(index)
+                _index = index
+    elif time.monotonic() - _checked_at > settings.SEARCH_INDEX_SYNC_INTERVAL:
+        if _index_lock.acquire(blocking=False): # Another thread is already syncing
+            try:
+                _sync(_index)
+            finally:
+                _index_lock.release()
+    return _index
+
+def _sync(index):
+    global _watermark, _checked_at
+    entries = SearchEntry.objects.filter(entity_type__in=FUZZY_KINDS)
+    if _watermark is None:
+        entries = entries.filter(deleted=False) # Initial build: tombstones have nothing to remove
+    else:
+        entries = entries.filter(change_id__gt=_watermark)
+    rows = entries.values_list('entity_type', 'object_id', 'text', 'deleted', 'change_id')
+    for entity_type, object_id, text, deleted, change_id in rows.iterator(chunk_size=5000):
+        if deleted:
+            index.remove(entity_type, object_id)
+        else:
+            index.add(entity_type, object_id, text)
+        if _watermark is None or change_id > _watermark:
+            _watermark = change_id
+    _checked_at = time.monotonic()
+
+def warm_search_index():
+    """
+    Builds this process's index in a background thread, so the first searches
+    do not wait for the initial build. Called by the ASGI/WSGI entry points
+    when SEARCH_INDEX_WARM_ON_STARTUP is on.
+    """
+    def build():
+        try:
+            get_search_index()
+        except Exception:
+            logger.exception("Could not warm the search index.") # The first lookup builds it instead
+        finally:
+            connection.close() # A thread of our own never sees request_finished
+
+    threading.Thread(target=build, name='search-index-warmup', daemon=True).start()
+
+def reset_search_index():
+    """Drops this process's index so the next lookup rebuilds it from SearchEntry."""
+    global _index, _watermark
+    with _index_lock:
+        _index = None
+        _watermark = None
+
+
+# --- Indexed text per entity type ---
+def _user_texts(ids):
+    rows = User.objects.filter(pk__in=ids).values_list('pk', 'username', 'first_name', 'last_name')
+    return {pk: texts for pk, *texts in rows}
+
+def _startup_texts(ids):
+    rows = Startup.objects.filter(pk__in=ids).values_list('pk', 'name', 'industry__name')
+    return {pk: texts for pk, *texts in rows}
+
+def _project_texts(ids):
+    texts = {pk: [title] for pk, title in Project.objects.filter(pk__in=ids).values_list('pk', 'title')}
+    # Technologies (the project's tags) come from the M2M table in one query
+    through = Project.technologies_used.through.objects.filter(project_id__in=ids)
+    for project_id, name in through.values_list('project_id', 'technology__name'):
+        if project_id in texts:
+            texts[project_id].append(name)
+    return texts
+
+TEXT_LOADERS = {
+    'users': _user_texts,
+    'startups': _startup_texts,
+    'projects': _project_texts,
+}
+
+def load_texts(entity_type, ids):
+    """
+    Returns {id: indexed text} for a batch of one entity type, in one or two queries.
+    Ids that no longer exist are left out.
+    """
+    return {
+        pk: ' '.join(text for text in texts if text)
+        for pk, texts in TEXT_LOADERS[entity_type](ids).items()
+    }
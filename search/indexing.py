@@ -0,0 +1,135 @@
+# my_entrepreneur_platform/search/indexing.py
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .index import load_texts
+from .models import IndexQueueEntry, SearchChangeSequence, SearchEntry
+
+logger = logging.getLogger(__name__)
+
+# Set while a flush task is pending, so a burst of writes schedules only one task
+FLUSH_SCHEDULED_KEY = 'search:index-flush-scheduled'
+# How long tombstones for deleted entities are kept for processes to pick them up
+TOMBSTONE_RETENTION = timedelta(days=1)
+
+
+def mark_dirty(entity_type, object_ids, schedule=True):
+    """
+    Records that these entities need re-indexing. This is all a write pays for search:
+    one upsert per SEARCH_INDEX_BATCH_SIZE ids (repeat changes coalesce on the
+    unique key) plus, for the first write in a debounce window, scheduling the flush task.
+    """
+    now = timezone.now()
+    batch = []
+    for object_id in object_ids:
+        batch.append(IndexQueueEntry(entity_type=entity_type, object_id=object_id, dirtied_at=now))
+        if len(batch) >= settings.SEARCH_INDEX_BATCH_SIZE:
+            _enqueue(batch)
+            batch = []
+    if batch:
+        _enqueue(batch)
+    if schedule:
+        schedule_flush()
+
+def _enqueue(entries):
+    IndexQueueEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=['entity_type', 'object_id'],
+        update_fields=['dirtied_at'],
+    )
+
+def mark_dirty_on_commit(entity_type, object_ids):
+    """
+    For signal handlers: enqueue once the write has committed, so the indexing task
+    can never read the row before the change is visible.
+    """
+    object_ids = list(object_ids)
+    transaction.on_commit(lambda: mark_dirty(entity_type, object_ids))
+
+def schedule_flush():
+    # The flag expires after SEARCH_INDEX_MAX_STALENESS, so a lost task can't stall indexing
+    if not cache.add(FLUSH_SCHEDULED_KEY, True, timeout=settings.SEARCH_INDEX_MAX_STALENESS):
+        return
+    from .tasks import process_index_queue
+    try:
+        process_index_queue.apply_async(countdown=settings.SEARCH_INDEX_DEBOUNCE)
+    except Exception:
+        # Never fail the user's write because the broker is unavailable; the entries
+        # stay queued for the next flush (or the periodic one in CELERY_BEAT_SCHEDULE)
+        cache.delete(FLUSH_SCHEDULED_KEY)
+        logger.exception("Could not schedule the search index flush.")
+
+
+def process_batch(batch_size=None):
+    """
+    Re-indexes the oldest dirty entities: one query per entity type to load them,
+    one upsert into SearchEntry and one delete from the queue.
+    Returns the number of entities processed.
+    """
+    batch_size = batch_size or settings.SEARCH_INDEX_BATCH_SIZE
+    started = timezone.now()
+    entries = list(
+        IndexQueueEntry.objects.order_by('enqueued_at').values_list('pk', 'entity_type', 'object_id')[:batch_size]
+    )
+    if not entries:
+        return 0
+
+    ids_by_type = defaultdict(list)
+    for _pk, entity_type, object_id in entries:
+        ids_by_type[entity_type].append(object_id)
+
+    search_entries = []
+    for entity_type, ids in ids_by_type.items():
+        texts = load_texts(entity_type, ids)
+        for object_id in ids:
+            text = texts.get(object_id)
+            search_entries.append(SearchEntry(
+                entity_type=entity_type, object_id=object_id,
+                text=text or '', deleted=text is None, updated_at=started,
+            ))
+
+    with transaction.atomic():
+        first_change_id = SearchChangeSequence.allocate(len(search_entries)) # Held until commit
+        for offset, search_entry in enumerate(search_entries):
+            search_entry.change_id = first_change_id + offset
+        SearchEntry.objects.bulk_create(
+            search_entries,
+            update_conflicts=True,
+            unique_fields=['entity_type', 'object_id'],
+            update_fields=['text', 'deleted', 'updated_at', 'change_id'],
+        )
+        # Entries dirtied again after this batch started stay queued for the next one
+        IndexQueueEntry.objects.filter(pk__in=[pk for pk, *_ in entries], dirtied_at__lte=started).delete()
+    return len(entries)
+
+def drain_index_queue():
+    """Processes batches until the queue is empty. Returns the number of entities processed."""
+    processed = 0
+    while True:
+        count = process_batch()
+        if not count:
+            break
+        processed += count
+    SearchEntry.objects.filter(deleted=True, updated_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+    return processed
+
+
+def index_backlog():
+    """Backlog metric: queued entities and how long the oldest has waited, against the staleness bound."""
+    stats = IndexQueueEntry.objects.aggregate(pending=Count('pk'), oldest=Min('enqueued_at'))
+    oldest_age = (timezone.now() - stats['oldest']).total_seconds() if stats['oldest'] else 0.0
+    return {
+        'pending': stats['pending'],
+        'oldest_age_seconds': round(oldest_age, 3),
+        'max_staleness_seconds': settings.SEARCH_INDEX_MAX_STALENESS,
+        'over_staleness_bound': oldest_age > settings.SEARCH_INDEX_MAX_STALENESS,
+    }
@@ -0,0 +1,106 @@
+# my_entrepreneur_platform/search/management/commands/benchmark_async_search.py
+
+import json
+import statistics
+import time
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from users.models import UserSearchDocument
+from startups.models import Industry, Startup
+from projects.models import Technology, Project
+from content.models import Post
+from search.views import GlobalSearchAPIView, async_global_search_view
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway dataset and compares the latency of the sequential "
+        "GlobalSearchAPIView against the concurrent async search view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help="Rows seeded per entity type.")
+        parser.add_argument('--iterations', type=int, default=20, help="Timed requests per view.")
+        parser.add_argument('--prefix', default='benchsearch', help="Marker used for seeded rows and as the query.")
+        parser.add_argument('--keep-data', action='store_true', help="Leave the seeded rows in the database.")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        self.seed(prefix, options['rows'])
+        try:
+            factory = RequestFactory()
+            sync_view = GlobalSearchAPIView.as_view()
+            run_async_view = async_to_sync(async_global_search_view)
+
+            sync_timings = self.time_view(lambda: sync_view(factory.get('/api/search/', {'q': prefix})), options['iterations'])
+            async_timings = self.time_view(lambda: run_async_view(factory.get('/api/search/async/', {'q': prefix})), options['iterations'])
+
+            self.report("sequential", sync_timings)
+            self.report("concurrent", async_timings)
+            response = run_async_view(factory.get('/api/search/async/', {'q': prefix}))
+            partial = [search_type for search_type, flag in json.loads(response.content)['partial'].items() if flag]
+            self.stdout.write(f"Types over budget: {', '.join(partial) or 'none'}")
+            speedup = statistics.median(sync_timings) / statistics.median(async_timings)
+            self.stdout.write(self.style.SUCCESS(f"Median speedup: {speedup:.2f}x"))
+        finally:
+            if not options['keep_data']:
+                self.cleanup(prefix)
+
+    def seed(self, prefix, rows):
+        self.stdout.write(f"Seeding {rows} rows per type with marker '{prefix}'...")
+        User.objects.bulk_create(
+            [User(username=f'{prefix}_user_{i}', email=f'{prefix}{i}@example.com') for i in range(rows)],
+            batch_size=1000
+        )
+        seeded_users = User.objects.filter(username__startswith=f'{prefix}_user_')
+        UserSearchDocument.rebuild(seeded_users) # bulk_create skips the post_save signals
+        owners = list(seeded_users[:100])
+        industry, _ = Industry.objects.get_or_create(name=f'{prefix} industry')
+        technology, _ = Technology.objects.get_or_create(name=f'{prefix} technology')
+
+        Startup.objects.bulk_create(
+            [Startup(owner=owners[i % len(owners)], name=f'{prefix} startup {i}', description=f'{prefix} description', industry=industry)
+             for i in range(rows)],
+            batch_size=1000
+        )
+        Project.objects.bulk_create(
+            [Project(owner=owners[i % len(owners)], title=f'{prefix} project {i}', description=f'{prefix} description')
+             for i in range(rows)],
+            batch_size=1000
+        )
+        technology.projects.add(*Project.objects.filter(title__startswith=f'{prefix} project '))
+        Post.objects.bulk_create(
+            [Post(owner=owners[i % len(owners)], content=f'{prefix} post {i}') for i in range(rows)],
+            batch_size=1000
+        )
+
+    def time_view(self, call, iterations):
+        call() # Warm-up request, not timed
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{label:>10}: median {statistics.median(timings) * 1000:.1f} ms, "
+            f"p95 {p95 * 1000:.1f} ms, mean {statistics.mean(timings) * 1000:.1f} ms"
+        )
+
+    def cleanup(self, prefix):
+        Post.objects.filter(content__startswith=f'{prefix} post ').delete()
+        Project.objects.filter(title__startswith=f'{prefix} project ').delete()
+        Startup.objects.filter(name__startswith=f'{prefix} startup ').delete()
+        Technology.objects.filter(name=f'{prefix} technology').delete()
+        Industry.objects.filter(name=f'{prefix} industry').delete()
+        User.objects.filter(username__startswith=f'{prefix}_user_').delete()
@@ -0,0 +1,74 @@
+# my_entrepreneur_platform/search/management/commands/benchmark_search.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.benchmarks import SEARCH_BACKENDS, SyntheticCorpus, run_backend, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic corpus, replays a query log of short, long, rare and typo'd "
+        "terms against each search backend, and reports latency percentiles, queries per "
+        "request, result sizes and relevance against the labelled expectations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000)
+        parser.add_argument('--startups', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows per bulk_create call.")
+        parser.add_argument('--labelled', type=int, default=50, help="Entities given a planted rare word.")
+        parser.add_argument('--queries-per-category', type=int, default=25)
+        parser.add_argument('--backends', nargs='+', choices=sorted(SEARCH_BACKENDS), default=list(SEARCH_BACKENDS))
+        parser.add_argument('--query-log', help="Replay this JSON query log instead of the generated one.")
+        parser.add_argument('--save-query-log', help="Write the replayed query log to this path.")
+        parser.add_argument('--json', dest='json_output', help="Write the summary as JSON to this path.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--keep-data', action='store_true', help="Leave the generated corpus in the database.")
+
+    def handle(self, *args, **options):
+        corpus = SyntheticCorpus(
+            seed=options['seed'], batch_size=options['batch_size'], labelled=options['labelled'],
+            log=self.stdout.write,
+        )
+        self.stdout.write("Generating corpus...")
+        try:
+            corpus.generate(options['users'], options['startups'], options['projects'], options['posts'])
+
+            if options['query_log']:
+                with open(options['query_log']) as log_file:
+                    query_log = json.load(log_file)
+            else:
+                query_log = corpus.query_log(options['queries_per_category'])
+            if not query_log:
+                raise CommandError("The query log is empty.")
+            if options['save_query_log']:
+                with open(options['save_query_log'], 'w') as log_file:
+                    json.dump(query_log, log_file, indent=2)
+
+            summaries = {}
+            for backend in options['backends']:
+                summaries[backend] = summarize(run_backend(backend, query_log))
+                self.report(backend, summaries[backend])
+
+            if options['json_output']:
+                with open(options['json_output'], 'w') as json_file:
+                    json.dump(summaries, json_file, indent=2)
+        finally:
+            if not options['keep_data']:
+                corpus.delete()
+
+    def report(self, backend, summary):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{backend}"))
+        for group, stats in summary.items():
+            line = (
+                f"  {group:>6} ({stats['count']:>3}): p50 {stats['p50_ms']:7.1f} ms  p95 {stats['p95_ms']:7.1f} ms  "
+                f"p99 {stats['p99_ms']:7.1f} ms  queries {stats['queries_mean']:5.1f} (max {stats['queries_max']})  "
+                f"results {stats['results_mean']:6.1f}"
+            )
+            if 'mrr' in stats:
+                line += f"  MRR {stats['mrr']:.2f}  recall@10 {stats['recall_at_10']:.2f}  success@1 {stats['success_at_1']:.2f}"
+            self.stdout.write(line)
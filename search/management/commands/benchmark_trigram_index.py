@@ -0,0 +1,81 @@
+# my_entrepreneur_platform/search/management/commands/benchmark_trigram_index.py
+
+import random
+import resource
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from search.benchmarks import make_typo
+from search.index import FUZZY_KINDS
+from search.trigram import TrigramIndex
+
+SYLLABLES = [
+    'ka', 'lo', 'mi', 'nu', 'pe', 'ra', 'si', 'to', 'va', 'zen', 'tri', 'flo', 'gra', 'pix',
+    'bit', 'cor', 'dex', 'fin', 'gen', 'hub', 'io', 'lab', 'ly', 'max', 'net', 'ops', 'qua', 'sys',
+]
+TAGS = [
+    'python', 'django', 'react', 'kubernetes', 'postgres', 'fintech', 'healthcare', 'edtech',
+    'blockchain', 'machine', 'learning', 'analytics', 'logistics', 'payments', 'security',
+    'marketplace', 'robotics', 'climate', 'energy', 'insurance', 'gaming', 'biotech', 'agritech',
+]
+
+
+def make_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+class Command(BaseCommand):
+    help = "Measures trigram index build time, memory and fuzzy query latency on synthetic corpora."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000], help="Entity counts to benchmark.")
+        parser.add_argument('--queries', type=int, default=500, help="Typo'd queries replayed per corpus.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        for size in sorted(options['sizes']):
+            self.benchmark(size, options['queries'], random.Random(options['seed']))
+
+    def benchmark(self, size, query_count, rng):
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        index = TrigramIndex(
+            FUZZY_KINDS,
+            threshold=settings.SEARCH_TRIGRAM_THRESHOLD,
+            max_terms_per_word=settings.SEARCH_TRIGRAM_MAX_TERMS,
+        )
+        names = []
+        start = time.perf_counter()
+        for pk in range(size):
+            name = f'{make_word(rng)} {make_word(rng)}'
+            names.append(name)
+            index.add(FUZZY_KINDS[pk % len(FUZZY_KINDS)], pk, name, *rng.sample(TAGS, 2))
+        build_seconds = time.perf_counter() - start
+        rss_growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+        queries = [make_typo(rng, rng.choice(names).split()[0]) for _ in range(query_count)]
+        search_timings, suggest_timings = [], []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, limit=settings.SEARCH_FUZZY_LIMIT)
+            search_timings.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            index.suggest(query)
+            suggest_timings.append(time.perf_counter() - start)
+
+        self.stdout.write(
+            f"{size:>9,} entities: build {build_seconds:.1f} s, "
+            f"peak RSS growth {rss_growth_mb:.0f} MB, vocabulary {len(index._terms):,} words"
+        )
+        self.report('search', search_timings)
+        self.report('suggest', suggest_timings)
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[int(len(timings) * 0.95)]
+        self.stdout.write(
+            f"    {label:>7}: p50 {statistics.median(timings) * 1000:.2f} ms, "
+            f"p95 {p95 * 1000:.2f} ms, max {timings[-1] * 1000:.2f} ms"
+        )
@@ -0,0 +1,32 @@
+# my_entrepreneur_platform/search/management/commands/rebuild_search_index.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from startups.models import Startup
+from projects.models import Project
+from search.indexing import mark_dirty, drain_index_queue
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Enqueues every user, startup and project for re-indexing (first deploy, or after "
+        "a bulk import that bypassed the signals) and drains the queue in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--async', dest='use_celery', action='store_true',
+                            help="Leave the queue to the Celery flush task instead of draining it here.")
+
+    def handle(self, *args, **options):
+        schedule = options['use_celery']
+        mark_dirty('users', User.objects.values_list('pk', flat=True).iterator(), schedule=schedule)
+        mark_dirty('startups', Startup.objects.values_list('pk', flat=True).iterator(), schedule=schedule)
+        mark_dirty('projects', Project.objects.values_list('pk', flat=True).iterator(), schedule=schedule)
+        if schedule:
+            self.stdout.write(self.style.SUCCESS("Enqueued all entities; the Celery flush task will index them."))
+        else:
+            processed = drain_index_queue()
+            self.stdout.write(self.style.SUCCESS(f"Re-indexed {processed} entities."))
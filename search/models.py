@@ -1,3 +1,66 @@
+# my_entrepreneur_platform/search/models.py
+
 from django.db import models
 
-# Create your models here.
+
+class IndexQueueEntry(models.Model):
+    """
+    An entity whose search index entry is out of date. Repeated changes to the same
+    entity coalesce into one row until the indexing task processes it.
+    """
+    entity_type = models.CharField(max_length=20) # A search type, e.g. 'startups'
+    object_id = models.PositiveBigIntegerField()
+    # First time the entity was marked dirty (drives the backlog/staleness metric)
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    # Last time it was marked dirty; a row dirtied again mid-batch is kept for the next batch
+    dirtied_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Index Queue Entries"
+        unique_together = ('entity_type', 'object_id')
+        indexes = [models.Index(fields=['enqueued_at'])]
+
+    def __str__(self):
+        return f"{self.entity_type} #{self.object_id} (queued {self.enqueued_at:%H:%M:%S})"
+
+
+class SearchEntry(models.Model):
+    """
+    The indexed text of one entity, written in batches by the indexing task.
+    Each process's in-memory trigram index is built from, and kept in sync with, this table.
+    """
+    entity_type = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    text = models.TextField(blank=True) # Names, titles and tags, space-joined
+    deleted = models.BooleanField(default=False) # Tombstone so other processes drop the entity too
+    updated_at = models.DateTimeField(db_index=True) # For tombstone retention
+    # Position in SearchChangeSequence order: processes sync by reading change_id past their watermark
+    change_id = models.PositiveBigIntegerField(default=0, db_index=True)
+
+    class Meta:
+        verbose_name_plural = "Search Entries"
+        unique_together = ('entity_type', 'object_id')
+
+    def __str__(self):
+        return f"{self.entity_type} #{self.object_id}"
+
+
+class SearchChangeSequence(models.Model):
+    """
+    A single row holding the last change_id handed out to SearchEntry writes.
+    Writers lock it for the rest of their transaction, so change ids become
+    visible in increasing order and a watermark never skips a committed entry.
+    """
+    last_change_id = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls, count):
+        """Reserves `count` change ids (call inside the writing transaction). Returns the first."""
+        sequence, _ = cls.objects.select_for_update().get_or_create(pk=1)
+        first = sequence.last_change_id + 1
+        sequence.last_change_id += count
+        sequence.save(update_fields=['last_change_id'])
+        return first
+
+    def __str__(self):
+        return f"Search change #{self.last_change_id}"
@@ -0,0 +1,78 @@
+# my_entrepreneur_platform/search/queries.py
+
+from django.conf import settings
+from django.db.models import Q # For OR queries
+
+from users.models import UserSearchDocument
+from startups.models import Startup
+from projects.models import Project
+from content.models import Post
+
+from .index import FUZZY_KINDS, get_search_index
+from .serializers import (
+    UserSearchSerializer, StartupSearchSerializer,
+    ProjectSearchSerializer, PostSearchSerializer
+)
+
+
+# --- Per-type lookups ---
+# Each function returns the queryset of matches for one entity type, so the
+# sync and async search views run exactly the same SQL.
+
+def search_users(query):
+    # One query against the denormalized documents; also matches profile bio and location
+    return UserSearchDocument.objects.filter(search_text__contains=query.lower())
+
+def search_startups(query):
+    return Startup.objects.filter(
+        Q(name__icontains=query) |
+        Q(tagline__icontains=query) |
+        Q(description__icontains=query) |
+        Q(industry__name__icontains=query) # Search by industry name
+    ).select_related('industry').distinct()
+
+def search_projects(query):
+    return Project.objects.filter(
+        Q(title__icontains=query) |
+        Q(tagline__icontains=query) |
+        Q(description__icontains=query) |
+        Q(technologies_used__name__icontains=query) # Search by technology name
+    ).select_related('owner').distinct()
+
+def search_posts(query):
+    return Post.objects.filter(
+        Q(content__icontains=query) |
+        Q(owner__username__icontains=query) # Search by post content or owner username
+    ).select_related('owner').distinct()
+
+
+# Result key -> (lookup function, serializer), in response order
+SEARCH_TYPES = {
+    'users': (search_users, UserSearchSerializer),
+    'startups': (search_startups, StartupSearchSerializer),
+    'projects': (search_projects, ProjectSearchSerializer),
+    'posts': (search_posts, PostSearchSerializer),
+}
+
+
+# Querysets used to hydrate fuzzy candidates (by primary key) for each fuzzy-indexed type
+FUZZY_QUERYSETS = {
+    'users': lambda: UserSearchDocument.objects.all(), # Keyed by user id
+    'startups': lambda: Startup.objects.select_related('industry'),
+    'projects': lambda: Project.objects.select_related('owner'),
+}
+
+def fuzzy_search(search_type, query):
+    """
+    Typo-tolerant fallback: the best trigram-index candidates for one type, capped
+    at SEARCH_FUZZY_LIMIT and hydrated in a single query, best match first.
+    Returns an empty list for types that are not fuzzy-indexed.
+    """
+    if search_type not in FUZZY_KINDS:
+        return []
+    candidates = get_search_index().search(query, kind=search_type, limit=settings.SEARCH_FUZZY_LIMIT)
+    objects = FUZZY_QUERYSETS[search_type]().in_bulk([pk for pk, _kind, _score in candidates])
+    return [objects[pk] for pk, _kind, _score in candidates if pk in objects]
+
+def did_you_mean(query):
+    return get_search_index().suggest(query)
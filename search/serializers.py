@@ -2,47 +2,49 @@
 
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from users.models import UserProfile
+from users.models import UserSearchDocument
 from startups.models import Startup, Industry
 from projects.models import Project, Technology
 from content.models import Post
+from media.serializers import VariantsField
 
 # Re-using/simplifying basic serializers for search results
 User = get_user_model()
 
-class UserSearchSerializer(serializers.ModelSerializer):
-    profile = serializers.SerializerMethodField() # Nest profile info
+class UserProfileSearchSerializer(serializers.ModelSerializer):
+    variants = VariantsField(source='profile_picture_variants')
 
     class Meta:
-        model = User
-        fields = ['id', 'username', 'first_name', 'last_name', 'profile']
+        model = UserSearchDocument
+        fields = ['bio', 'location', 'profile_picture', 'variants'] # Just a few fields for search
 
-    def get_profile(self, obj):
-        try:
-            return UserProfileSearchSerializer(obj.userprofile).data
-        except UserProfile.DoesNotExist:
-            return None
+class UserSearchSerializer(serializers.ModelSerializer):
+    # Reads straight off the denormalized search document, so no per-user profile query
+    id = serializers.IntegerField(source='user_id', read_only=True)
+    profile = UserProfileSearchSerializer(source='*', read_only=True) # Nest profile info
 
-class UserProfileSearchSerializer(serializers.ModelSerializer):
     class Meta:
-        model = UserProfile
-        fields = ['bio', 'location', 'profile_picture'] # Just a few fields for search
+        model = UserSearchDocument
+        fields = ['id', 'username', 'first_name', 'last_name', 'profile']
 
 class StartupSearchSerializer(serializers.ModelSerializer):
     industry_name = serializers.CharField(source='industry.name', read_only=True) # Display industry name
+    variants = VariantsField(source='logo_variants')
 
     class Meta:
         model = Startup
-        fields = ['id', 'name', 'tagline', 'description', 'industry_name', 'stage', 'logo']
+        fields = ['id', 'name', 'tagline', 'description', 'industry_name', 'stage', 'logo', 'variants']
 
 class ProjectSearchSerializer(serializers.ModelSerializer):
     owner_username = serializers.CharField(source='owner.username', read_only=True)
+    variants = VariantsField(source='project_logo_variants')
     class Meta:
         model = Project
-        fields = ['id', 'title', 'tagline', 'description', 'status', 'owner_username', 'project_logo']
+        fields = ['id', 'title', 'tagline', 'description', 'status', 'owner_username', 'project_logo', 'variants']
 
 class PostSearchSerializer(serializers.ModelSerializer):
     owner_username = serializers.CharField(source='owner.username', read_only=True)
+    variants = VariantsField(source='image_variants')
     class Meta:
         model = Post
-        fields = ['id', 'content', 'post_type', 'owner_username', 'image', 'link']
\ No newline at end of file
+        fields = ['id', 'content', 'post_type', 'owner_username', 'image', 'variants', 'link']
\ No newline at end of file
@@ -0,0 +1,50 @@
+# my_entrepreneur_platform/search/signals.py
+
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from startups.models import Industry, Startup
+from projects.models import Technology, Project
+from .indexing import mark_dirty_on_commit
+
+# Writes only enqueue the changed ids; the indexing task (search.tasks) does the
+# actual re-indexing in batches. Deletes are enqueued too: the task finds the row
+# gone and writes a tombstone.
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def enqueue_user(sender, instance, **kwargs):
+    mark_dirty_on_commit('users', [instance.pk])
+
+@receiver(post_save, sender=Startup)
+@receiver(post_delete, sender=Startup)
+def enqueue_startup(sender, instance, **kwargs):
+    mark_dirty_on_commit('startups', [instance.pk])
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def enqueue_project(sender, instance, **kwargs):
+    mark_dirty_on_commit('projects', [instance.pk])
+
+@receiver(m2m_changed, sender=Project.technologies_used.through)
+def enqueue_project_technologies(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            mark_dirty_on_commit('projects', [instance.pk])
+    elif action == 'pre_clear':
+        # A technology is being cleared from all its projects; post_clear can't see them any more
+        mark_dirty_on_commit('projects', instance.projects.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        mark_dirty_on_commit('projects', pk_set)
+
+# Industry and technology names are part of the indexed text of startups and projects
+@receiver(post_save, sender=Industry)
+@receiver(pre_delete, sender=Industry)
+def enqueue_industry_startups(sender, instance, **kwargs):
+    mark_dirty_on_commit('startups', instance.startups.values_list('pk', flat=True))
+
+@receiver(post_save, sender=Technology)
+@receiver(pre_delete, sender=Technology)
+def enqueue_technology_projects(sender, instance, **kwargs):
+    mark_dirty_on_commit('projects', instance.projects.values_list('pk', flat=True))
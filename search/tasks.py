@@ -0,0 +1,26 @@
+# my_entrepreneur_platform/search/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from django.core.cache import cache
+
+from .indexing import FLUSH_SCHEDULED_KEY, drain_index_queue, index_backlog
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def process_index_queue(self):
+    """
+    Drains the search index queue in batches of SEARCH_INDEX_BATCH_SIZE.
+    Scheduled (debounced) by the first write after the previous flush, and
+    periodically via CELERY_BEAT_SCHEDULE as a safety net.
+    """
+    backlog = index_backlog()
+    if backlog['over_staleness_bound']:
+        logger.warning(f"Search index backlog is over its staleness bound: {backlog}")
+    # Clear the flag first: writes from here on schedule a fresh flush rather than being missed
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    processed = drain_index_queue()
+    logger.info(f"Task {self.request.id} completed: re-indexed {processed} entities (backlog before run: {backlog['pending']})")
+    return processed
@@ -1,3 +1,106 @@
-from django.test import TestCase
+import json
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from projects.models import Project
+from startups.models import Startup
+from .index import get_search_index, reset_search_index
+from .indexing import mark_dirty, process_batch
+from .models import SearchEntry
+from .queries import SEARCH_TYPES
+from .views import async_global_search_view
+
+User = get_user_model()
+
+
+@override_settings(SEARCH_INDEX_SYNC_INTERVAL=-1) # Sync on every lookup
+class SearchIndexSyncTests(TestCase):
+    def setUp(self):
+        reset_search_index()
+        self.addCleanup(reset_search_index)
+
+    def index_user(self, username):
+        user = User.objects.create_user(username=username, password='x')
+        mark_dirty('users', [user.pk], schedule=False)
+        process_batch()
+        return user
+
+    def found(self, query):
+        return [pk for pk, kind, _score in get_search_index().search(query, kind='users')]
+
+    def test_entries_are_numbered_in_write_order(self):
+        first = self.index_user('marguerite')
+        second = self.index_user('bartholomew')
+        change_ids = dict(SearchEntry.objects.values_list('object_id', 'change_id'))
+        self.assertLess(change_ids[first.pk], change_ids[second.pk])
+
+    def test_sync_does_not_depend_on_timestamps(self):
+        first = self.index_user('marguerite')
+        self.assertEqual(self.found('marguerite'), [first.pk])
+
+        # An entry stamped well before the watermark's timestamp (a slow batch) is still picked up
+        second = self.index_user('bartholomew')
+        SearchEntry.objects.filter(object_id=second.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.found('bartholomew'), [second.pk])
+
+    def test_deletions_reach_the_index(self):
+        user = self.index_user('marguerite')
+        self.assertEqual(self.found('marguerite'), [user.pk])
+        user_pk = user.pk
+        user.delete()
+        mark_dirty('users', [user_pk], schedule=False)
+        process_batch()
+        self.assertEqual(self.found('marguerite'), [])
+
+
+def _slow_suggestion(query):
+    time.sleep(1)
+    return 'slow'
+
+
+def _slow_lookup(lookup):
+    def slow(query):
+        time.sleep(0.6)
+        return lookup(query)
+    return slow
+
+
+@override_settings(SEARCH_TYPE_TIME_BUDGET=0.2)
+class AsyncSearchTimeoutTests(TransactionTestCase): # The lookups run in worker threads
+    def search(self, query):
+        request = RequestFactory().get('/api/search/async/', {'q': query})
+
+        async def timed():
+            started = time.monotonic()
+            response = await async_global_search_view(request)
+            return response, time.monotonic() - started
+
+        response, elapsed = async_to_sync(timed)() # (Loop teardown then waits for sleeping threads)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content), elapsed
+
+    def test_slow_suggestion_is_left_out(self):
+        with mock.patch('search.views.did_you_mean', _slow_suggestion):
+            results, elapsed = self.search('acme')
+        self.assertLess(elapsed, 0.9)
+        self.assertNotIn('did_you_mean', results)
+
+    def test_only_the_slow_type_is_partial(self):
+        owner = User.objects.create_user(username='founder', password='x')
+        Startup.objects.create(owner=owner, name='Acme', description='A startup')
+        Project.objects.create(owner=owner, title='Acme ledger', description='A project')
+        lookup, serializer_class = SEARCH_TYPES['startups']
+        with mock.patch.dict(SEARCH_TYPES, {'startups': (_slow_lookup(lookup), serializer_class)}), \
+                mock.patch('search.views.did_you_mean', return_value=None):
+            results, elapsed = self.search('acme')
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(results['partial'], {'users': False, 'startups': True, 'projects': False, 'posts': False})
+        self.assertEqual(results['startups'], [])
+        self.assertEqual([project['title'] for project in results['projects']], ['Acme ledger'])
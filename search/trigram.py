@@ -0,0 +1,161 @@
+# my_entrepreneur_platform/search/trigram.py
+
+import heapq
+import math
+import re
+import threading
+from array import array
+from collections import Counter, defaultdict
+
+# Entity keys pack (kind, pk) into one int: pk * KIND_SLOTS + kind code
+KIND_SLOTS = 8
+WORD_RE = re.compile(r'\w+')
+
+
+def words(text):
+    return WORD_RE.findall((text or '').lower())
+
+def trigrams(word):
+    """pg_trgm-style trigrams: the word is padded with two leading spaces and one trailing space."""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    In-memory, incrementally maintained fuzzy index over short entity texts
+    (names, titles, tags).
+
+    Texts are split into words. Each distinct word is stored once in a vocabulary
+    with trigram postings, and points at the set of entities that contain it.
+    A query word is matched to vocabulary words by trigram similarity. An entity
+    scores the mean over query words of its best-matching word's similarity.
+    The vocabulary doubles as the source for "did you mean" suggestions.
+    """
+
+    def __init__(self, kinds, threshold=0.25, max_terms_per_word=50):
+        self.kinds = tuple(kinds)
+        self.threshold = threshold
+        self.max_terms_per_word = max_terms_per_word
+        self._kind_codes = {kind: code for code, kind in enumerate(self.kinds)}
+        self._lock = threading.Lock()
+
+        self._term_ids = {}                       # word -> term id
+        self._terms = []                          # term id -> word
+        self._term_sizes = array('B')             # term id -> number of distinct trigrams
+        self._term_postings = defaultdict(lambda: array('I'))  # trigram -> term ids
+        self._term_entities = []                  # term id -> set of entity keys
+        self._entity_terms = {}                   # entity key -> tuple of term ids
+
+    def __len__(self):
+        return len(self._entity_terms)
+
+    # --- Maintenance ---
+    def _key(self, kind, pk):
+        return pk * KIND_SLOTS + self._kind_codes[kind]
+
+    def _term_id(self, word):
+        term_id = self._term_ids.get(word)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._term_ids[word] = term_id
+            self._terms.append(word)
+            grams = trigrams(word)
+            self._term_sizes.append(min(len(grams), 255))
+            for gram in grams:
+                self._term_postings[gram].append(term_id)
+            self._term_entities.append(set())
+        return term_id
+
+    def _discard(self, key):
+        for term_id in self._entity_terms.pop(key, ()):
+            self._term_entities[term_id].discard(key)
+
+    def add(self, kind, pk, *texts):
+        """Indexes (or re-indexes) one entity from its name/title/tag strings."""
+        key = self._key(kind, pk)
+        with self._lock:
+            term_ids = tuple({self._term_id(word) for text in texts for word in words(text)})
+            self._discard(key)
+            if term_ids:
+                self._entity_terms[key] = term_ids
+                for term_id in term_ids:
+                    self._term_entities[term_id].add(key)
+
+    def remove(self, kind, pk):
+        with self._lock:
+            self._discard(self._key(kind, pk))
+
+    # --- Lookup ---
+    def _matching_terms(self, word):
+        """
+        Returns [(term id, similarity)] for vocabulary words whose trigram Jaccard
+        similarity reaches the threshold, best first, capped at max_terms_per_word.
+        """
+        exact = self._term_ids.get(word)
+        if exact is not None and self._term_entities[exact]:
+            return [(exact, 1.0)]
+
+        grams = trigrams(word)
+        postings = [self._term_postings[gram] for gram in grams if gram in self._term_postings]
+        # Shared-trigram counts for every term touching the query (Counter.update runs in C)
+        shared = Counter()
+        for posting in postings:
+            shared.update(posting)
+
+        # A term can only reach the threshold if it shares at least `required` trigrams
+        required = max(1, math.ceil(self.threshold * len(grams)))
+        query_size = len(grams)
+        scored = []
+        for term_id, count in shared.items():
+            if count < required or not self._term_entities[term_id]:
+                continue # Too dissimilar, or no live entity uses this word any more
+            score = count / (query_size + self._term_sizes[term_id] - count)
+            if score >= self.threshold:
+                scored.append((score, len(self._term_entities[term_id]), term_id))
+        best = heapq.nlargest(self.max_terms_per_word, scored)
+        return [(term_id, score) for score, _frequency, term_id in best]
+
+    def search(self, query, kind=None, limit=20):
+        """Returns up to `limit` [(pk, kind, score)] for the fuzzy query, best first."""
+        query_words = words(query)
+        if not query_words:
+            return []
+        kind_code = self._kind_codes[kind] if kind is not None else None
+        with self._lock:
+            totals = self._score(query_words, kind_code)
+
+        top = heapq.nlargest(limit, totals.items(), key=lambda item: item[1])
+        return [
+            (key // KIND_SLOTS, self.kinds[key % KIND_SLOTS], total / len(query_words))
+            for key, total in top
+        ]
+
+    def _score(self, query_words, kind_code):
+        totals = defaultdict(float)
+        for word in query_words:
+            best = {}
+            for term_id, score in self._matching_terms(word):
+                for key in self._term_entities[term_id]:
+                    if kind_code is not None and key % KIND_SLOTS != kind_code:
+                        continue
+                    if score > best.get(key, 0.0):
+                        best[key] = score
+            for key, score in best.items():
+                totals[key] += score
+        return totals
+
+    def suggest(self, query):
+        """
+        "Did you mean": the query with each unknown word swapped for its closest
+        indexed word, or None if every word is already known (or has no close match).
+        """
+        query_words = words(query)
+        suggested = []
+        with self._lock:
+            for word in query_words:
+                matches = self._matching_terms(word)
+                suggested.append(self._terms[matches[0][0]] if matches else word)
+        if suggested == query_words:
+            return None
+        return ' '.join(suggested)
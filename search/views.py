@@ -1,21 +1,22 @@
 # my_entrepreneur_platform/search/views.py
 
+import asyncio
+import itertools
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from django.db.models import Q # For OR queries
-from django.contrib.auth import get_user_model
 
-from users.models import UserProfile
-from startups.models import Startup
-from projects.models import Project
-from content.models import Post
+from .indexing import index_backlog
+from .queries import SEARCH_TYPES, fuzzy_search, did_you_mean
 
-from .serializers import (
-    UserSearchSerializer, StartupSearchSerializer,
-    ProjectSearchSerializer, PostSearchSerializer
-)
+# Rows fetched per round trip while streaming a type's matches in the async view
+SEARCH_CHUNK_SIZE = 100
 
-User = get_user_model()
 
 class GlobalSearchAPIView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny] # Anyone can search
@@ -29,45 +30,103 @@ class GlobalSearchAPIView(generics.GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        search_results = {
-            'users': [],
-            'startups': [],
-            'projects': [],
-            'posts': [],
-        }
-
-        # --- Search Users ---
-        users_queryset = User.objects.filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query)
-        ).distinct()
-        search_results['users'] = UserSearchSerializer(users_queryset, many=True).data
-
-        # --- Search Startups ---
-        startups_queryset = Startup.objects.filter(
-            Q(name__icontains=query) |
-            Q(tagline__icontains=query) |
-            Q(description__icontains=query) |
-            Q(industry__name__icontains=query) # Search by industry name
-        ).distinct()
-        search_results['startups'] = StartupSearchSerializer(startups_queryset, many=True).data
-
-        # --- Search Projects ---
-        projects_queryset = Project.objects.filter(
-            Q(title__icontains=query) |
-            Q(tagline__icontains=query) |
-            Q(description__icains=query) |
-            Q(technologies_used__name__icontains=query) # Search by technology name
-        ).distinct()
-        search_results['projects'] = ProjectSearchSerializer(projects_queryset, many=True).data
-
-        # --- Search Posts ---
-        posts_queryset = Post.objects.filter(
-            Q(content__icontains=query) |
-            Q(owner__username__icontains=query) # Search by post content or owner username
-        ).distinct()
-        search_results['posts'] = PostSearchSerializer(posts_queryset, many=True).data
-
-        return Response(search_results, status=status.HTTP_200_OK)
\ No newline at end of file
+        search_results = {}
+        for search_type, (lookup, serializer_class) in SEARCH_TYPES.items():
+            results = serializer_class(lookup(query), many=True).data
+            if not results: # Nothing contains the query verbatim; try typo-tolerant matching
+                results = serializer_class(fuzzy_search(search_type, query), many=True).data
+            search_results[search_type] = results
+
+        suggestion = did_you_mean(query)
+        if suggestion:
+            search_results['did_you_mean'] = suggestion
+
+        return Response(search_results, status=status.HTTP_200_OK)
+
+
+class SearchIndexStatusAPIView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAdminUser] # Operational metric, admins only
+
+    def get(self, request, *args, **kwargs):
+        return Response(index_backlog(), status=status.HTTP_200_OK)
+
+
+# --- Async Global Search ---
+def _collect_search_type(search_type, query, deadline, collector):
+    """
+    Runs one entity type's lookup in a worker thread, appending serialized rows
+    to `collector` chunk by chunk as they stream in. Stops early once `deadline` has passed.
+    Returns True if every match was collected.
+    """
+    lookup, serializer_class = SEARCH_TYPES[search_type]
+    rows = lookup(query).iterator(chunk_size=SEARCH_CHUNK_SIZE)
+    try:
+        while True:
+            chunk = list(itertools.islice(rows, SEARCH_CHUNK_SIZE))
+            if not chunk:
+                if not collector: # Nothing contains the query verbatim; try typo-tolerant matching
+                    collector.extend(serializer_class(fuzzy_search(search_type, query), many=True).data)
+                return True
+            if time.monotonic() > deadline:
+                return False
+            # Serialize a chunk at a time: building a serializer per row is far slower
+            collector.extend(serializer_class(chunk, many=True).data)
+    finally:
+        rows.close() # Release the cursor before its connection goes away
+        # Worker threads never see request_finished, so close the connection here
+        connection.close()
+
+
+def _suggest(query):
+    try:
+        return did_you_mean(query)
+    finally:
+        connection.close()
+
+
+async def async_global_search_view(request):
+    """
+    Same search as GlobalSearchAPIView, but the per-type lookups run concurrently
+    and each gets SEARCH_TYPE_TIME_BUDGET seconds. A type that runs over its
+    budget returns the rows collected so far and is flagged in 'partial'.
+    """
+    query = request.GET.get('q', None)
+
+    if not query:
+        return JsonResponse(
+            {"detail": "Please provide a search query using the 'q' parameter."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    budget = settings.SEARCH_TYPE_TIME_BUDGET
+    deadline = time.monotonic() + budget
+    collectors = {search_type: [] for search_type in SEARCH_TYPES}
+    tasks = {
+        search_type: asyncio.ensure_future(
+            sync_to_async(_collect_search_type, thread_sensitive=False)(
+                search_type, query, deadline, collectors[search_type]
+            )
+        )
+        for search_type in SEARCH_TYPES
+    }
+    suggestion_task = asyncio.ensure_future(sync_to_async(_suggest, thread_sensitive=False)(query))
+    done, _pending = await asyncio.wait(tasks.values(), timeout=budget)
+
+    search_results = {}
+    partial = {}
+    for search_type, task in tasks.items():
+        finished = task in done and task.result()
+        # Snapshot: a thread still over budget may append one more chunk before it stops
+        search_results[search_type] = list(collectors[search_type])
+        partial[search_type] = not finished
+    search_results['partial'] = partial
+
+    # The suggestion gets what is left of the budget; a cold or busy trigram index must not hold up the response
+    try:
+        suggestion = await asyncio.wait_for(suggestion_task, timeout=max(0.0, deadline - time.monotonic()))
+    except asyncio.TimeoutError:
+        suggestion = None
+    if suggestion:
+        search_results['did_you_mean'] = suggestion
+
+    return JsonResponse(search_results, status=status.HTTP_200_OK)
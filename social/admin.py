@@ -1,7 +1,8 @@
 # my_entrepreneur_platform/social/admin.py
 
 from django.contrib import admin
-from .models import Follow
+from .models import Follow, PeopleRecommendation
 
 # Register your model here
-admin.site.register(Follow)
\ No newline at end of file
+admin.site.register(Follow)
+admin.site.register(PeopleRecommendation)
@@ -0,0 +1,114 @@
+# my_entrepreneur_platform/social/bulk.py
+
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from startups.models import Startup
+from .graph import adjust_follow_counts
+from .models import Follow
+from .recommendations import mark_for_refresh
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+FOLLOWABLE_MODELS = {'user': User, 'startup': Startup}
+
+# While set, the per-row Follow signal receivers (timeline rebuild, recommendation
+# refresh) stand down: the bulk operation does that work once for the whole batch
+_bulk_write = ContextVar('social_bulk_write', default=False)
+
+def in_bulk_write():
+    return _bulk_write.get()
+
+@contextmanager
+def _bulk_writing():
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+def _group(targets):
+    """[(model name, object id)] -> {model name: set of ids}, ignoring unknown model names."""
+    grouped = defaultdict(set)
+    for model_name, object_id in targets:
+        if model_name in FOLLOWABLE_MODELS:
+            grouped[model_name].add(object_id)
+    return grouped
+
+def _after_commit(user_id, follows_by_type):
+    """Queues the batch's side effects: one timeline rebuild and one notification task per content type."""
+    from feed.tasks import rebuild_timeline # Imported late: the feed app imports social
+    from notifications.tasks import notify_new_follows
+
+    def enqueue():
+        try:
+            rebuild_timeline.delay(user_id)
+            for content_type_id, object_ids in follows_by_type.items():
+                notify_new_follows.delay(user_id, content_type_id, sorted(object_ids))
+        except Exception:
+            # A broker outage must not fail the user's write; timelines catch up on the next rebuild
+            logger.exception(f"Could not enqueue bulk follow side effects for user {user_id}.")
+    transaction.on_commit(enqueue)
+
+def follow_many(user, targets):
+    """
+    Follows every (model name, object id) in `targets` that exists and is not
+    already followed. Returns {'followed': [...], 'skipped': [...], 'not_found': [...]}
+    as (model name, object id) pairs.
+    """
+    result = {'followed': [], 'skipped': [], 'not_found': []}
+    created_by_type = {}
+    with transaction.atomic(), _bulk_writing():
+        for model_name, object_ids in _group(targets).items():
+            model = FOLLOWABLE_MODELS[model_name]
+            content_type = ContentType.objects.get_for_model(model)
+            existing = set(model.objects.filter(pk__in=object_ids).values_list('pk', flat=True)) # One query per type
+            if model is User:
+                existing.discard(user.pk) # You cannot follow yourself
+            already = set(
+                Follow.objects.filter(follower=user, content_type=content_type, object_id__in=existing)
+                .values_list('object_id', flat=True)
+            )
+            new_ids = sorted(existing - already)
+            # ignore_conflicts covers a concurrent follow of the same target; the
+            # counter reconcile job repairs the count in that rare case
+            Follow.objects.bulk_create(
+                [Follow(follower=user, content_type=content_type, object_id=object_id) for object_id in new_ids],
+                ignore_conflicts=True,
+            )
+            adjust_follow_counts(user.pk, content_type, new_ids, 1)
+            if new_ids:
+                created_by_type[content_type.pk] = new_ids
+            result['followed'] += [(model_name, object_id) for object_id in new_ids]
+            result['skipped'] += [(model_name, object_id) for object_id in sorted(already)]
+            result['not_found'] += [(model_name, object_id) for object_id in sorted(object_ids - existing)]
+        if created_by_type:
+            mark_for_refresh(user.pk)
+            _after_commit(user.pk, created_by_type)
+    return result
+
+def unfollow_many(user, targets):
+    """Unfollows every (model name, object id) in `targets`. Returns {'unfollowed': [...], 'skipped': [...]}."""
+    result = {'unfollowed': [], 'skipped': []}
+    with transaction.atomic(), _bulk_writing():
+        for model_name, object_ids in _group(targets).items():
+            content_type = ContentType.objects.get_for_model(FOLLOWABLE_MODELS[model_name])
+            follows = Follow.objects.filter(follower=user, content_type=content_type, object_id__in=object_ids)
+            # Locked until commit, so a concurrent unfollow can't delete (and count) the same rows
+            removed = sorted(follows.select_for_update().values_list('object_id', flat=True))
+            follows.delete()
+            adjust_follow_counts(user.pk, content_type, removed, -1)
+            result['unfollowed'] += [(model_name, object_id) for object_id in removed]
+            result['skipped'] += [(model_name, object_id) for object_id in sorted(object_ids - set(removed))]
+        if result['unfollowed']:
+            mark_for_refresh(user.pk)
+            _after_commit(user.pk, {})
+    return result
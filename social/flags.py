@@ -0,0 +1,28 @@
+# my_entrepreneur_platform/social/flags.py
+
+from django.db import models
+from rest_framework import serializers
+
+from my_entrepreneur_platform.serializers import ViewerMixin
+from .graph import followed_ids
+
+
+# Resolves whether the viewer follows each item of a page with one query.
+# Child serializers set `follow_target_model` and implement `follow_target_id(obj)`.
+class FollowingFlagListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.page_followed_ids = followed_ids(
+            self.child.viewer, self.child.follow_target_model, [self.child.follow_target_id(item) for item in items]
+        )
+        return super().to_representation(items)
+
+# Shared by serializers exposing `is_following = serializers.SerializerMethodField()`
+class FollowingFlagMixin(ViewerMixin):
+    page_followed_ids = None # Filled in by FollowingFlagListSerializer for list responses
+
+    def get_is_following(self, obj):
+        target_id = self.follow_target_id(obj)
+        if self.page_followed_ids is None: # A single object, not a page
+            return target_id in followed_ids(self.viewer, self.follow_target_model, [target_id])
+        return target_id in self.page_followed_ids
@@ -0,0 +1,68 @@
+# my_entrepreneur_platform/social/graph.py
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+
+from my_entrepreneur_platform.counters import adjust, count_subquery, reconcile
+from startups.models import Startup
+from users.models import UserProfile
+from .models import Follow
+
+User = get_user_model()
+
+
+# --- Denormalized counters ---
+# Users keep followers_count/following_count on their UserProfile, startups keep
+# followers_count on the row. Follow writes adjust them with F() expressions in
+# the same transaction; reconcile_follow_counts repairs any drift.
+
+def _followed_queryset(content_type, object_ids):
+    model = content_type.model_class()
+    if model is User:
+        return UserProfile.objects.filter(user_id__in=object_ids)
+    if model is Startup:
+        return Startup.objects.filter(pk__in=object_ids)
+    return None
+
+def adjust_follow_counts(follower_id, content_type, object_ids, delta):
+    """
+    Applies `delta` (+1 follow / -1 unfollow) for `follower_id` following each of
+    `object_ids` of `content_type`: their followers_count and the follower's following_count.
+    """
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+    followed = _followed_queryset(content_type, object_ids)
+    if followed is not None:
+        adjust(followed, 'followers_count', delta)
+    adjust(UserProfile.objects.filter(user_id=follower_id), 'following_count', delta * len(object_ids))
+
+def reconcile_follow_counts(batch_size=None):
+    """Recomputes every counter from the Follow table, in batches. Returns rows repaired per model."""
+    batch_size = batch_size or settings.SOCIAL_COUNTER_RECONCILE_BATCH_SIZE
+    user_type = ContentType.objects.get_for_model(User)
+    startup_type = ContentType.objects.get_for_model(Startup)
+    return {
+        'profiles': reconcile(UserProfile, {
+            'followers_count': count_subquery(Follow.objects.filter(content_type=user_type), 'object_id', 'user_id'),
+            'following_count': count_subquery(Follow.objects.all(), 'follower_id', 'user_id'),
+        }, batch_size),
+        'startups': reconcile(Startup, {
+            'followers_count': count_subquery(Follow.objects.filter(content_type=startup_type), 'object_id'),
+        }, batch_size),
+    }
+
+
+# --- Batch checks ---
+def followed_ids(user, model, object_ids):
+    """The subset of `object_ids` (of `model`, User or Startup) that `user` follows, in one query."""
+    if user is None or not user.is_authenticated or not object_ids:
+        return set()
+    return set(
+        Follow.objects.filter(
+            follower=user,
+            content_type=ContentType.objects.get_for_model(model),
+            object_id__in=list(object_ids),
+        ).order_by().values_list('object_id', flat=True)
+    )
@@ -0,0 +1,19 @@
+# my_entrepreneur_platform/social/management/commands/build_people_recommendations.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from social.recommendations import rebuild_recommendations, refresh_recommendations
+
+
+class Command(BaseCommand):
+    help = "Computes the stored \"people you may know\" recommendations from the follow graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--changed-only', action='store_true', help="Only refresh users whose edges changed since the last run.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        users, stored = refresh_recommendations() if options['changed_only'] else rebuild_recommendations()
+        self.stdout.write(f"{stored} recommendations stored for {users} users in {time.monotonic() - started:.1f}s.")
@@ -0,0 +1,61 @@
+# my_entrepreneur_platform/social/management/commands/import_legacy_startup_followers.py
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from feed.tasks import rebuild_timeline
+from social.graph import reconcile_follow_counts
+from social.models import Follow, RecommendationRefresh
+from startups.models import Startup
+
+LEGACY_TABLE = 'startups_startup_followers' # Through table of the deprecated Startup.followers M2M
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies follows from the legacy Startup.followers table into social.Follow, then recounts followers. "
+        "Run it after this release deploys; the release that removes Startup.followers drops the table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Legacy rows read and inserted per transaction.")
+
+    def handle(self, *args, **options):
+        if LEGACY_TABLE not in connection.introspection.table_names():
+            self.stdout.write(f"No {LEGACY_TABLE} table, nothing to import.")
+            return
+
+        startup_type = ContentType.objects.get_for_model(Startup)
+        table = connection.ops.quote_name(LEGACY_TABLE)
+        imported = 0
+        followers = set()
+        last_id = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT id, startup_id, user_id FROM {table} WHERE id > %s ORDER BY id LIMIT %s",
+                    [last_id, options['batch_size']],
+                )
+                rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            with transaction.atomic():
+                # Pairs already followed through the API are skipped by the unique constraint
+                created = Follow.objects.bulk_create(
+                    [Follow(follower_id=user_id, content_type=startup_type, object_id=startup_id) for _, startup_id, user_id in rows],
+                    ignore_conflicts=True,
+                )
+            imported += len(created)
+            followers.update(user_id for _, _, user_id in rows)
+            self.stdout.write(f"Read legacy rows up to id {last_id}.")
+
+        # bulk_create skips the Follow signals and counters: recount, then queue what the signals would have
+        repaired = reconcile_follow_counts()
+        RecommendationRefresh.objects.bulk_create(
+            [RecommendationRefresh(user_id=user_id) for user_id in followers], ignore_conflicts=True, batch_size=1000,
+        )
+        for user_id in followers:
+            rebuild_timeline.delay(user_id)
+        self.stdout.write(f"Imported up to {imported} follows for {len(followers)} users; repaired counters {repaired}.")
@@ -29,6 +29,42 @@ class Follow(models.Model):
         # Ensure a user can only follow a specific content_object once
         unique_together = ('follower', 'content_type', 'object_id')
         ordering = ['-created_at'] # Newest follows first
+        indexes = [
+            # Followers of a user/startup, and everything a user follows, newest first
+            models.Index(fields=['content_type', 'object_id', '-created_at'], name='social_follow_target_idx'),
+            models.Index(fields=['follower', '-created_at'], name='social_follow_follower_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.follower.username} follows {self.content_object}"
\ No newline at end of file
+        return f"{self.follower.username} follows {self.content_object}"
+
+class PeopleRecommendation(models.Model):
+    """
+    A precomputed "people you may know" candidate for a user, written by the
+    offline job in social.recommendations (top PYMK_TOP_K per user).
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='people_recommendations')
+    candidate = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    # The evidence behind the score, so clients can say why someone was suggested
+    mutual_follows = models.PositiveIntegerField(default=0) # People the user follows who follow the candidate
+    shared_startups = models.PositiveIntegerField(default=0) # Startups both follow
+    shared_technologies = models.PositiveIntegerField(default=0) # Technologies on both users' projects
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'candidate')
+        ordering = ['-score']
+        indexes = [models.Index(fields=['user', '-score'], name='social_pymk_user_score_idx')]
+
+    def __str__(self):
+        return f"{self.candidate_id} for {self.user_id} ({self.score:.2f})"
+
+
+class RecommendationRefresh(models.Model):
+    """Marks a user whose follow/technology edges changed since their recommendations were computed."""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    marked_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Refresh recommendations for {self.user_id}"
@@ -0,0 +1,170 @@
+# my_entrepreneur_platform/social/recommendations.py
+
+import heapq
+import logging
+from array import array
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from my_entrepreneur_platform.refresh import mark_on_commit
+from projects.models import Project
+from startups.models import Startup
+from .models import Follow, PeopleRecommendation, RecommendationRefresh
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+# --- Sparse adjacency ---
+# Each relation is held as compressed rows, {row id: array of column ids}, plus
+# its transpose. A user's candidate scores are one row of a sparse product such
+# as F·F (friends of friends) or S·Sᵀ (startups in common), computed row by row
+# (Gustavson's algorithm): the rows reached through the user's own row are
+# summed into a Counter, whose update() runs in C.
+
+def _rows(pairs):
+    rows = defaultdict(lambda: array('I'))
+    for row, column in pairs:
+        rows[row].append(column)
+    return dict(rows)
+
+def _transpose(rows):
+    return _rows((column, row) for row, columns in rows.items() for column in columns)
+
+
+class FollowGraph:
+    """
+    The three user-to-user signals, as sparse matrices:
+    follows (user -> users followed), startups (user -> startups followed) and
+    technologies (user -> technologies used on their projects).
+    """
+
+    def __init__(self, follows, startups, technologies):
+        self.following = _rows(follows)
+        self.followers = _transpose(self.following)
+        self.startups = _rows(startups)
+        self.startup_followers = _transpose(self.startups)
+        self.technologies = _rows(technologies)
+        self.technology_users = _transpose(self.technologies)
+
+    @classmethod
+    def load(cls):
+        """Exports the whole graph from the database, streaming each edge list once."""
+        user_type = ContentType.objects.get_for_model(User)
+        startup_type = ContentType.objects.get_for_model(Startup)
+
+        def follow_edges(content_type):
+            return (
+                Follow.objects.filter(content_type=content_type).order_by()
+                .values_list('follower_id', 'object_id').iterator(chunk_size=10000)
+            )
+
+        technology_edges = (
+            Project.technologies_used.through.objects.order_by()
+            .values_list('project__owner_id', 'technology_id').distinct().iterator(chunk_size=10000)
+        )
+        return cls(follow_edges(user_type), follow_edges(startup_type), technology_edges)
+
+    def users(self):
+        """Every user with at least one signal (everyone else gets no recommendations)."""
+        return set(self.following) | set(self.startups) | set(self.technologies)
+
+    def affected_by(self, user_ids):
+        """
+        Users whose scores change when `user_ids`' edges change: themselves, plus
+        their followers, whose friends-of-friends row reads through them.
+        """
+        affected = set(user_ids)
+        for user_id in user_ids:
+            affected.update(self.followers.get(user_id, ()))
+        return affected
+
+    def _reach(self, own_row, rows, max_degree):
+        """Sums the rows of `rows` selected by `own_row`, skipping hubs wider than `max_degree`."""
+        counts = Counter()
+        for column in own_row:
+            reached = rows.get(column)
+            if reached is not None and len(reached) <= max_degree:
+                counts.update(reached)
+        return counts
+
+    def candidates(self, user_id, limit, weights, max_degree):
+        """
+        The `limit` best [(score, candidate id, mutual follows, shared startups,
+        shared technologies)] for `user_id`, excluding people already followed.
+        """
+        mutual = self._reach(self.following.get(user_id, ()), self.following, max_degree)
+        startups = self._reach(self.startups.get(user_id, ()), self.startup_followers, max_degree)
+        technologies = self._reach(self.technologies.get(user_id, ()), self.technology_users, max_degree)
+
+        excluded = set(self.following.get(user_id, ()))
+        excluded.add(user_id)
+        scored = []
+        for candidate in mutual.keys() | startups.keys() | technologies.keys():
+            if candidate in excluded:
+                continue
+            score = (
+                weights['mutual_follows'] * mutual[candidate]
+                + weights['shared_startups'] * startups[candidate]
+                + weights['shared_technologies'] * technologies[candidate]
+            )
+            scored.append((score, candidate, mutual[candidate], startups[candidate], technologies[candidate]))
+        return heapq.nlargest(limit, scored)
+
+
+# --- Offline job ---
+def _store(graph, user_ids):
+    """Replaces the stored recommendations of `user_ids` (one transaction per batch)."""
+    limit = settings.PYMK_TOP_K
+    weights = settings.PYMK_WEIGHTS
+    max_degree = settings.PYMK_MAX_HUB_DEGREE
+    rows = [
+        PeopleRecommendation(
+            user_id=user_id, candidate_id=candidate, score=score,
+            mutual_follows=mutual, shared_startups=startups, shared_technologies=technologies,
+        )
+        for user_id in user_ids
+        for score, candidate, mutual, startups, technologies in graph.candidates(user_id, limit, weights, max_degree)
+    ]
+    with transaction.atomic():
+        PeopleRecommendation.objects.filter(user_id__in=user_ids).delete()
+        PeopleRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+def _compute(graph, user_ids):
+    batch_size = settings.PYMK_BATCH_SIZE
+    user_ids = sorted(user_ids)
+    stored = 0
+    for start in range(0, len(user_ids), batch_size):
+        stored += _store(graph, user_ids[start:start + batch_size])
+    return stored
+
+def rebuild_recommendations():
+    """Recomputes every user's recommendations. Returns (users processed, rows stored)."""
+    # Clear the marks before reading the graph: an edge written from here on marks its user again
+    RecommendationRefresh.objects.all().delete()
+    graph = FollowGraph.load()
+    # Users with stored rows but no signal left must be cleared as well
+    user_ids = graph.users() | set(PeopleRecommendation.objects.values_list('user_id', flat=True).distinct())
+    return len(user_ids), _compute(graph, user_ids)
+
+def refresh_recommendations():
+    """
+    Recomputes the users marked by mark_for_refresh, and those whose
+    friends-of-friends row passes through them. Returns (users processed, rows stored).
+    """
+    marked = list(RecommendationRefresh.objects.values_list('user_id', flat=True))
+    if not marked:
+        return 0, 0
+    # Clear the marks before reading the graph: an edge written from here on marks its user again
+    RecommendationRefresh.objects.filter(user_id__in=marked).delete()
+    graph = FollowGraph.load()
+    user_ids = graph.affected_by(marked)
+    return len(user_ids), _compute(graph, user_ids)
+
+def mark_for_refresh(user_id):
+    mark_on_commit(RecommendationRefresh, user_id)
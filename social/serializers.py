@@ -1,13 +1,17 @@
 # my_entrepreneur_platform/social/serializers.py
 
+from collections import defaultdict
+
 from rest_framework import serializers
-from .models import Follow
+from django.conf import settings
+from django.db import models
+from .models import Follow, PeopleRecommendation
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 
 # Import serializers from other apps to nest related objects
 from users.serializers import UserSerializer as BasicUserSerializer # For follower/followed_user info
-from startups.serializers import StartupSerializer as BasicStartupSerializer # For followed_startup info
+from startups.models import Startup # For followed_startup info
 
 User = get_user_model()
 
@@ -59,22 +63,79 @@ class FollowCreateSerializer(serializers.ModelSerializer):
 
         return data
 
+# Serializers for the bulk follow/unfollow endpoint
+class FollowTargetSerializer(serializers.Serializer):
+    content_type = serializers.ChoiceField(choices=['user', 'startup'])
+    object_id = serializers.IntegerField(min_value=1)
+
+class BulkFollowSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=['follow', 'unfollow'])
+    targets = FollowTargetSerializer(many=True, allow_empty=False, max_length=settings.SOCIAL_BULK_FOLLOW_MAX)
+
+# Slim embedded forms of followed objects, loaded for a whole page at once
+def _followed_user_info(values):
+    return {'type': 'user', 'id': values['id'], 'username': values['username']}
+
+def _followed_startup_info(values):
+    return {'type': 'startup', 'id': values['id'], 'name': values['name'], 'tagline': values['tagline']}
+
+FOLLOWED_OBJECT_LOADERS = {
+    User: (('id', 'username'), _followed_user_info),
+    Startup: (('id', 'name', 'tagline'), _followed_startup_info),
+}
+
+def resolve_followed_objects(follows):
+    """
+    {(content type id, object id): slim info} for the followed objects of `follows`:
+    one query per followed content type, however many follows there are.
+    """
+    ids_by_type = defaultdict(set)
+    for follow in follows:
+        ids_by_type[follow.content_type_id].add(follow.object_id)
+    resolved = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class() # Cached, no query
+        if model not in FOLLOWED_OBJECT_LOADERS:
+            continue
+        fields, to_info = FOLLOWED_OBJECT_LOADERS[model]
+        for values in model.objects.filter(pk__in=object_ids).values(*fields):
+            resolved[(content_type_id, values['id'])] = to_info(values)
+    return resolved
+
+class FollowListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.child.page_followed_objects = resolve_followed_objects(items)
+        return super().to_representation(items)
+
 # Serializer for displaying Follow relationships (who is following whom)
 class FollowSerializer(serializers.ModelSerializer):
     follower = BasicUserSerializer(read_only=True) # Show info about the follower
     
-    # Use SerializerMethodField to dynamically serialize the followed object (User or Startup)
+    # Slim info about the followed object (User or Startup), batch-loaded for lists
     followed_object_info = serializers.SerializerMethodField()
+    page_followed_objects = None # Filled in by FollowListSerializer for list responses
 
     class Meta:
         model = Follow
         fields = ['id', 'follower', 'content_type', 'object_id', 'followed_object_info', 'created_at']
         read_only_fields = ['id', 'follower', 'content_type', 'object_id', 'followed_object_info', 'created_at']
+        list_serializer_class = FollowListSerializer
 
     def get_followed_object_info(self, obj):
-        # Dynamically serialize the content_object (User or Startup)
-        if isinstance(obj.content_object, User):
-            return BasicUserSerializer(obj.content_object).data
-        elif isinstance(obj.content_object, BasicStartupSerializer.Meta.model): # Check against the Startup model
-            return BasicStartupSerializer(obj.content_object).data
-        return None
\ No newline at end of file
+        resolved = self.page_followed_objects
+        if resolved is None: # A single follow, not a page
+            resolved = resolve_followed_objects([obj])
+        return resolved.get((obj.content_type_id, obj.object_id))
+
+# Serializer for a stored "people you may know" recommendation
+class PeopleRecommendationSerializer(serializers.ModelSerializer):
+    candidate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PeopleRecommendation
+        fields = ['candidate', 'score', 'mutual_follows', 'shared_startups', 'shared_technologies', 'computed_at']
+        read_only_fields = fields
+
+    def get_candidate(self, obj):
+        return _followed_user_info({'id': obj.candidate_id, 'username': obj.candidate.username})
@@ -0,0 +1,23 @@
+# my_entrepreneur_platform/social/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from projects.models import Project
+from .bulk import in_bulk_write
+from .models import Follow
+from .recommendations import mark_for_refresh
+
+# Edge changes only mark the user; the periodic refresh recomputes marked users in bulk.
+# Technology changes on projects are marked by projects.signals, for matchmaking too.
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def follow_changed(sender, instance, **kwargs):
+    if in_bulk_write():
+        return # Marked once per batch by social.bulk
+    mark_for_refresh(instance.follower_id)
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    mark_for_refresh(instance.owner_id)
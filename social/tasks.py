@@ -0,0 +1,30 @@
+# my_entrepreneur_platform/social/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from .graph import reconcile_follow_counts
+from .recommendations import rebuild_recommendations, refresh_recommendations
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def reconcile_follow_counters(self):
+    """Periodically repairs drift in the denormalized follower/following counters."""
+    repaired = reconcile_follow_counts()
+    logger.info(f"Task {self.request.id} completed: repaired follow counters {repaired}")
+    return repaired
+
+@shared_task(bind=True)
+def rebuild_people_recommendations(self):
+    """Nightly full recomputation of the "people you may know" recommendations."""
+    users, stored = rebuild_recommendations()
+    logger.info(f"Task {self.request.id} completed: {stored} recommendations stored for {users} users")
+    return stored
+
+@shared_task(bind=True)
+def refresh_people_recommendations(self):
+    """Recomputes recommendations for users whose follow/technology edges changed."""
+    users, stored = refresh_recommendations()
+    logger.info(f"Task {self.request.id} completed: {stored} recommendations stored for {users} users")
+    return stored
@@ -1,3 +1,284 @@
-from django.test import TestCase
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from startups.models import Startup
+from users.models import UserProfile
+from .graph import reconcile_follow_counts
+from .models import Follow, RecommendationRefresh
+from .recommendations import FollowGraph, rebuild_recommendations
+
+User = get_user_model()
+
+
+class RecommendationRefreshMarkTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='x')
+        self.bob = User.objects.create_user(username='bob', password='x')
+        self.user_type = ContentType.objects.get_for_model(User)
+
+    def test_follow_marks_the_follower_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Follow.objects.create(follower=self.alice, content_type=self.user_type, object_id=self.bob.pk)
+            self.assertFalse(RecommendationRefresh.objects.exists()) # Nothing written inside the transaction
+        self.assertEqual(list(RecommendationRefresh.objects.values_list('user_id', flat=True)), [self.alice.pk])
+
+    def test_deleting_a_user_with_follows(self):
+        Follow.objects.create(follower=self.alice, content_type=self.user_type, object_id=self.bob.pk)
+        RecommendationRefresh.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alice.delete() # The cascade fires the Follow post_delete receiver
+
+        self.assertFalse(User.objects.filter(pk=self.alice.pk).exists())
+        self.assertFalse(RecommendationRefresh.objects.exists())
+
+    def test_a_mark_written_during_a_rebuild_survives_it(self):
+        load = FollowGraph.load
+
+        def load_while_alice_follows():
+            RecommendationRefresh.objects.create(user=self.alice) # Committed while the job reads the graph
+            return load()
+
+        with mock.patch.object(FollowGraph, 'load', side_effect=load_while_alice_follows):
+            rebuild_recommendations()
+        self.assertTrue(RecommendationRefresh.objects.filter(user=self.alice).exists())
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class FollowListQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='x')
+        user_type = ContentType.objects.get_for_model(User)
+        startup_type = ContentType.objects.get_for_model(Startup)
+        for number in range(3):
+            other = User.objects.create_user(username=f'user{number}', password='x')
+            startup = Startup.objects.create(owner=other, name=f'Startup {number}', description='A startup')
+            Follow.objects.create(follower=self.alice, content_type=user_type, object_id=other.pk)
+            Follow.objects.create(follower=self.alice, content_type=startup_type, object_id=startup.pk)
+            Follow.objects.create(follower=other, content_type=user_type, object_id=self.alice.pk)
+        self.startup = startup
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        ContentType.objects.clear_cache()
+
+    def test_following(self):
+        response = self.client.get(f'/api/users/{self.alice.pk}/following/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 6)
+
+    def test_followers(self):
+        response = self.client.get(f'/api/users/{self.alice.pk}/followers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_startup_followers(self):
+        response = self.client.get(f'/api/startups/{self.startup.pk}/followers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class BulkFollowTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='x')
+        self.others = [User.objects.create_user(username=f'user{number}', password='x') for number in range(3)]
+        self.startup = Startup.objects.create(owner=self.others[0], name='Acme', description='A startup')
+        self.client = APIClient()
+        self.client.force_authenticate(self.alice)
+        rebuild = mock.patch('feed.tasks.rebuild_timeline.delay')
+        notify = mock.patch('notifications.tasks.notify_new_follows.delay')
+        self.rebuild_timeline = rebuild.start()
+        self.notify_new_follows = notify.start()
+        self.addCleanup(mock.patch.stopall)
+
+    def bulk(self, action, targets):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/follows/bulk/', {
+                'action': action,
+                'targets': [{'content_type': model_name, 'object_id': object_id} for model_name, object_id in targets],
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        return {key: [(item['content_type'], item['object_id']) for item in items] for key, items in response.data.items()}
+
+    def counts(self):
+        profiles = dict(UserProfile.objects.values_list('user_id', 'followers_count'))
+        self.startup.refresh_from_db()
+        following = UserProfile.objects.get(user=self.alice).following_count
+        return following, [profiles[user.pk] for user in self.others], self.startup.followers_count
+
+    def test_follow_updates_counters_once_per_new_follow(self):
+        first, second = self.others[0].pk, self.others[1].pk
+        result = self.bulk('follow', [('user', first), ('user', second), ('startup', self.startup.pk), ('user', 999999), ('user', self.alice.pk)])
+        self.assertEqual(sorted(result['followed']), [('startup', self.startup.pk), ('user', first), ('user', second)])
+        self.assertEqual(sorted(result['not_found']), [('user', self.alice.pk), ('user', 999999)])
+        self.assertEqual(self.counts(), (3, [1, 1, 0], 1))
+
+        # Repeats are skipped and leave the counters alone
+        result = self.bulk('follow', [('user', first), ('user', self.others[2].pk)])
+        self.assertEqual(result['skipped'], [('user', first)])
+        self.assertEqual(result['followed'], [('user', self.others[2].pk)])
+        self.assertEqual(self.counts(), (4, [1, 1, 1], 1))
+
+        result = self.bulk('unfollow', [('user', first), ('startup', self.startup.pk), ('user', 999999)])
+        self.assertEqual(result['skipped'], [('user', 999999)])
+        self.assertEqual(self.counts(), (2, [0, 1, 1], 0))
+
+    def test_side_effects_run_once_per_batch(self):
+        targets = [('user', user.pk) for user in self.others] + [('startup', self.startup.pk)]
+        self.bulk('follow', targets)
+        self.rebuild_timeline.assert_called_once_with(self.alice.pk) # Not once per Follow row
+        self.assertEqual(self.notify_new_follows.call_count, 2) # One per content type
+        self.assertEqual(list(RecommendationRefresh.objects.values_list('user_id', flat=True)), [self.alice.pk])
+
+        self.rebuild_timeline.reset_mock()
+        self.notify_new_follows.reset_mock()
+        self.bulk('follow', targets) # Nothing new: no side effects at all
+        self.rebuild_timeline.assert_not_called()
+        self.notify_new_follows.assert_not_called()
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        owner = self.others[0]
+        startups = [Startup(owner=owner, name=f'Startup {number}', description='A startup') for number in range(50)]
+        Startup.objects.bulk_create(startups)
+        targets = [('startup', startup.pk) for startup in Startup.objects.exclude(pk=self.startup.pk)]
+
+        def queries(batch):
+            with CaptureQueriesContext(connection) as context:
+                self.bulk('follow', batch)
+            return len(context.captured_queries)
+
+        few = queries(targets[:2] + [('user', self.others[1].pk)])
+        many = queries(targets[2:] + [('user', self.others[2].pk)])
+        self.assertEqual(many, few)
+        self.assertEqual(Follow.objects.filter(follower=self.alice).count(), 52)
+
+    def test_invalid_requests(self):
+        too_many = [{'content_type': 'user', 'object_id': number} for number in range(1, settings.SOCIAL_BULK_FOLLOW_MAX + 2)]
+        for data in (
+            {'action': 'follow', 'targets': []},
+            {'action': 'follow', 'targets': too_many},
+            {'action': 'block', 'targets': [{'content_type': 'user', 'object_id': self.others[0].pk}]},
+            {'action': 'follow', 'targets': [{'content_type': 'post', 'object_id': 1}]},
+            {'action': 'follow', 'targets': [{'content_type': 'user', 'object_id': 0}]},
+        ):
+            with self.subTest(action=data['action'], targets=data['targets'][:1]):
+                self.assertEqual(self.client.post('/api/follows/bulk/', data, format='json').status_code, 400)
+        self.assertFalse(Follow.objects.exists())
+
+
+class UnfollowCounterTests(TestCase):
+    def test_a_lost_unfollow_race_does_not_decrement(self):
+        alice = User.objects.create_user(username='alice', password='x')
+        bob = User.objects.create_user(username='bob', password='x')
+        carol = User.objects.create_user(username='carol', password='x')
+        client = APIClient()
+        for follower in (alice, carol):
+            client.force_authenticate(follower)
+            self.assertEqual(client.post(f'/api/follows/user/{bob.pk}/').status_code, 201)
+        client.force_authenticate(alice)
+        stale = Follow.objects.get(follower=alice)
+
+        self.assertEqual(client.delete(f'/api/follows/user/{bob.pk}/').status_code, 204)
+        self.assertEqual(UserProfile.objects.get(user=bob).followers_count, 1)
+        # The second request fetched the row before the first deleted it
+        with mock.patch('social.views.get_object_or_404', side_effect=[ContentType.objects.get_for_model(User), stale]):
+            self.assertEqual(client.delete(f'/api/follows/user/{bob.pk}/').status_code, 204)
+        self.assertEqual(UserProfile.objects.get(user=bob).followers_count, 1)
+        self.assertEqual(UserProfile.objects.get(user=alice).following_count, 0)
+
+
+class FollowCounterReconcileTests(TestCase):
+    def test_drifted_counters_are_repaired(self):
+        alice = User.objects.create_user(username='alice', password='x')
+        bob = User.objects.create_user(username='bob', password='x')
+        startup = Startup.objects.create(owner=bob, name='Acme', description='A startup')
+        Follow.objects.create(follower=alice, content_type=ContentType.objects.get_for_model(User), object_id=bob.pk)
+        Follow.objects.create(follower=alice, content_type=ContentType.objects.get_for_model(Startup), object_id=startup.pk)
+        Startup.objects.filter(pk=startup.pk).update(followers_count=9)
+
+        self.assertEqual(reconcile_follow_counts(), {'profiles': 2, 'startups': 1})
+        self.assertEqual(UserProfile.objects.get(user=alice).following_count, 2)
+        self.assertEqual(UserProfile.objects.get(user=bob).followers_count, 1)
+        startup.refresh_from_db()
+        self.assertEqual(startup.followers_count, 1)
+        self.assertEqual(reconcile_follow_counts(), {'profiles': 0, 'startups': 0})
+
+
+class LegacyStartupFollowerImportTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='x')
+        self.startups = [Startup.objects.create(owner=self.owner, name=f'Startup {number}', description='A startup') for number in range(2)]
+        self.fans = [User.objects.create_user(username=f'fan{number}', password='x') for number in range(3)]
+        self.startup_type = ContentType.objects.get_for_model(Startup)
+
+    def run_import(self):
+        with mock.patch('feed.tasks.rebuild_timeline.delay') as rebuild_timeline:
+            call_command('import_legacy_startup_followers', batch_size=2, stdout=io.StringIO())
+        return rebuild_timeline
+
+    def test_legacy_follows_are_copied_and_counted(self):
+        self.startups[0].followers.add(*self.fans)
+        self.startups[1].followers.add(self.fans[0])
+        # Already followed through the API: skipped, not duplicated
+        Follow.objects.create(follower=self.fans[0], content_type=self.startup_type, object_id=self.startups[0].pk)
+        RecommendationRefresh.objects.all().delete()
+
+        rebuild_timeline = self.run_import()
+
+        pairs = set(Follow.objects.filter(content_type=self.startup_type).values_list('follower_id', 'object_id'))
+        self.assertEqual(pairs, {(fan.pk, self.startups[0].pk) for fan in self.fans} | {(self.fans[0].pk, self.startups[1].pk)})
+        self.assertEqual([startup.followers_count for startup in Startup.objects.order_by('pk')], [3, 1])
+        self.assertEqual(UserProfile.objects.get(user=self.fans[0]).following_count, 2)
+        fan_ids = sorted(fan.pk for fan in self.fans)
+        self.assertEqual(sorted(RecommendationRefresh.objects.values_list('user_id', flat=True)), fan_ids)
+        self.assertEqual(sorted(call.args[0] for call in rebuild_timeline.call_args_list), fan_ids)
+
+        # Safe to run again; the legacy table is left for the release that removes the field
+        self.run_import()
+        self.assertEqual(Follow.objects.filter(content_type=self.startup_type).count(), 4)
+        self.assertEqual(self.startups[0].followers.count(), 3)
+
+
+class StartupFollowersEndpointTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', password='x')
+        self.startup = Startup.objects.create(owner=owner, name='Acme', description='A startup')
+        self.client = APIClient()
+
+    def follow(self, user):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/follows/startup/{self.startup.pk}/')
+        self.client.force_authenticate(None)
+        return response
+
+    def test_followers_are_paged_newest_first(self):
+        fans = [User.objects.create_user(username=f'fan{number}', password='x') for number in range(3)]
+        for fan in fans:
+            self.assertEqual(self.follow(fan).status_code, 201)
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.followers_count, 3)
+
+        seen = []
+        url = f'/api/startups/{self.startup.pk}/followers/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item['follower']['id'] for item in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [fan.pk for fan in reversed(fans)])
+
+        detail = self.client.get(f'/api/startups/{self.startup.pk}/')
+        self.assertEqual(detail.data['followers_count'], 3)
+        self.assertNotIn('followers', detail.data)
+
+    def test_unknown_startup(self):
+        self.assertEqual(self.client.get('/api/startups/999999/followers/').status_code, 404)
@@ -5,10 +5,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.contrib.contenttypes.models import ContentType # For GenericForeignKey
-from django.db import IntegrityError # To handle unique_together exceptions
+from django.db import IntegrityError, transaction # To handle unique_together exceptions
+from django.db.models import Exists, OuterRef
 
-from .models import Follow
-from .serializers import FollowCreateSerializer, FollowSerializer
+from .bulk import follow_many, unfollow_many
+from .graph import adjust_follow_counts
+from .models import Follow, PeopleRecommendation
+from .serializers import BulkFollowSerializer, FollowCreateSerializer, FollowSerializer, PeopleRecommendationSerializer
+from my_entrepreneur_platform.pagination import KeysetCursorPagination
+from my_entrepreneur_platform.querybudget import QueryBudgetMixin
 
 from django.contrib.auth import get_user_model
 User = get_user_model()
@@ -39,7 +44,9 @@ class FollowCreateDeleteAPIView(APIView):
         try:
             # serializer.save() will create the Follow instance using the validated_data
             # The serializer's validate method will have already checked followed_object existence
-            follow_instance = serializer.save(follower=request.user) # Set the follower automatically
+            with transaction.atomic():
+                follow_instance = serializer.save(follower=request.user) # Set the follower automatically
+                adjust_follow_counts(request.user.pk, follow_instance.content_type, [follow_instance.object_id], 1)
 
             return Response(FollowSerializer(follow_instance).data, status=status.HTTP_201_CREATED)
         except IntegrityError: # Handle unique_together constraint (already following)
@@ -68,25 +75,75 @@ class FollowCreateDeleteAPIView(APIView):
             content_type=content_type,
             object_id=object_id
         )
-        follow_instance.delete()
+        with transaction.atomic():
+            deleted, _per_model = follow_instance.delete()
+            if deleted: # Not if a concurrent unfollow got there first
+                adjust_follow_counts(request.user.pk, content_type, [follow_instance.object_id], -1)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+# Follow or unfollow many users/startups in one request (e.g. onboarding)
+class BulkFollowAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BulkFollowSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        targets = [(target['content_type'], target['object_id']) for target in serializer.validated_data['targets']]
+        if serializer.validated_data['action'] == 'follow':
+            result = follow_many(request.user, targets)
+        else:
+            result = unfollow_many(request.user, targets)
+        return Response(
+            {key: [{'content_type': model_name, 'object_id': object_id} for model_name, object_id in pairs]
+             for key, pairs in result.items()},
+            status=status.HTTP_200_OK,
+        )
+
 # --- Remaining Views (FollowingListAPIView, FollowersListAPIView) as they were ---
-class FollowingListAPIView(generics.ListAPIView):
+class FollowingListAPIView(QueryBudgetMixin, generics.ListAPIView):
     serializer_class = FollowSerializer
+    query_budget = 4 # User lookup, page, one per followed content type
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination # Newest first, (-created_at, -id)
 
     def get_queryset(self):
         user_id = self.kwargs['user_id']
         user = get_object_or_404(User, id=user_id)
-        return Follow.objects.filter(follower=user).select_related('content_type').order_by('-created_at')
+        return Follow.objects.filter(follower=user).select_related('follower')
 
-class FollowersListAPIView(generics.ListAPIView):
+class FollowersListAPIView(QueryBudgetMixin, generics.ListAPIView):
     serializer_class = FollowSerializer
+    query_budget = 3 # Followed object lookup, page, follower users
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination
+    followed_model = User
+    lookup_url_kwarg = 'user_id'
 
     def get_queryset(self):
-        user_id = self.kwargs['user_id']
-        user = get_object_or_404(User, id=user_id)
-        user_content_type = ContentType.objects.get_for_model(User)
-        return Follow.objects.filter(content_type=user_content_type, object_id=user.id).select_related('follower').order_by('-created_at')
\ No newline at end of file
+        followed = get_object_or_404(self.followed_model, pk=self.kwargs[self.lookup_url_kwarg])
+        followed_content_type = ContentType.objects.get_for_model(self.followed_model)
+        return Follow.objects.filter(content_type=followed_content_type, object_id=followed.pk).select_related('follower')
+
+class StartupFollowersListAPIView(FollowersListAPIView):
+    followed_model = Startup
+    lookup_url_kwarg = 'pk'
+
+class PeopleYouMayKnowAPIView(generics.ListAPIView):
+    """The requesting user's precomputed recommendations (see social.recommendations), best first."""
+    serializer_class = PeopleRecommendationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None # At most PYMK_TOP_K rows per user
+
+    def get_queryset(self):
+        # Hide anyone followed since the last refresh without waiting for the job
+        already_followed = Follow.objects.filter(
+            follower=self.request.user,
+            content_type=ContentType.objects.get_for_model(User),
+            object_id=OuterRef('candidate_id'),
+        )
+        return (
+            PeopleRecommendation.objects.filter(user=self.request.user)
+            .exclude(Exists(already_followed))
+            .select_related('candidate')
+            .order_by('-score', 'candidate_id')
+        )
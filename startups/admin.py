@@ -1,8 +1,9 @@
 # my_entrepreneur_platform/startups/admin.py
 
 from django.contrib import admin
-from .models import Industry, Startup
+from .models import Industry, RelatedStartup, Startup
 
 # Register your models here
 admin.site.register(Industry)
-admin.site.register(Startup)
\ No newline at end of file
+admin.site.register(Startup)
+admin.site.register(RelatedStartup)
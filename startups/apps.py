@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StartupsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'startups'
+
+    def ready(self):
+        from . import signals # noqa: F401 (facet cache invalidation, related-startups refresh marks)
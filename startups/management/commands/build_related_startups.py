@@ -0,0 +1,17 @@
+# my_entrepreneur_platform/startups/management/commands/build_related_startups.py
+
+from my_entrepreneur_platform.topk import BuildListsCommand
+from startups.similarity import rebuild_related, refresh_related
+
+
+class Command(BuildListsCommand):
+    help = "Computes the stored related-startups lists from startup text, industry and stage."
+    changed_only_help = "Only re-embed a batch of startups edited since the last run."
+    rows_label = 'related startups'
+    owners_label = 'startups'
+
+    def rebuild(self):
+        return rebuild_related()
+
+    def refresh(self):
+        return refresh_related()
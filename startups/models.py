@@ -55,21 +55,57 @@ class Startup(models.Model):
     website_url = models.URLField(blank=True, null=True)
     pitch_deck_url = models.URLField(blank=True, null=True, help_text="Link to presentation for investors.")
     logo = models.ImageField(upload_to='startup_logos/', blank=True, null=True)
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False) # Resized copies, see media.variants
 
-    # Followers (Many-to-Many relationship with User model)
-    # This allows users to "follow" a startup
+    # Follows live in social.Follow (the single source). This legacy M2M is no
+    # longer read or written: it stays for one deploy so its table survives
+    # until manage.py import_legacy_startup_followers has copied it, and is
+    # removed (dropping the table) in the following release.
     followers = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         related_name='followed_startups',
-        blank=True
+        blank=True,
+        editable=False,
     )
 
+    followers_count = models.PositiveIntegerField(default=0, editable=False) # Follow rows, maintained by social.graph
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Startups" # Correct pluralization for admin
         ordering = ['name']
+        indexes = [
+            # Browse pages: newest first, optionally narrowed by one facet
+            models.Index(fields=['-created_at', '-id'], name='startups_keyset_idx'),
+            models.Index(fields=['industry', '-created_at', '-id'], name='startups_industry_keyset_idx'),
+            models.Index(fields=['stage', '-created_at', '-id'], name='startups_stage_keyset_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+# --- Related startups (see startups.similarity) ---
+class RelatedStartup(models.Model):
+    """One of a startup's STARTUP_RELATED_TOP_K nearest neighbours by text, industry and stage."""
+    startup = models.ForeignKey(Startup, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Startup, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('startup', 'related')
+        ordering = ['-score']
+        indexes = [models.Index(fields=['startup', '-score'], name='startups_related_score_idx')]
+
+    def __str__(self):
+        return f"{self.related_id} related to {self.startup_id} ({self.score:.2f})"
+
+class RelatedStartupRefresh(models.Model):
+    """Marks a startup whose text, industry or stage changed since its neighbours were computed."""
+    startup = models.OneToOneField(Startup, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    marked_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"Refresh related startups of {self.startup_id}"
@@ -1,7 +1,9 @@
 # my_entrepreneur_platform/startups/serializers.py
 
 from rest_framework import serializers
-from .models import Industry, Startup
+from media.serializers import VariantsField
+from social.flags import FollowingFlagListSerializer, FollowingFlagMixin
+from .models import Industry, RelatedStartup, Startup
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -13,8 +15,8 @@ class IndustrySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description']
 
 # Serializer for the Startup model
-class StartupSerializer(serializers.ModelSerializer):
-    # Display owner and followers using a simple user representation
+class StartupSerializer(FollowingFlagMixin, serializers.ModelSerializer):
+    # Display owner using a simple user representation; followers are paged at /api/startups/<id>/followers/
     owner = serializers.PrimaryKeyRelatedField(queryset=User.objects.all()) # For input/output
     owner_username = serializers.CharField(source='owner.username', read_only=True) # For display only
     
@@ -23,13 +25,43 @@ class StartupSerializer(serializers.ModelSerializer):
         queryset=Industry.objects.all(), source='industry', write_only=True, required=False, allow_null=True
     ) # For input (providing industry ID)
 
-    # followers = UserSerializer(many=True, read_only=True) # If you had a UserSerializer defined in startups
+    variants = VariantsField(source='logo_variants') # Resized copies of the logo
+    is_following = serializers.SerializerMethodField() # Whether the requesting user follows this startup
+    follow_target_model = Startup
 
     class Meta:
         model = Startup
         fields = [
             'id', 'name', 'tagline', 'description', 'industry', 'industry_id',
-            'stage', 'funding_needs', 'website_url', 'pitch_deck_url', 'logo',
-            'owner', 'owner_username', 'followers', 'created_at', 'updated_at'
+            'stage', 'funding_needs', 'website_url', 'pitch_deck_url', 'logo', 'variants',
+            'owner', 'owner_username', 'followers_count', 'is_following', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['followers', 'created_at', 'updated_at'] # Followers handled via separate actions
\ No newline at end of file
+        read_only_fields = ['followers_count', 'created_at', 'updated_at'] # Followers handled via separate actions
+        list_serializer_class = FollowingFlagListSerializer
+
+    def follow_target_id(self, obj):
+        return obj.pk
+
+    @staticmethod
+    def prefetch_plan(queryset):
+        """Everything a page of StartupSerializer reads besides the follow flags (one query per page)."""
+        return queryset.select_related('industry', 'owner')
+
+# Slim form for embedding a startup in other payloads (no owner, industry object or follow flag)
+class StartupSummarySerializer(serializers.ModelSerializer):
+    industry_name = serializers.CharField(source='industry.name', read_only=True, default=None)
+    variants = VariantsField(source='logo_variants')
+
+    class Meta:
+        model = Startup
+        fields = ['id', 'name', 'tagline', 'stage', 'industry_name', 'logo', 'variants', 'followers_count']
+        read_only_fields = fields
+
+# A stored neighbour of a startup (see startups.similarity)
+class RelatedStartupSerializer(serializers.ModelSerializer):
+    startup = StartupSummarySerializer(source='related', read_only=True)
+
+    class Meta:
+        model = RelatedStartup
+        fields = ['startup', 'score']
+        read_only_fields = fields
@@ -0,0 +1,26 @@
+# my_entrepreneur_platform/startups/signals.py
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from my_entrepreneur_platform.facets import bump_generation
+from .models import Industry, Startup
+from .similarity import mark_for_refresh
+
+# Any startup write (or an industry rename) can change facet counts or labels
+
+@receiver(post_save, sender=Startup)
+@receiver(post_delete, sender=Startup)
+@receiver(post_save, sender=Industry)
+@receiver(post_delete, sender=Industry)
+def invalidate_startup_facets(sender, **kwargs):
+    bump_generation('startups')
+
+# Fields the related-startups vectors are built from
+SIMILARITY_FIELDS = {'tagline', 'description', 'industry', 'stage'}
+
+@receiver(post_save, sender=Startup)
+def mark_related_refresh(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not SIMILARITY_FIELDS & set(update_fields):
+        return # e.g. only logo variants changed
+    mark_for_refresh(instance.pk)
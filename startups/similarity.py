@@ -0,0 +1,132 @@
+# my_entrepreneur_platform/startups/similarity.py
+
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from my_entrepreneur_platform.refresh import mark_on_commit
+from my_entrepreneur_platform.topk import TopKLists, dot_products, postings, top, unit
+from search.trigram import words
+from .models import RelatedStartup, RelatedStartupRefresh, Startup
+
+
+# --- Startup vectors ---
+# Each startup's tagline and description become a TF-IDF vector (sublinear tf,
+# unit length, capped at its STARTUP_RELATED_MAX_TERMS heaviest terms). Text
+# cosines for one startup against all others come from the term postings in a
+# single sweep. The final score blends the text cosine with equal industry and
+# stage, weighted by STARTUP_RELATED_WEIGHTS and scaled to 0..1.
+
+class StartupVectors:
+
+    def __init__(self, rows):
+        """`rows` are (pk, tagline, description, industry id, stage)."""
+        documents = {}
+        self.industries = {}
+        self.stages = {}
+        self.peers = defaultdict(list) # (industry, stage) -> pks, to fill lists with little text overlap
+        for pk, tagline, description, industry_id, stage in rows:
+            documents[pk] = Counter(
+                word for word in words(f"{tagline or ''} {description or ''}") if len(word) > 1 and not word.isdigit()
+            )
+            self.industries[pk] = industry_id
+            self.stages[pk] = stage
+            if industry_id is not None:
+                self.peers[(industry_id, stage)].append(pk)
+
+        total = len(documents)
+        document_frequency = Counter(term for counts in documents.values() for term in counts)
+        term_ids = {}
+        max_terms = settings.STARTUP_RELATED_MAX_TERMS
+        self.vectors = {}
+        for pk, counts in documents.items():
+            weighted = {
+                term: (1 + math.log(count)) * (math.log((1 + total) / (1 + document_frequency[term])) + 1)
+                for term, count in counts.items()
+            }
+            heaviest = heapq.nlargest(max_terms, weighted.items(), key=lambda item: item[1])
+            self.vectors[pk] = unit({term_ids.setdefault(term, len(term_ids)): weight for term, weight in heaviest})
+        self.postings = postings(self.vectors)
+
+    @classmethod
+    def load(cls):
+        return cls(
+            Startup.objects.order_by().values_list('pk', 'tagline', 'description', 'industry_id', 'stage')
+            .iterator(chunk_size=5000)
+        )
+
+    def scores(self, pk):
+        """{other pk: blended similarity} for every startup sharing a term with, or an industry peer of, `pk`."""
+        if pk not in self.vectors:
+            return {}
+        text = dot_products(self.vectors[pk], self.postings, settings.STARTUP_RELATED_MAX_POSTINGS)
+
+        # Same-industry startups with no words in common still count; take a bounded sample, same stage first
+        industry, stage = self.industries[pk], self.stages[pk]
+        candidates = set(text)
+        if industry is not None:
+            limit = settings.STARTUP_RELATED_TOP_K
+            candidates.update(self.peers[(industry, stage)][:limit + 1])
+            for other_stage, _label in Startup.STAGE_CHOICES:
+                if other_stage != stage:
+                    candidates.update(self.peers[(industry, other_stage)][:limit])
+        candidates.discard(pk)
+
+        weights = settings.STARTUP_RELATED_WEIGHTS
+        total_weight = sum(weights.values())
+        blended = {}
+        for other in candidates:
+            score = weights['text'] * text.get(other, 0.0)
+            if industry is not None and self.industries[other] == industry:
+                score += weights['industry']
+            if self.stages[other] == stage:
+                score += weights['stage']
+            if score > 0:
+                blended[other] = score / total_weight
+        return blended
+
+
+# --- Storage ---
+RELATED_LISTS = TopKLists(RelatedStartup, 'startup_id', 'related_id', batch_size_setting='STARTUP_RELATED_BATCH_SIZE')
+
+
+# --- Jobs ---
+def rebuild_related():
+    """Recomputes every startup's neighbours. Returns rows stored."""
+    limit = settings.STARTUP_RELATED_TOP_K
+    # Clear the marks before reading: a startup edited from here on is marked again
+    RelatedStartupRefresh.objects.all().delete()
+    vectors = StartupVectors.load()
+    return RELATED_LISTS.replace({pk: top(vectors.scores(pk), limit) for pk in vectors.vectors})
+
+def refresh_related():
+    """
+    Re-embeds up to STARTUP_RELATED_REFRESH_BATCH marked startups: their own
+    lists are rebuilt, and their entries in other startups' lists are withdrawn
+    and re-offered at the new scores. Returns (startups refreshed, rows stored).
+    """
+    limit = settings.STARTUP_RELATED_TOP_K
+    marked = list(
+        RelatedStartupRefresh.objects.order_by('marked_at')
+        .values_list('startup_id', flat=True)[:settings.STARTUP_RELATED_REFRESH_BATCH]
+    )
+    if not marked:
+        return 0, 0
+    # Clear the marks before reading: a startup edited from here on is marked again
+    RelatedStartupRefresh.objects.filter(startup_id__in=marked).delete()
+    vectors = StartupVectors.load()
+    scores = {pk: vectors.scores(pk) for pk in marked}
+
+    offers = defaultdict(list)
+    for pk, neighbours in scores.items():
+        for other, score in neighbours.items():
+            if other not in scores:
+                offers[other].append((score, pk))
+    stored = RELATED_LISTS.replace({pk: top(neighbours, limit) for pk, neighbours in scores.items()})
+    stored += RELATED_LISTS.merge(offers, limit, withdraw=marked, skip=marked)
+    return len(marked), stored
+
+def mark_for_refresh(startup_id):
+    mark_on_commit(RelatedStartupRefresh, startup_id)
@@ -0,0 +1,19 @@
+# my_entrepreneur_platform/startups/tasks.py
+
+from celery import shared_task
+import logging # For logging messages
+
+from my_entrepreneur_platform.topk import log_rebuild, log_refresh
+from .similarity import rebuild_related, refresh_related
+
+logger = logging.getLogger(__name__)
+
+@shared_task(bind=True)
+def rebuild_related_startups(self):
+    """Nightly full recomputation of every startup's related startups."""
+    return log_rebuild(logger, self, rebuild_related(), 'related startups')
+
+@shared_task(bind=True)
+def refresh_related_startups(self):
+    """Re-embeds a batch of edited startups and updates the neighbour lists around them."""
+    return log_refresh(logger, self, refresh_related(), 'related startups', 'startups')
@@ -1,3 +1,155 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from .models import Industry, RelatedStartup, RelatedStartupRefresh, Startup
+from .similarity import StartupVectors, rebuild_related, refresh_related
+from .views import StartupListCreateAPIView
+
+User = get_user_model()
+
+
+@override_settings(QUERY_BUDGET_STRICT=True) # Over budget raises QueryBudgetExceeded (a 500 in the client)
+class StartupListQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.viewer = User.objects.create_user(username='viewer', password='x')
+        industry = Industry.objects.create(name='Fintech')
+        for number in range(5):
+            owner = User.objects.create_user(username=f'founder{number}', password='x')
+            Startup.objects.create(owner=owner, name=f'Startup {number}', description='A startup', industry=industry)
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def test_authenticated_page_with_a_cold_content_type_cache(self):
+        ContentType.objects.clear_cache()
+        response = self.client.get('/api/startups/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_anonymous_page(self):
+        ContentType.objects.clear_cache()
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/startups/').status_code, 200)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    @mock.patch.object(StartupListCreateAPIView, 'query_budget', 0)
+    def test_over_budget_only_logs_at_runtime(self):
+        with self.assertLogs('my_entrepreneur_platform.querybudget', 'WARNING'):
+            response = self.client.get('/api/startups/')
+        self.assertEqual(response.status_code, 200)
+
+
+class StartupFilterTests(TestCase):
+    def setUp(self):
+        self.industry = Industry.objects.create(name='Fintech')
+        Startup.objects.create(
+            owner=User.objects.create_user(username='founder', password='x'),
+            name='Acme', description='A startup', industry=self.industry,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='viewer', password='x'))
+
+    def test_industry_filter(self):
+        for url in ('/api/startups/', '/api/startups/facets/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, {'industry': self.industry.pk}).status_code, 200)
+
+    def test_invalid_industry_ids_are_rejected(self):
+        for value in ('²', 'x', '0', '-1', '1.5', str(2 ** 64)):
+            for url in ('/api/startups/', '/api/startups/facets/'):
+                with self.subTest(value=value, url=url):
+                    response = self.client.get(url, {'industry': value})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('industry', response.data)
+
+
+class StartupFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='founder', password='x')
+        self.fintech = Industry.objects.create(name='Fintech')
+        self.health = Industry.objects.create(name='Health')
+        Startup.objects.create(owner=self.owner, name='Acme', description='x', industry=self.fintech, stage='SEED')
+        Startup.objects.create(owner=self.owner, name='Beta', description='x', industry=self.fintech, stage='IDEA')
+        Startup.objects.create(owner=self.owner, name='Care', description='x', industry=self.health, stage='SEED')
+        self.client = APIClient()
+
+    def facets(self, **filters):
+        response = self.client.get('/api/startups/facets/', filters)
+        self.assertEqual(response.status_code, 200)
+        return {name: {item['label']: item['count'] for item in items} for name, items in response.data['facets'].items()}
+
+    def test_counts(self):
+        self.assertEqual(self.facets(), {
+            'industry': {'Fintech': 2, 'Health': 1},
+            'stage': {'Seed Funded': 2, 'Idea Stage': 1},
+        })
+        self.assertEqual(self.facets(stage='SEED')['industry'], {'Fintech': 1, 'Health': 1})
+        self.assertEqual(self.facets(industry=self.health.pk)['stage'], {'Seed Funded': 1})
+
+    def test_writes_invalidate_after_commit(self):
+        self.facets() # Cached
+        with self.captureOnCommitCallbacks(execute=True):
+            Startup.objects.create(owner=self.owner, name='Dash', description='x', industry=self.health, stage='IDEA')
+            # Not bumped yet: a reader inside the write's window still gets the committed counts
+            self.assertEqual(self.facets()['industry'], {'Fintech': 2, 'Health': 1})
+        self.assertEqual(self.facets()['industry'], {'Fintech': 2, 'Health': 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.health.name = 'Healthcare'
+            self.health.save()
+        self.assertEqual(self.facets()['industry'], {'Fintech': 2, 'Healthcare': 2})
+
+
+class RelatedStartupJobTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username='founder', password='x')
+        fintech = Industry.objects.create(name='Fintech')
+        self.startups = {
+            name: Startup.objects.create(owner=owner, name=name, description=description, industry=fintech, stage=stage)
+            for name, description, stage in (
+                ('Ledger', 'invoices payments bookkeeping', 'SEED'),
+                ('Payroll', 'payments salaries bookkeeping', 'SEED'),
+                ('Garden', 'plants watering sensors', 'IDEA'),
+            )
+        }
+
+    def related(self, name):
+        return list(RelatedStartup.objects.filter(startup=self.startups[name]).order_by('-score').values_list('related__name', flat=True))
+
+    def test_rebuild_and_refresh(self):
+        rebuild_related()
+        self.assertEqual(self.related('Ledger'), ['Payroll', 'Garden'])
+
+        garden = self.startups['Garden']
+        garden.description = 'invoices payments bookkeeping sensors'
+        garden.stage = 'SEED'
+        with self.captureOnCommitCallbacks(execute=True):
+            garden.save()
+        self.assertEqual(refresh_related()[0], 1)
+        self.assertEqual(self.related('Ledger')[0], 'Garden')
+
+    def test_a_mark_written_during_a_rebuild_survives_it(self):
+        garden = self.startups['Garden']
+        load = StartupVectors.load
+
+        def load_while_garden_is_edited():
+            RelatedStartupRefresh.objects.create(startup=garden) # Committed while the job reads the vectors
+            return load()
+
+        with mock.patch.object(StartupVectors, 'load', side_effect=load_while_garden_is_edited):
+            rebuild_related()
+        self.assertTrue(RelatedStartupRefresh.objects.filter(startup=garden).exists())
+
+    def test_build_command(self):
+        output = StringIO()
+        call_command('build_related_startups', stdout=output)
+        self.assertTrue(output.getvalue().startswith('6 related startups stored in'))
+        call_command('build_related_startups', '--changed-only', stdout=output)
+        self.assertIn('0 related startups stored around 0 startups', output.getvalue())
@@ -2,10 +2,14 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework import serializers
 from django.shortcuts import get_object_or_404
 
-from .models import Industry, Startup # Your models
-from .serializers import IndustrySerializer, StartupSerializer 
+from my_entrepreneur_platform.facets import cached_counts, grouped_counts, parse_id_filter
+from my_entrepreneur_platform.pagination import KeysetCursorPagination
+from my_entrepreneur_platform.querybudget import QueryBudgetMixin
+from .models import Industry, RelatedStartup, Startup # Your models
+from .serializers import IndustrySerializer, RelatedStartupSerializer, StartupSerializer 
 
 # Custom Permission: Only the owner of the object can modify/delete it
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -28,11 +32,36 @@ class IndustryDetailAPIView(generics.RetrieveAPIView):
     serializer_class = IndustrySerializer
     permission_classes = [permissions.AllowAny] # Anyone can view industries
 
-# View for listing all startups and creating new ones
-class StartupListCreateAPIView(generics.ListCreateAPIView):
+# --- Browsing ---
+def filter_startups(params):
+    """
+    Startups narrowed by the optional ?industry=<id> and ?stage=<code> filters
+    (each backed by a keyset index). Returns (queryset, applied filters).
+    """
     queryset = Startup.objects.all()
+    applied = {}
+    industry = params.get('industry')
+    if industry:
+        applied['industry'] = parse_id_filter(industry, 'industry', "Must be an industry id.")
+        queryset = queryset.filter(industry_id=applied['industry'])
+    stage = params.get('stage')
+    if stage:
+        if stage not in dict(Startup.STAGE_CHOICES):
+            raise serializers.ValidationError({'stage': f"Must be one of {', '.join(dict(Startup.STAGE_CHOICES))}."})
+        applied['stage'] = stage
+        queryset = queryset.filter(stage=stage)
+    return queryset, applied
+
+# View for listing all startups and creating new ones
+class StartupListCreateAPIView(QueryBudgetMixin, generics.ListCreateAPIView):
     serializer_class = StartupSerializer
+    query_budget = 2 # Page, viewer's follow flags
     permission_classes = [permissions.IsAuthenticatedOrReadOnly] # Authenticated can create, anyone can list
+    pagination_class = KeysetCursorPagination # Newest first, (-created_at, -id)
+
+    def get_queryset(self):
+        queryset, _applied = filter_startups(self.request.query_params)
+        return StartupSerializer.prefetch_plan(queryset)
 
     def perform_create(self, serializer):
         # Automatically set the owner of the startup to the currently authenticated user
@@ -40,11 +69,36 @@ class StartupListCreateAPIView(generics.ListCreateAPIView):
 
 # View for retrieving, updating, and deleting a specific startup
 class StartupRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Startup.objects.all()
+    queryset = StartupSerializer.prefetch_plan(Startup.objects.all())
     serializer_class = StartupSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
             self.permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
-        return super().get_permissions()
\ No newline at end of file
+        return super().get_permissions()
+
+# Counts per industry and stage for the current filter set, e.g. ?stage=SEED
+class StartupFacetsAPIView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        queryset, applied = filter_startups(request.query_params)
+        facets = cached_counts('startups', applied, lambda: grouped_counts(queryset, {
+            'industry': ('industry_id', 'industry__name'),
+            'stage': ('stage', dict(Startup.STAGE_CHOICES)),
+        }))
+        return Response({'filters': applied, 'facets': facets})
+
+# Precomputed "similar startups" for a startup page, best first
+class RelatedStartupsAPIView(generics.ListAPIView):
+    serializer_class = RelatedStartupSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None # At most STARTUP_RELATED_TOP_K rows
+
+    def get_queryset(self):
+        startup = get_object_or_404(Startup, pk=self.kwargs['pk'])
+        return (
+            RelatedStartup.objects.filter(startup=startup)
+            .select_related('related__industry').order_by('-score', 'related_id')
+        )
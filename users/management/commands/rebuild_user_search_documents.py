@@ -0,0 +1,19 @@
+# my_entrepreneur_platform/users/management/commands/rebuild_user_search_documents.py
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from users.models import UserSearchDocument
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the denormalized user search documents (e.g. after a bulk import or on first deploy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = UserSearchDocument.rebuild(User.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} user search documents."))
@@ -12,9 +12,14 @@ class UserProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     bio = models.TextField(max_length=500, blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False) # Resized copies, see media.variants
     location = models.CharField(max_length=100, blank=True, null=True)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
 
+    # Denormalized follow-graph counters, maintained by social.graph
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
     # You might add fields here for specific roles if they are common enough
     # Example: is_entrepreneur = models.BooleanField(default=False)
     #          is_investor = models.BooleanField(default=False)
@@ -26,6 +31,87 @@ class UserProfile(models.Model):
     def __str__(self):
         return f'{self.user.username} Profile'
 
+class UserSearchDocument(models.Model):
+    """
+    Denormalized copy of the searchable User and UserProfile fields, so user search
+    is a single-table query with no joins at read time.
+    Kept in sync by the post_save signals below.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    username = models.CharField(max_length=150)
+    first_name = models.CharField(max_length=150, blank=True)
+    last_name = models.CharField(max_length=150, blank=True)
+    bio = models.TextField(max_length=500, blank=True, null=True)
+    location = models.CharField(max_length=100, blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    profile_picture_variants = models.JSONField(default=dict, blank=True)
+    # Lowercased concatenation of every matchable field (including email, which is never returned)
+    search_text = models.TextField(blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.username} Search Document'
+
+    @classmethod
+    def build(cls, user, profile=None):
+        """Returns an unsaved document for `user` and (optionally) their profile."""
+        bio = profile.bio if profile else None
+        location = profile.location if profile else None
+        searchable = [user.username, user.first_name, user.last_name, user.email, bio, location]
+        return cls(
+            user=user,
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            bio=bio,
+            location=location,
+            profile_picture=profile.profile_picture.name if profile and profile.profile_picture else None,
+            profile_picture_variants=profile.profile_picture_variants if profile else {},
+            search_text=' '.join(value for value in searchable if value).lower(),
+        )
+
+    @classmethod
+    def refresh(cls, user, profile=None):
+        document = cls.build(user, profile)
+        document.save()
+        return document
+
+    @classmethod
+    def rebuild(cls, users, batch_size=1000):
+        """
+        Rebuilds documents for a User queryset in batches (for backfills and bulk
+        imports, which bypass post_save). Returns the number of documents written.
+        """
+        written = 0
+        batch = []
+        for user in users.select_related('userprofile').iterator(chunk_size=batch_size):
+            batch.append(cls.build(user, getattr(user, 'userprofile', None)))
+            if len(batch) >= batch_size:
+                written += cls._upsert(batch)
+                batch = []
+        if batch:
+            written += cls._upsert(batch)
+        return written
+
+    @classmethod
+    def _upsert(cls, documents):
+        cls.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=[
+                'username', 'first_name', 'last_name', 'bio', 'location',
+                'profile_picture', 'profile_picture_variants', 'search_text', 'updated_at',
+            ],
+        )
+        return len(documents)
+
 # Signal to automatically create a UserProfile when a new User is created
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -37,4 +123,10 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     # This handles cases where user is updated, ensuring profile is also saved
     if hasattr(instance, 'userprofile'): # Check if userprofile exists to prevent error on first save
-        instance.userprofile.save()
\ No newline at end of file
+        instance.userprofile.save()
+
+# Signal to keep the user's search document in step with their profile.
+# Every User save also saves the profile (see above), so this covers both models.
+@receiver(post_save, sender=UserProfile)
+def update_user_search_document(sender, instance, **kwargs):
+    UserSearchDocument.refresh(instance.user, instance)
@@ -1,6 +1,8 @@
 # my_entrepreneur_platform/users/serializers.py
 
 from rest_framework import serializers
+from media.serializers import VariantsField
+from social.flags import FollowingFlagListSerializer, FollowingFlagMixin
 from .models import UserProfile
 from django.contrib.auth import get_user_model
 
@@ -14,11 +16,21 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['username', 'email'] # Username/email often not directly changeable via profile API
 
 # Serializer for your custom UserProfile model
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(FollowingFlagMixin, serializers.ModelSerializer):
     # Include the basic user details nested within the profile
     user = UserSerializer(read_only=True)
+    variants = VariantsField(source='profile_picture_variants') # Resized copies of the profile picture
+    is_following = serializers.SerializerMethodField() # Whether the requesting user follows this user
+    follow_target_model = User
 
     class Meta:
         model = UserProfile
-        fields = ['id', 'user', 'bio', 'profile_picture', 'location', 'phone_number', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at'] # Auto-set by Django
\ No newline at end of file
+        fields = [
+            'id', 'user', 'bio', 'profile_picture', 'variants', 'location', 'phone_number',
+            'followers_count', 'following_count', 'is_following', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['followers_count', 'following_count', 'created_at', 'updated_at'] # Auto-set by Django
+        list_serializer_class = FollowingFlagListSerializer
+
+    def follow_target_id(self, obj):
+        return obj.user_id
\ No newline at end of file
@@ -1,3 +1,50 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from search.queries import search_users
+from search.serializers import UserSearchSerializer
+from .models import UserSearchDocument
+
+User = get_user_model()
+
+
+class UserSearchDocumentTests(TestCase):
+    def setUp(self):
+        self.ada = User.objects.create_user(username='ada', password='x', first_name='Ada', email='ada@example.com')
+        profile = self.ada.userprofile
+        profile.bio = 'Builds Analytical Engines'
+        profile.location = 'London'
+        profile.save()
+
+    def found(self, query):
+        return list(search_users(query).values_list('username', flat=True))
+
+    def test_bio_and_location_are_searchable(self):
+        self.assertEqual(self.found('analytical'), ['ada'])
+        self.assertEqual(self.found('LONDON'), ['ada'])
+        self.assertEqual(self.found('example.com'), ['ada']) # Email matches but is never returned
+        self.assertEqual(self.found('paris'), [])
+
+    def test_the_document_follows_user_and_profile_saves(self):
+        self.ada.first_name = 'Augusta'
+        self.ada.save()
+        self.assertEqual(UserSearchDocument.objects.get(user=self.ada).first_name, 'Augusta')
+        self.assertEqual(self.found('augusta'), ['ada'])
+
+        profile = self.ada.userprofile
+        profile.location = 'Paris'
+        profile.save()
+        self.assertEqual(self.found('paris'), ['ada'])
+        self.assertEqual(self.found('london'), [])
+
+    def test_rebuild_backfills_missing_documents(self):
+        UserSearchDocument.objects.all().delete()
+        self.assertEqual(UserSearchDocument.rebuild(User.objects.all(), batch_size=1), 1)
+        self.assertEqual(self.found('analytical'), ['ada'])
+
+    def test_search_runs_as_a_single_query(self):
+        User.objects.create_user(username='adam', password='x')
+        with self.assertNumQueries(1):
+            results = UserSearchSerializer(search_users('ada').order_by('username'), many=True).data
+        self.assertEqual([result['username'] for result in results], ['ada', 'adam'])
+        self.assertEqual(results[0]['profile']['location'], 'London')